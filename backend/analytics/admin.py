@@ -0,0 +1,18 @@
+from django.contrib import admin
+from .models import CaseRollup, ReminderRollup, ClientWorkload
+
+@admin.register(CaseRollup)
+class CaseRollupAdmin(admin.ModelAdmin):
+    list_display = ('month', 'caseType', 'status', 'count')
+    list_filter = ('status',)
+    list_select_related = ('caseType',)
+
+@admin.register(ReminderRollup)
+class ReminderRollupAdmin(admin.ModelAdmin):
+    list_display = ('month', 'type', 'completed', 'count')
+    list_filter = ('completed', 'type')
+
+@admin.register(ClientWorkload)
+class ClientWorkloadAdmin(admin.ModelAdmin):
+    list_display = ('client', 'status', 'count')
+    list_select_related = ('client',)
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from analytics.models import CaseRollup, ReminderRollup, ClientWorkload
+from analytics.rollups import rebuild
+
+
+class Command(BaseCommand):
+    help = "Recompute the analytics rollup tables from the live Case and Reminder tables"
+
+    def handle(self, *args, **options):
+        rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {CaseRollup.objects.count()} case, {ReminderRollup.objects.count()} reminder "
+            f"and {ClientWorkload.objects.count()} client workload rollups"
+        ))
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('cases', '0006_casedocumenttext'),
+        ('clients', '0002_client_nic'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReminderRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('type', models.CharField(max_length=50)),
+                ('completed', models.BooleanField()),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('month', 'type', 'completed')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CaseRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('status', models.CharField(max_length=50)),
+                ('count', models.IntegerField(default=0)),
+                ('caseType', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='cases.casetype')),
+            ],
+            options={
+                'unique_together': {('month', 'caseType', 'status')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ClientWorkload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(max_length=50)),
+                ('count', models.IntegerField(default=0)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='workload', to='clients.client')),
+            ],
+            options={
+                'unique_together': {('client', 'status')},
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+from django.db import models
+from cases.models import CaseType
+from clients.models import Client
+
+class CaseRollup(models.Model):
+    month = models.DateField()
+    caseType = models.ForeignKey(CaseType, on_delete=models.CASCADE, related_name="rollups", null=True, blank=True)
+    status = models.CharField(max_length=50)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('month', 'caseType', 'status')
+
+    def __str__(self):
+        return f"{self.month:%Y-%m} {self.caseType_id} {self.status}: {self.count}"
+
+class ReminderRollup(models.Model):
+    month = models.DateField()
+    type = models.CharField(max_length=50)
+    completed = models.BooleanField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('month', 'type', 'completed')
+
+    def __str__(self):
+        return f"{self.month:%Y-%m} {self.type} completed={self.completed}: {self.count}"
+
+class ClientWorkload(models.Model):
+    client = models.ForeignKey(Client, on_delete=models.CASCADE, related_name="workload")
+    status = models.CharField(max_length=50)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('client', 'status')
+
+    def __str__(self):
+        return f"{self.client_id} {self.status}: {self.count}"
@@ -0,0 +1,131 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, DateField, F
+from django.db.models.functions import Lower, TruncMonth
+from django.utils import timezone
+
+from cases.models import ArchivedCase, Case
+from reminders.models import ArchivedReminder, Reminder
+from .models import CaseRollup, ReminderRollup, ClientWorkload
+
+
+def month_bucket(value):
+    return timezone.localtime(value).date().replace(day=1)
+
+
+CASE_SOURCE_FIELDS = ('createdAt', 'caseType_id', 'status', 'clientId_id')
+REMINDER_SOURCE_FIELDS = ('dueDate', 'type', 'completed')
+
+
+def snapshot(instance, fields):
+    """Cheap copy of the loaded source fields; deferred fields are simply absent."""
+    values = instance.__dict__
+    return {field: values[field] for field in fields if field in values}
+
+
+def case_keys(values):
+    """Rollup keys a case contributes to, or None if the needed fields are not loaded."""
+    if len(values) < len(CASE_SOURCE_FIELDS) or values['createdAt'] is None:
+        return None
+    status = (values['status'] or '').lower()
+    keys = {CaseRollup: (month_bucket(values['createdAt']), values['caseType_id'], status)}
+    if values['clientId_id'] is not None:
+        keys[ClientWorkload] = (values['clientId_id'], status)
+    return keys
+
+
+def reminder_keys(values):
+    if len(values) < len(REMINDER_SOURCE_FIELDS) or values['dueDate'] is None:
+        return None
+    return {ReminderRollup: (month_bucket(values['dueDate']), values['type'], bool(values['completed']))}
+
+
+KEY_FIELDS = {
+    CaseRollup: ('month', 'caseType_id', 'status'),
+    ReminderRollup: ('month', 'type', 'completed'),
+    ClientWorkload: ('client_id', 'status'),
+}
+
+
+def apply_deltas(deltas):
+    """Apply {(model, key): delta} with one UPDATE per touched row (plus an INSERT for new rows)."""
+    with transaction.atomic():
+        for (model, key), delta in deltas.items():
+            if delta == 0:
+                continue
+            lookup = dict(zip(KEY_FIELDS[model], key))
+            updated = model.objects.filter(**lookup).update(count=F('count') + delta)
+            # A missing row on decrement means its parent (e.g. the client) is being deleted
+            if not updated and delta > 0:
+                model.objects.create(count=delta, **lookup)
+
+
+def diff(old_keys, new_keys):
+    deltas = Counter()
+    for model, key in (old_keys or {}).items():
+        deltas[(model, key)] -= 1
+    for model, key in (new_keys or {}).items():
+        deltas[(model, key)] += 1
+    return deltas
+
+
+def record_cases_created(cases):
+    deltas = Counter()
+    for case in cases:
+        deltas.update(diff(None, case_keys(snapshot(case, CASE_SOURCE_FIELDS))))
+    apply_deltas(deltas)
+
+
+def record_status_changes(cases, status):
+    """Rollup deltas for cases moved to `status` by a bulk UPDATE; `cases` hold the old values."""
+    deltas = Counter()
+    for values in cases:
+        old_values = {field: values[field] for field in CASE_SOURCE_FIELDS}
+        deltas.update(diff(case_keys(old_values), case_keys({**old_values, 'status': status})))
+    apply_deltas(deltas)
+
+
+def _grouped(querysets, *fields):
+    """Sum GROUP BY counts over the hot and archive tables."""
+    totals = Counter()
+    for queryset in querysets:
+        for row in queryset.values(*fields).annotate(total=Count('id')):
+            totals[tuple(row[field] for field in fields)] += row['total']
+    return totals.items()
+
+
+def rebuild():
+    """Recompute every rollup from the live and archived tables with GROUP BY queries."""
+    with transaction.atomic():
+        CaseRollup.objects.all().delete()
+        ReminderRollup.objects.all().delete()
+        ClientWorkload.objects.all().delete()
+
+        case_rows = _grouped(
+            [model.objects.annotate(month=TruncMonth('createdAt', output_field=DateField()), normalizedStatus=Lower('status'))
+             for model in (Case, ArchivedCase)],
+            'month', 'caseType_id', 'normalizedStatus',
+        )
+        CaseRollup.objects.bulk_create([
+            CaseRollup(month=month, caseType_id=case_type_id, status=status, count=total)
+            for (month, case_type_id, status), total in case_rows
+        ])
+
+        reminder_rows = _grouped(
+            [model.objects.annotate(month=TruncMonth('dueDate', output_field=DateField())) for model in (Reminder, ArchivedReminder)],
+            'month', 'type', 'completed',
+        )
+        ReminderRollup.objects.bulk_create([
+            ReminderRollup(month=month, type=reminder_type, completed=completed, count=total)
+            for (month, reminder_type, completed), total in reminder_rows
+        ])
+
+        workload_rows = _grouped(
+            [model.objects.filter(clientId__isnull=False).annotate(normalizedStatus=Lower('status')) for model in (Case, ArchivedCase)],
+            'clientId_id', 'normalizedStatus',
+        )
+        ClientWorkload.objects.bulk_create([
+            ClientWorkload(client_id=client_id, status=status, count=total)
+            for (client_id, status), total in workload_rows
+        ])
@@ -0,0 +1,71 @@
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+from django.dispatch import receiver
+
+from cases.models import ArchivedCase, Case
+from cases.signals import cases_bulk_created, cases_status_changed
+from reminders.models import ArchivedReminder, Reminder
+from .rollups import (
+    CASE_SOURCE_FIELDS, REMINDER_SOURCE_FIELDS, apply_deltas, case_keys, diff,
+    record_cases_created, record_status_changes, reminder_keys, snapshot,
+)
+
+# Archived rows keep counting towards the rollups; archiving itself moves rows without signals
+SOURCES = {
+    Case: (CASE_SOURCE_FIELDS, case_keys),
+    Reminder: (REMINDER_SOURCE_FIELDS, reminder_keys),
+    ArchivedCase: (CASE_SOURCE_FIELDS, case_keys),
+    ArchivedReminder: (REMINDER_SOURCE_FIELDS, reminder_keys),
+}
+
+
+def _keys(sender, values):
+    return SOURCES[sender][1](values) if values is not None else None
+
+
+@receiver(post_init, sender=Case)
+@receiver(post_init, sender=Reminder)
+def remember_loaded_values(sender, instance, **kwargs):
+    # Only rows that came from the database have values worth diffing against
+    instance._rollup_values = snapshot(instance, SOURCES[sender][0]) if instance.pk is not None else None
+
+
+@receiver(pre_save, sender=Case)
+@receiver(pre_save, sender=Reminder)
+def load_missing_values(sender, instance, **kwargs):
+    # Instances built by hand or loaded with .only()/.defer() lack a full snapshot
+    if instance.pk is None or _keys(sender, getattr(instance, '_rollup_values', None)) is not None:
+        return
+    stored = sender.objects.filter(pk=instance.pk).first()
+    instance._rollup_values = snapshot(stored, SOURCES[sender][0]) if stored else None
+
+
+@receiver(post_save, sender=Case)
+@receiver(post_save, sender=Reminder)
+def update_rollups_on_save(sender, instance, created, **kwargs):
+    old_values = None if created else getattr(instance, '_rollup_values', None)
+    # Deferred fields are not written by save(), so they keep their stored values
+    new_values = {**(old_values or {}), **snapshot(instance, SOURCES[sender][0])}
+    old_keys = _keys(sender, old_values)
+    new_keys = _keys(sender, new_values)
+    if new_keys != old_keys:
+        apply_deltas(diff(old_keys, new_keys))
+    instance._rollup_values = new_values
+
+
+@receiver(post_delete, sender=Case)
+@receiver(post_delete, sender=Reminder)
+@receiver(post_delete, sender=ArchivedCase)
+@receiver(post_delete, sender=ArchivedReminder)
+def update_rollups_on_delete(sender, instance, **kwargs):
+    values = getattr(instance, '_rollup_values', None) or snapshot(instance, SOURCES[sender][0])
+    apply_deltas(diff(_keys(sender, values), None))
+
+
+@receiver(cases_bulk_created)
+def update_rollups_on_bulk_create(sender, cases, **kwargs):
+    record_cases_created(cases)
+
+
+@receiver(cases_status_changed)
+def update_rollups_on_status_change(sender, cases, status, **kwargs):
+    record_status_changes(cases, status)
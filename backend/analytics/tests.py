@@ -0,0 +1,74 @@
+from datetime import timedelta
+from io import BytesIO
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from cases.importers import import_matters
+from cases.models import Case, CaseType
+from clients.models import Client
+from reminders.models import Reminder
+from .models import CaseRollup, ReminderRollup, ClientWorkload
+from .rollups import rebuild
+
+
+def rollup_state():
+    return {
+        'cases': sorted(CaseRollup.objects.filter(count__gt=0).values_list('month', 'caseType_id', 'status', 'count')),
+        'reminders': sorted(ReminderRollup.objects.filter(count__gt=0).values_list('month', 'type', 'completed', 'count')),
+        'workload': sorted(ClientWorkload.objects.filter(count__gt=0).values_list('client_id', 'status', 'count')),
+    }
+
+
+class IncrementalRollupTests(APITestCase):
+    def setUp(self):
+        self.civil = CaseType.objects.create(name="Civil Law", code="CIV")
+        self.land = CaseType.objects.create(name="Land Law", code="LND")
+        self.client_a = Client.objects.create(name="Aruna Perera")
+        self.client_b = Client.objects.create(name="Hemas Holdings")
+
+    def assertMatchesRebuild(self):
+        incremental = rollup_state()
+        rebuild()
+        self.assertEqual(incremental, rollup_state())
+
+    def test_saves_updates_and_deletes_match_full_rebuild(self):
+        case = Case.objects.create(title="Partition", caseType=self.civil, clientId=self.client_a)
+        other = Case.objects.create(title="Lease", caseType=self.land, clientId=self.client_b, status="Pending")
+        reminder = Reminder.objects.create(title="Hearing", dueDate=timezone.now(), caseId=case, type="hearing")
+        Reminder.objects.create(title="Filing", dueDate=timezone.now() + timedelta(days=40), caseId=other)
+
+        case.status = "closed"
+        case.caseType = self.land
+        case.save()
+        reminder.completed = True
+        reminder.save()
+        Case.objects.only('id', 'title').get(pk=other.pk).save()
+        self.assertMatchesRebuild()
+
+        self.client_b.delete()
+        self.assertMatchesRebuild()
+
+    def test_bulk_import_updates_rollups(self):
+        csv = "title,caseType,clientName,clientEmail\nA,Civil Law,Nimal,nimal@example.com\nB,Civil Law,Nimal,nimal@example.com\n"
+        import_matters(BytesIO(csv.encode()), fmt='csv')
+        self.assertEqual(CaseRollup.objects.get(caseType=self.civil, status='active').count, 2)
+        self.assertMatchesRebuild()
+
+
+class AnalyticsEndpointTests(APITestCase):
+    def test_report_reads_rollups_with_constant_queries(self):
+        civil = CaseType.objects.create(name="Civil Law")
+        for size in (1, 5, 20):
+            with self.subTest(size=size):
+                client = Client.objects.create(name=f"Client {size}")
+                for i in range(size):
+                    case = Case.objects.create(title=f"Case {i}", caseType=civil, clientId=client)
+                    Reminder.objects.create(title="Hearing", dueDate=timezone.now(), caseId=case, completed=i % 2 == 0)
+                with self.assertNumQueries(5):
+                    response = self.client.get('/api/analytics')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.data['casesByType'][0]['count'], Case.objects.count())
+                self.assertEqual(response.data['casesByMonth'][-1]['count'], Case.objects.count())
+                completion = response.data['reminderCompletion'][-1]
+                self.assertEqual(completion['total'], Reminder.objects.count())
+                self.assertEqual(completion['completed'], Reminder.objects.filter(completed=True).count())
+                self.assertEqual(response.data['clientWorkload'][0]['total'], size)
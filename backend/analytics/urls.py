@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import AnalyticsView
+
+urlpatterns = [
+    path('analytics', AnalyticsView.as_view()),
+]
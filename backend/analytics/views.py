@@ -0,0 +1,73 @@
+from datetime import date
+
+from django.db.models import Q, Sum
+from rest_framework import views, permissions
+from rest_framework.response import Response
+
+from core.authentication import CsrfExemptSessionAuthentication, SignedTokenAuthentication
+from .models import CaseRollup, ReminderRollup, ClientWorkload
+
+
+def _months_ago(today, months):
+    month_index = today.year * 12 + today.month - 1 - (months - 1)
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+class AnalyticsView(views.APIView):
+    authentication_classes = (SignedTokenAuthentication, CsrfExemptSessionAuthentication)
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        try:
+            months = max(int(request.query_params.get('months', 12)), 1)
+            client_limit = max(int(request.query_params.get('clients', 10)), 1)
+        except ValueError:
+            return Response({'message': 'months and clients must be integers'}, status=400)
+        since = _months_ago(date.today(), months)
+
+        cases = CaseRollup.objects.filter(count__gt=0)
+        cases_by_month = (
+            cases.filter(month__gte=since).values('month')
+            .annotate(count=Sum('count')).order_by('month')
+        )
+        cases_by_type = (
+            cases.values('caseType_id', 'caseType__name')
+            .annotate(count=Sum('count')).order_by('-count')
+        )
+        cases_by_status = cases.values('status').annotate(count=Sum('count')).order_by('-count')
+
+        reminders_by_month = (
+            ReminderRollup.objects.filter(month__gte=since).values('month')
+            .annotate(total=Sum('count'), completed=Sum('count', filter=Q(completed=True)))
+            .order_by('month')
+        )
+
+        workload = (
+            ClientWorkload.objects.filter(count__gt=0).values('client_id', 'client__name')
+            .annotate(total=Sum('count'), active=Sum('count', filter=Q(status='active')))
+            .order_by('-total')[:client_limit]
+        )
+
+        return Response({
+            'casesByMonth': [
+                {'month': row['month'].strftime('%Y-%m'), 'count': row['count']} for row in cases_by_month
+            ],
+            'casesByType': [
+                {'caseTypeId': row['caseType_id'], 'caseType': row['caseType__name'], 'count': row['count']}
+                for row in cases_by_type
+            ],
+            'casesByStatus': list(cases_by_status),
+            'reminderCompletion': [
+                {
+                    'month': row['month'].strftime('%Y-%m'),
+                    'total': row['total'],
+                    'completed': row['completed'] or 0,
+                    'rate': round((row['completed'] or 0) / row['total'], 4) if row['total'] else 0,
+                }
+                for row in reminders_by_month
+            ],
+            'clientWorkload': [
+                {'clientId': row['client_id'], 'client': row['client__name'], 'total': row['total'], 'active': row['active'] or 0}
+                for row in workload
+            ],
+        })
@@ -49,9 +49,13 @@ INSTALLED_APPS = [
     'cases',
     'reminders',
     'core',
+    'analytics',
+    'history',
+    'jobs',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -60,6 +64,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'history.middleware.HistoryRequestMiddleware',
 ]
 
 CORS_ALLOWED_ORIGINS = [
@@ -74,6 +79,7 @@ CSRF_TRUSTED_ORIGINS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
+        'core.authentication.SignedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -81,6 +87,10 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Signed API tokens (seconds)
+ACCESS_TOKEN_LIFETIME = int(os.getenv('ACCESS_TOKEN_LIFETIME', 5 * 60))
+REFRESH_TOKEN_LIFETIME = int(os.getenv('REFRESH_TOKEN_LIFETIME', 7 * 24 * 60 * 60))
+
 ROOT_URLCONF = 'backend_main.urls'
 
 TEMPLATES = [
@@ -152,6 +162,51 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Background text extraction for uploaded case documents (0 = run inline)
+DOCUMENT_EXTRACTION_WORKERS = int(os.getenv('DOCUMENT_EXTRACTION_WORKERS', 2))
+
+# Background re-encoding of uploaded avatars into fixed sizes (0 = run inline)
+AVATAR_WORKERS = int(os.getenv('AVATAR_WORKERS', 1))
+
+# Cases in a terminal status untouched for this many days move to the archive tables
+ARCHIVE_STATUSES = tuple(os.getenv('ARCHIVE_STATUSES', 'closed,archived').split(','))
+ARCHIVE_AFTER_DAYS = int(os.getenv('ARCHIVE_AFTER_DAYS', 365))
+
+
+# Country code added to local phone numbers when normalizing them to E.164
+DEFAULT_PHONE_COUNTRY_CODE = os.getenv('DEFAULT_PHONE_COUNTRY_CODE', '94')
+
+# Where `manage.py backup` writes database snapshots and content-addressed media
+BACKUP_ROOT = os.getenv('BACKUP_ROOT', BASE_DIR / 'backups')
+
+
+# Database-backed job queue, drained by `manage.py run_worker`
+JOB_WORKER_CONCURRENCY = int(os.getenv('JOB_WORKER_CONCURRENCY', 4))
+JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', 1.0))
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 5))
+# A job locked for longer than this (seconds) is assumed to have lost its worker
+JOB_LOCK_TIMEOUT = int(os.getenv('JOB_LOCK_TIMEOUT', 600))
+JOB_RETENTION_DAYS = int(os.getenv('JOB_RETENTION_DAYS', 7))
+# {job name: interval in seconds} that workers enqueue periodically
+JOB_SCHEDULE = {
+    'jobs.purge_finished': 24 * 60 * 60,
+    'cases.purge_chunks': 24 * 60 * 60,
+}
+
+# Dashboard counters older than this (seconds) are refreshed by a background job
+DASHBOARD_STATS_MAX_AGE = int(os.getenv('DASHBOARD_STATS_MAX_AGE', 60))
+# Past this age they are counted inline, so the numbers stay bounded without a running worker
+DASHBOARD_STATS_HARD_MAX_AGE = int(os.getenv('DASHBOARD_STATS_HARD_MAX_AGE', 10 * DASHBOARD_STATS_MAX_AGE))
+
+# Prometheus metrics at /metrics. With several worker processes, point METRICS_DIR at a
+# directory they share; each writes its totals there every METRICS_FLUSH_INTERVAL seconds
+METRICS_DIR = os.getenv('METRICS_DIR', '')
+METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', 5))
+# The media tree is walked for its size at most this often (seconds)
+METRICS_MEDIA_INTERVAL = int(os.getenv('METRICS_MEDIA_INTERVAL', 300))
+# Scrapers send `Authorization: Bearer <METRICS_TOKEN>`; /metrics is closed when unset, unless DEBUG is on
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
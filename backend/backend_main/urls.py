@@ -1,33 +1,21 @@
-from django.contrib import admin
-from django.urls import path, include
-from rest_framework import routers
-from clients.views import ClientViewSet
-from cases.views import CaseViewSet, CaseDocumentViewSet, CaseTypeViewSet
-from reminders.views import ReminderViewSet
-from core.views import UserViewSet, DashboardStatsView, LoginView, UpdateProfileView, LogoutView, MeView, SendTestEmailView, SystemSettingsView
-
-router = routers.DefaultRouter(trailing_slash=False)
-router.register(r'users', UserViewSet)
-router.register(r'clients', ClientViewSet)
-router.register(r'cases', CaseViewSet)
-router.register(r'case-types', CaseTypeViewSet)
-router.register(r'case-documents', CaseDocumentViewSet)
-router.register(r'reminders', ReminderViewSet)
-
 from django.conf import settings
 from django.conf.urls.static import static
+from django.contrib import admin
+from django.urls import path
+from core.lazy_urls import lazy_include
+from core.metrics import metrics_view
 
+# Each app's views are imported on the first request routed to them rather than
+# when this module loads, so a fresh worker only pays for the endpoints it serves
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('api/', include(router.urls)),
-    path('api/dashboard-stats/', DashboardStatsView.as_view(), name='dashboard-stats'),
-    # Extra compatibility routes
-    path('api/dashboard/stats', DashboardStatsView.as_view()),
-    path('api/auth/login', LoginView.as_view()),
-    path('api/auth/logout', LogoutView.as_view()),
-    path('api/auth/me', MeView.as_view()),
-    path('api/user/<int:pk>', UpdateProfileView.as_view()),
-    path('api/test-email', SendTestEmailView.as_view(), name='test-email'),
-    path('api/system-settings', SystemSettingsView.as_view()),
+    path('metrics', metrics_view),
+    lazy_include('api/', 'core.urls', prefixes=(
+        '', 'users', 'dashboard-stats', 'dashboard', 'auth', 'user', 'test-email', 'system-settings',
+    )),
+    lazy_include('api/', 'clients.urls', prefixes=('clients',)),
+    lazy_include('api/', 'cases.urls', prefixes=('cases', 'archived-cases', 'case-types', 'case-documents')),
+    lazy_include('api/', 'reminders.urls', prefixes=('reminders',)),
+    lazy_include('api/', 'analytics.urls', prefixes=('analytics',)),
+    lazy_include('api/', 'history.urls', prefixes=('history',)),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-
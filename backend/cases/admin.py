@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Case, CaseType
+from core.changelists import ScalableAdmin, status_action
+from .models import CASE_STATUSES, ArchivedCase, Case, CaseType
 
 @admin.register(CaseType)
 class CaseTypeAdmin(admin.ModelAdmin):
@@ -7,7 +8,19 @@ class CaseTypeAdmin(admin.ModelAdmin):
     search_fields = ('name', 'code')
 
 @admin.register(Case)
-class CaseAdmin(admin.ModelAdmin):
+class CaseAdmin(ScalableAdmin):
     list_display = ('title', 'caseNumber', 'caseType', 'clientId', 'status', 'priority', 'createdAt')
-    search_fields = ('title', 'caseNumber')
+    list_select_related = ('caseType', 'clientId')
+    prefix_search_fields = ('title', 'caseNumber')
+    search_help_text = "Start of the title or case number"
     list_filter = ('status', 'priority', 'caseType')
+    raw_id_fields = ('clientId',)
+    actions = [status_action(status) for status in CASE_STATUSES]
+
+@admin.register(ArchivedCase)
+class ArchivedCaseAdmin(ScalableAdmin):
+    list_display = ('title', 'caseNumber', 'caseType', 'clientId', 'status', 'archivedAt')
+    list_select_related = ('caseType', 'clientId')
+    prefix_search_fields = ('title', 'caseNumber')
+    list_filter = ('status', 'caseType')
+    raw_id_fields = ('clientId',)
@@ -0,0 +1,164 @@
+from collections import defaultdict
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from reminders.models import ArchivedReminder, Reminder, ReminderOccurrence
+from .models import ArchivedCase, ArchivedCaseDocument, Case, CaseDocument, CaseDocumentText, CaseStatusChange
+from .signals import cases_archived, cases_restored
+
+DEFAULT_BATCH_SIZE = 200
+OVERRIDE_FIELDS = ('id', 'originalDate', 'dueDate', 'title', 'location', 'completed', 'cancelled')
+
+
+class NotArchivable(ValueError):
+    pass
+
+
+def _copy(source, target_model, **extra):
+    """Build a `target_model` instance from the columns it shares with `source`."""
+    values = source.__dict__
+    fields = {field.attname: values[field.attname] for field in target_model._meta.concrete_fields if field.attname in values}
+    return target_model(**{**fields, **extra})
+
+
+def _raw_delete(queryset):
+    # A plain DELETE: the rows are moving, not going away, so no delete signals
+    # (history, analytics rollups) should fire and no cascade collection is needed
+    queryset._raw_delete(queryset.db)
+
+
+def _raw_insert(model, objs):
+    # Unlike bulk_create(), a raw insert keeps auto_now/auto_now_add values and sends no signals.
+    # Rows without a pk leave the column out so the database assigns one (an explicit NULL
+    # is rejected by PostgreSQL)
+    fields = model._meta.local_concrete_fields
+    with_pk = [obj for obj in objs if obj.pk is not None]
+    without_pk = [obj for obj in objs if obj.pk is None]
+    if with_pk:
+        model._base_manager._insert(with_pk, fields=fields, raw=True)
+    if without_pk:
+        model._base_manager._insert(without_pk, fields=[f for f in fields if not f.primary_key], raw=True)
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def terminal_statuses():
+    return [status.lower() for status in settings.ARCHIVE_STATUSES]
+
+
+def is_terminal(status):
+    return (status or '').lower() in terminal_statuses()
+
+
+def archivable_cases(older_than_days=None, now=None):
+    """Cases in a terminal status whose last change is older than the cut-off."""
+    if older_than_days is None:
+        older_than_days = settings.ARCHIVE_AFTER_DAYS
+    cutoff = (now or timezone.now()) - timedelta(days=older_than_days)
+    return Case.objects.filter(status__in=terminal_statuses(), updatedAt__lt=cutoff)
+
+
+def _archive_batch(case_ids):
+    cases = list(Case.objects.filter(pk__in=case_ids))
+    history = defaultdict(list)
+    for change in CaseStatusChange.objects.filter(case__in=case_ids).order_by('changedAt', 'pk'):
+        history[change.case_id].append(
+            {'id': change.pk, 'fromStatus': change.fromStatus, 'toStatus': change.toStatus,
+             'changedAt': change.changedAt}
+        )
+    overrides = defaultdict(list)
+    for override in ReminderOccurrence.objects.filter(reminder__caseId__in=case_ids).order_by('pk'):
+        overrides[override.reminder_id].append({field: getattr(override, field) for field in OVERRIDE_FIELDS})
+
+    ArchivedCase.objects.bulk_create([_copy(case, ArchivedCase, statusHistory=history[case.pk]) for case in cases])
+    ArchivedCaseDocument.objects.bulk_create([
+        _copy(document, ArchivedCaseDocument, extracted={
+            'contentHash': document.extracted.contentHash,
+            'text': document.extracted.text,
+            'status': document.extracted.status,
+        } if hasattr(document, 'extracted') else None)
+        for document in CaseDocument.objects.filter(case__in=case_ids).select_related('extracted')
+    ])
+    ArchivedReminder.objects.bulk_create([
+        _copy(reminder, ArchivedReminder, overrides=overrides[reminder.pk])
+        for reminder in Reminder.objects.filter(caseId__in=case_ids)
+    ])
+
+    _raw_delete(ReminderOccurrence.objects.filter(reminder__caseId__in=case_ids))
+    _raw_delete(Reminder.objects.filter(caseId__in=case_ids))
+    _raw_delete(CaseDocumentText.objects.filter(document__case__in=case_ids))
+    _raw_delete(CaseDocument.objects.filter(case__in=case_ids))
+    _raw_delete(CaseStatusChange.objects.filter(case__in=case_ids))
+    _raw_delete(Case.objects.filter(pk__in=case_ids))
+    return [case.pk for case in cases]
+
+
+def archive_cases(case_ids, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """
+    Move cases, with their reminders, document metadata and status history,
+    into the archive tables. Each batch is one transaction, so a case is
+    always entirely hot or entirely archived. Document files stay in place.
+    """
+    archived = 0
+    for batch in _batches(case_ids, batch_size):
+        with transaction.atomic():
+            moved = _archive_batch(batch)
+            cases_archived.send(sender=Case, case_ids=moved)
+        archived += len(moved)
+        if progress:
+            progress(archived)
+    return archived
+
+
+def archive_case(case):
+    if not is_terminal(case.status):
+        raise NotArchivable(f"Only cases with status {', '.join(settings.ARCHIVE_STATUSES)} can be archived")
+    return archive_cases([case.pk])
+
+
+def _datetime(value):
+    return parse_datetime(value) if isinstance(value, str) else value
+
+
+@transaction.atomic
+def restore_case(archived):
+    """Move an archived case back into the hot tables under its original ids."""
+    case = _copy(archived, Case, updatedAt=timezone.now())
+    _raw_insert(Case, [case])
+    _raw_insert(CaseStatusChange, [
+        CaseStatusChange(id=change.get('id'), case=case, fromStatus=change['fromStatus'],
+                         toStatus=change['toStatus'], changedAt=_datetime(change['changedAt']))
+        for change in archived.statusHistory
+    ])
+
+    documents = list(archived.documents.all())
+    _raw_insert(CaseDocument, [_copy(document, CaseDocument) for document in documents])
+    _raw_insert(CaseDocumentText, [
+        CaseDocumentText(document_id=document.pk, extractedAt=timezone.now(), **document.extracted)
+        for document in documents if document.extracted
+    ])
+
+    reminders = list(archived.reminders.all())
+    _raw_insert(Reminder, [_copy(reminder, Reminder) for reminder in reminders])
+    _raw_insert(ReminderOccurrence, [
+        ReminderOccurrence(reminder_id=reminder.pk, **{
+            field: _datetime(value) if field in ('originalDate', 'dueDate') else value
+            for field, value in override.items()
+        })
+        for reminder in reminders for override in reminder.overrides
+    ])
+
+    _raw_delete(ArchivedReminder.objects.filter(caseId=archived.pk))
+    _raw_delete(ArchivedCaseDocument.objects.filter(case=archived.pk))
+    _raw_delete(ArchivedCase.objects.filter(pk=archived.pk))
+    cases_restored.send(sender=Case, case_ids=[case.pk])
+    return case
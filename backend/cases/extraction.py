@@ -0,0 +1,127 @@
+import hashlib
+import logging
+import os
+import threading
+from functools import partial
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+TEXT_EXTENSIONS = {'.txt', '.md', '.csv', '.json', '.xml', '.html', '.htm', '.rtf'}
+HASH_BLOCK_SIZE = 1024 * 1024
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(partial(f.read, HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _extract_pdf(path):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return None
+    reader = PdfReader(path)
+    return '\n'.join(page.extract_text() or '' for page in reader.pages)
+
+
+def extract_text(path):
+    """Return the plain text of `path`, or None when the file type is not supported."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.pdf':
+        return _extract_pdf(path)
+    if extension in TEXT_EXTENSIONS:
+        with open(path, 'rb') as f:
+            return f.read().decode('utf-8', errors='replace')
+    return None
+
+
+def run_extraction(path, known_hash=None):
+    """
+    Worker-process entry point. Touches only the filesystem, never the database.
+
+    Returns (contentHash, status, text); status is 'unchanged' when the file
+    still matches `known_hash` so the caller can skip the write entirely.
+    """
+    content_hash = hash_file(path)
+    if content_hash == known_hash:
+        return content_hash, 'unchanged', None
+    try:
+        text = extract_text(path)
+    except Exception:
+        logger.exception("Text extraction failed for %s", path)
+        return content_hash, 'failed', ''
+    if text is None:
+        return content_hash, 'unsupported', ''
+    return content_hash, 'done', text.replace('\x00', '')
+
+
+def store_result(document_id, content_hash, status, text):
+    from .models import CaseDocument, CaseDocumentText
+
+    if status == 'unchanged':
+        return
+    # The document may have been deleted while it was being extracted
+    if not CaseDocument.objects.filter(pk=document_id).exists():
+        return
+    CaseDocumentText.objects.update_or_create(
+        document_id=document_id,
+        defaults={'contentHash': content_hash, 'status': status, 'text': text},
+    )
+
+
+def get_executor():
+    global _executor
+    # Imported here so that loading this module does not pull in multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=settings.DOCUMENT_EXTRACTION_WORKERS)
+        return _executor
+
+
+def _on_extracted(document_id, future):
+    # Runs on the executor's result thread, which has its own DB connection
+    try:
+        store_result(document_id, *future.result())
+    except Exception:
+        logger.exception("Could not store extracted text for document %s", document_id)
+    finally:
+        connection.close()
+
+
+def schedule_extraction(document_id):
+    """
+    Extract a document's text off the request path.
+
+    With DOCUMENT_EXTRACTION_WORKERS = 0 the work runs inline, which is what
+    tests and one-off management commands use.
+    """
+    from .models import CaseDocument
+
+    document = CaseDocument.objects.select_related('extracted').filter(pk=document_id).first()
+    if document is None or not document.file:
+        return
+    try:
+        path = document.file.path
+    except NotImplementedError:
+        logger.warning("Storage for document %s has no local path; skipping extraction", document_id)
+        return
+    if not os.path.exists(path):
+        return
+    known_hash = getattr(getattr(document, 'extracted', None), 'contentHash', None)
+
+    if settings.DOCUMENT_EXTRACTION_WORKERS == 0:
+        store_result(document_id, *run_extraction(path, known_hash))
+        return
+    future = get_executor().submit(run_extraction, path, known_hash)
+    future.add_done_callback(partial(_on_extracted, document_id))
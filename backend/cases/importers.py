@@ -0,0 +1,243 @@
+import csv
+import io
+import json
+from collections import defaultdict
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import Q
+
+from clients.models import Client
+from clients.normalization import canonical_email, canonical_nic
+from .models import CASE_PRIORITIES, CASE_STATUSES, Case, CaseStatusChange, CaseType
+from .signals import cases_bulk_created
+
+DEFAULT_CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 50
+
+CLIENT_FIELDS = {
+    'clientName': 'name',
+    'clientNic': 'nic',
+    'clientEmail': 'email',
+    'clientPhone': 'phone',
+    'clientAddress': 'address',
+}
+CASE_FIELDS = ('title', 'caseNumber', 'status', 'priority', 'description')
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def detect_format(filename):
+    name = (filename or '').lower()
+    if name.endswith(('.jsonl', '.ndjson', '.json')):
+        return 'jsonl'
+    return 'csv'
+
+
+def _text_stream(stream):
+    # Uploaded files and files opened with 'rb' yield bytes; wrap them lazily
+    if isinstance(stream, io.TextIOBase):
+        return stream
+    return io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+
+def iter_rows(stream, fmt):
+    """Yield one dict per matter without reading the whole file into memory."""
+    try:
+        yield from _iter_rows(_text_stream(stream), fmt)
+    except UnicodeDecodeError as e:
+        raise ImportFormatError(f"The file is not valid UTF-8 text: {e.reason}")
+
+
+def _iter_rows(text, fmt):
+    if fmt == 'csv':
+        yield from csv.DictReader(text)
+    elif fmt == 'jsonl':
+        for line_number, line in enumerate(text, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                raise ImportFormatError(f"Line {line_number}: {e}")
+            if not isinstance(row, dict):
+                raise ImportFormatError(f"Line {line_number}: expected a JSON object")
+            yield row
+    else:
+        raise ImportFormatError(f"Unsupported format: {fmt}")
+
+
+def _clean(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _choice_error(case_data, field, choices):
+    value = case_data[field]
+    if value is None:
+        return None
+    case_data[field] = value = value.lower()
+    if value not in choices:
+        return f"Invalid {field} {value!r}; expected one of {', '.join(choices)}"
+    return None
+
+
+class MatterImporter:
+    """
+    Streams matters (one client + case per row) into the database.
+
+    Case types are few and kept in a map for the whole run; clients are
+    resolved per chunk by NIC or email so memory stays bounded by the chunk
+    size rather than the file or table size.
+
+    Each chunk commits on its own. When the file turns out to be malformed
+    part-way, the rows read so far are still imported and the run stops
+    there, recording the first row it did not import in stats['stoppedAt'].
+    """
+
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.case_types = {}
+        for case_type in CaseType.objects.all():
+            self.case_types[case_type.name.lower()] = case_type
+            if case_type.code:
+                self.case_types.setdefault(case_type.code.lower(), case_type)
+        self.stats = {
+            'rows': 0,
+            'casesCreated': 0,
+            'clientsCreated': 0,
+            'caseTypesCreated': 0,
+            'skipped': 0,
+            'errors': [],
+            'stoppedAt': None,
+        }
+
+    def _read_chunk(self, rows):
+        chunk = []
+        try:
+            chunk.extend(islice(rows, self.chunk_size))
+        except ImportFormatError as e:
+            return chunk, e
+        return chunk, None
+
+    def run(self, rows):
+        rows = enumerate(rows, start=1)
+        while True:
+            chunk, error = self._read_chunk(rows)
+            if chunk:
+                with transaction.atomic():
+                    self._import_chunk(chunk)
+                if self.progress:
+                    self.progress(self.stats)
+            if error is not None:
+                self.stats['stoppedAt'] = {'row': self.stats['rows'] + 1, 'message': str(error)}
+                return self.stats
+            if not chunk:
+                return self.stats
+
+    def _error(self, row_number, message):
+        self.stats['skipped'] += 1
+        if len(self.stats['errors']) < MAX_REPORTED_ERRORS:
+            self.stats['errors'].append({'row': row_number, 'message': message})
+
+    def _resolve_case_type(self, value):
+        key = value.lower()
+        case_type = self.case_types.get(key)
+        if case_type is None:
+            case_type = CaseType.objects.create(name=value)
+            self.case_types[key] = case_type
+            self.stats['caseTypesCreated'] += 1
+        return case_type
+
+    def _resolve_clients(self, parsed):
+        # Matched on the canonical forms, as the duplicate detector does, so an
+        # old-format NIC or a differently cased email finds the existing client
+        for p in parsed:
+            p['nicKey'] = canonical_nic(p['client'].get('nic'))
+            p['emailKey'] = canonical_email(p['client'].get('email'))
+        nics = {p['nicKey'] for p in parsed if p['nicKey']}
+        emails = {p['emailKey'] for p in parsed if p['emailKey']}
+        by_nic, by_email = {}, {}
+        if nics or emails:
+            for client in Client.objects.filter(Q(normalizedNic__in=nics) | Q(normalizedEmail__in=emails)):
+                if client.normalizedNic:
+                    by_nic.setdefault(client.normalizedNic, client)
+                if client.normalizedEmail:
+                    by_email.setdefault(client.normalizedEmail, client)
+
+        new_clients = []
+        for p in parsed:
+            data = p['client']
+            if not data.get('name') and not data.get('nic') and not data.get('email'):
+                continue
+            client = by_nic.get(p['nicKey']) or by_email.get(p['emailKey'])
+            if client is None:
+                client = Client(**{k: v for k, v in data.items() if v is not None})
+                if not client.name:
+                    client.name = data.get('email') or data.get('nic')
+                new_clients.append(client)
+                if p['nicKey']:
+                    by_nic[p['nicKey']] = client
+                if p['emailKey']:
+                    by_email[p['emailKey']] = client
+            p['clientObj'] = client
+
+        if new_clients:
+            Client.objects.bulk_create(new_clients)
+            self.stats['clientsCreated'] += len(new_clients)
+
+    def _import_chunk(self, chunk):
+        parsed = []
+        for row_number, row in chunk:
+            self.stats['rows'] += 1
+            case_data = {field: _clean(row.get(field)) for field in CASE_FIELDS}
+            if not case_data['title']:
+                self._error(row_number, "Missing title")
+                continue
+            error = _choice_error(case_data, 'status', CASE_STATUSES)
+            error = error or _choice_error(case_data, 'priority', CASE_PRIORITIES)
+            if error:
+                self._error(row_number, error)
+                continue
+            parsed.append({
+                'row': row_number,
+                'case': {k: v for k, v in case_data.items() if v is not None},
+                'caseType': _clean(row.get('caseType')),
+                'client': {model_field: _clean(row.get(column)) for column, model_field in CLIENT_FIELDS.items()},
+            })
+        if not parsed:
+            return
+
+        self._resolve_clients(parsed)
+
+        cases = []
+        needs_number = defaultdict(list)
+        for p in parsed:
+            case = Case(**p['case'])
+            if p['caseType']:
+                case.caseType = self._resolve_case_type(p['caseType'])
+            case.clientId = p.get('clientObj')
+            if not case.caseNumber and case.caseType:
+                needs_number[case.caseType.pk].append(case)
+            cases.append(case)
+
+        # One count query per case type per chunk instead of one per case
+        for type_cases in needs_number.values():
+            numbers = Case.allocate_case_numbers(type_cases[0].caseType, len(type_cases))
+            for case, number in zip(type_cases, numbers):
+                case.caseNumber = number
+
+        Case.objects.bulk_create(cases)
+        CaseStatusChange.objects.bulk_create([CaseStatusChange(case=case, toStatus=case.status) for case in cases])
+        cases_bulk_created.send(sender=Case, cases=cases)
+        self.stats['casesCreated'] += len(cases)
+
+
+def import_matters(stream, fmt='csv', chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    return MatterImporter(chunk_size=chunk_size, progress=progress).run(iter_rows(stream, fmt))
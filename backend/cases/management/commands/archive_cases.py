@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from cases.archive import DEFAULT_BATCH_SIZE, archivable_cases, archive_cases
+from history.recorder import batch
+
+
+class Command(BaseCommand):
+    help = "Move closed cases older than the archive age into the archive tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.ARCHIVE_AFTER_DAYS,
+                            help="Archive cases not updated for this many days (default: ARCHIVE_AFTER_DAYS)")
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help="Only report how many cases would be archived")
+
+    def handle(self, *args, **options):
+        case_ids = list(archivable_cases(options['days']).order_by('pk').values_list('pk', flat=True))
+        if options['dry_run']:
+            self.stdout.write(f"{len(case_ids)} cases would be archived")
+            return
+
+        def progress(archived):
+            self.stdout.write(f"  {archived}/{len(case_ids)} cases archived")
+
+        with batch():
+            archived = archive_cases(case_ids, batch_size=options['batch_size'], progress=progress)
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} cases"))
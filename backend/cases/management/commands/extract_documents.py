@@ -0,0 +1,30 @@
+from concurrent.futures import ProcessPoolExecutor
+from django.core.management.base import BaseCommand
+from cases.extraction import run_extraction, store_result
+from cases.models import CaseDocument
+
+
+class Command(BaseCommand):
+    help = "Extract and index the text of case documents, skipping files whose content is unchanged"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None, help="Process pool size (default: CPU count)")
+
+    def handle(self, *args, **options):
+        jobs = []
+        documents = CaseDocument.objects.select_related('extracted').order_by('pk').iterator(chunk_size=500)
+        for document in documents:
+            if not document.file or not document.file.storage.exists(document.file.name):
+                continue
+            known_hash = getattr(getattr(document, 'extracted', None), 'contentHash', None)
+            jobs.append((document.pk, document.file.path, known_hash))
+
+        counts = {}
+        with ProcessPoolExecutor(max_workers=options['workers']) as executor:
+            results = executor.map(run_extraction, [path for _, path, _ in jobs], [h for _, _, h in jobs])
+            for (document_id, _, _), result in zip(jobs, results):
+                store_result(document_id, *result)
+                counts[result[1]] = counts.get(result[1], 0) + 1
+
+        summary = ', '.join(f"{count} {status}" for status, count in sorted(counts.items())) or "nothing to do"
+        self.stdout.write(self.style.SUCCESS(f"Processed {len(jobs)} documents: {summary}"))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from cases.importers import DEFAULT_CHUNK_SIZE, detect_format, import_matters
+from history.recorder import batch
+
+
+class Command(BaseCommand):
+    help = "Stream-import clients and cases from a CSV or JSON Lines file"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV or JSON Lines file to import")
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help="Defaults to the file extension")
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or detect_format(path)
+
+        def progress(stats):
+            self.stdout.write(f"  {stats['rows']} rows processed, {stats['casesCreated']} cases created")
+
+        try:
+            with open(path, 'rb') as f, batch():
+                stats = import_matters(f, fmt=fmt, chunk_size=options['chunk_size'], progress=progress)
+        except FileNotFoundError:
+            raise CommandError(f"File not found: {path}")
+
+        for error in stats['errors']:
+            self.stderr.write(f"  Row {error['row']}: {error['message']}")
+        summary = (
+            f"Imported {stats['casesCreated']} cases, {stats['clientsCreated']} new clients, "
+            f"{stats['caseTypesCreated']} new case types ({stats['skipped']} rows skipped)"
+        )
+        stopped = stats['stoppedAt']
+        if stopped:
+            raise CommandError(f"Stopped at row {stopped['row']}: {stopped['message']}. {summary} before stopping.")
+        self.stdout.write(self.style.SUCCESS(summary))
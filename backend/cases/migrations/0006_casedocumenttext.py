@@ -0,0 +1,68 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+FTS_TABLE = 'cases_casedocumenttext_fts'
+
+CREATE_FTS_SQL = [
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        text,
+        content='cases_casedocumenttext',
+        content_rowid='document_id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER cases_casedocumenttext_ai AFTER INSERT ON cases_casedocumenttext BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.document_id, new.text);
+    END""",
+    f"""CREATE TRIGGER cases_casedocumenttext_ad AFTER DELETE ON cases_casedocumenttext BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) VALUES ('delete', old.document_id, old.text);
+    END""",
+    f"""CREATE TRIGGER cases_casedocumenttext_au AFTER UPDATE ON cases_casedocumenttext BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) VALUES ('delete', old.document_id, old.text);
+        INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.document_id, new.text);
+    END""",
+]
+
+DROP_FTS_SQL = [
+    'DROP TRIGGER IF EXISTS cases_casedocumenttext_au',
+    'DROP TRIGGER IF EXISTS cases_casedocumenttext_ad',
+    'DROP TRIGGER IF EXISTS cases_casedocumenttext_ai',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+
+def create_fts_index(apps, schema_editor):
+    # FTS5 is SQLite-only; other backends fall back to icontains search
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in CREATE_FTS_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in DROP_FTS_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0005_remove_case_nic'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CaseDocumentText',
+            fields=[
+                ('document', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='extracted', serialize=False, to='cases.casedocument')),
+                ('contentHash', models.CharField(db_index=True, max_length=64)),
+                ('text', models.TextField(blank=True, default='')),
+                ('status', models.CharField(choices=[('done', 'Done'), ('unsupported', 'Unsupported'), ('failed', 'Failed')], default='done', max_length=20)),
+                ('extractedAt', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(create_fts_index, drop_fts_index),
+    ]
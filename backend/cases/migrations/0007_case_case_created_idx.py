@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0006_casedocumenttext'),
+        ('clients', '0002_client_nic'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['createdAt'], name='case_created_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:46
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_initial_status(apps, schema_editor):
+    # Give existing cases a starting point on their timeline
+    Case = apps.get_model('cases', 'Case')
+    CaseStatusChange = apps.get_model('cases', 'CaseStatusChange')
+    batch = []
+    for case_id, status, created_at in Case.objects.values_list('id', 'status', 'createdAt').iterator(chunk_size=1000):
+        batch.append(CaseStatusChange(case_id=case_id, toStatus=status, changedAt=created_at))
+        if len(batch) >= 1000:
+            CaseStatusChange.objects.bulk_create(batch)
+            batch = []
+    CaseStatusChange.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0007_case_case_created_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CaseStatusChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fromStatus', models.CharField(blank=True, max_length=50, null=True)),
+                ('toStatus', models.CharField(max_length=50)),
+                ('changedAt', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='casedocument',
+            index=models.Index(fields=['case', 'uploadedAt'], name='document_case_time_idx'),
+        ),
+        migrations.AddField(
+            model_name='casestatuschange',
+            name='case',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='statusChanges', to='cases.case'),
+        ),
+        migrations.AddIndex(
+            model_name='casestatuschange',
+            index=models.Index(fields=['case', 'changedAt'], name='statuschange_case_time_idx'),
+        ),
+        migrations.RunPython(backfill_initial_status, migrations.RunPython.noop),
+    ]
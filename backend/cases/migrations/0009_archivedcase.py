@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:51
+
+import django.core.serializers.json
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0008_casestatuschange'),
+        ('clients', '0002_client_nic'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedCase',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('caseNumber', models.CharField(blank=True, max_length=100, null=True)),
+                ('status', models.CharField(max_length=50)),
+                ('priority', models.CharField(max_length=50)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('createdAt', models.DateTimeField()),
+                ('updatedAt', models.DateTimeField()),
+                ('archivedAt', models.DateTimeField(default=django.utils.timezone.now)),
+                ('statusHistory', models.JSONField(default=list, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('caseType', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='archivedCases', to='cases.casetype')),
+                ('clientId', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='archivedCases', to='clients.client')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedCaseDocument',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('file', models.FileField(upload_to='case_documents/')),
+                ('title', models.CharField(max_length=255)),
+                ('uploadedAt', models.DateTimeField()),
+                ('extracted', models.JSONField(blank=True, null=True)),
+                ('case', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='documents', to='cases.archivedcase')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='archivedcase',
+            index=models.Index(fields=['createdAt'], name='archivedcase_created_idx'),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:01
+
+import core.fields
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+
+def lowercase_status(apps, schema_editor):
+    for model in ('Case', 'ArchivedCase'):
+        apps.get_model('cases', model).objects.update(status=Lower('status'), priority=Lower('priority'))
+    CaseStatusChange = apps.get_model('cases', 'CaseStatusChange')
+    CaseStatusChange.objects.update(fromStatus=Lower('fromStatus'), toStatus=Lower('toStatus'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0009_archivedcase'),
+        ('clients', '0003_normalize_status'),
+    ]
+
+    operations = [
+        migrations.RunPython(lowercase_status, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='archivedcase',
+            name='priority',
+            field=core.fields.LowercaseCharField(max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='archivedcase',
+            name='status',
+            field=core.fields.LowercaseCharField(max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='case',
+            name='priority',
+            field=core.fields.LowercaseCharField(default='medium', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='case',
+            name='status',
+            field=core.fields.LowercaseCharField(default='active', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='casestatuschange',
+            name='fromStatus',
+            field=core.fields.LowercaseCharField(blank=True, max_length=50, null=True),
+        ),
+        migrations.AlterField(
+            model_name='casestatuschange',
+            name='toStatus',
+            field=core.fields.LowercaseCharField(max_length=50),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['updatedAt'], name='case_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['status', 'createdAt'], name='case_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['priority', 'createdAt'], name='case_priority_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['caseType', 'createdAt'], name='case_type_created_idx'),
+        ),
+    ]
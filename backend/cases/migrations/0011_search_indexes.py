@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:07
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0010_normalize_status'),
+        ('clients', '0005_client_name_lower_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='archivedcase',
+            index=models.Index(django.db.models.functions.text.Lower('title'), name='archivedcase_title_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedcase',
+            index=models.Index(django.db.models.functions.text.Lower('caseNumber'), name='archivedcase_number_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(django.db.models.functions.text.Lower('title'), name='case_title_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(django.db.models.functions.text.Lower('caseNumber'), name='case_number_lower_idx'),
+        ),
+    ]
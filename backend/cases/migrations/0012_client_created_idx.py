@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0011_search_indexes'),
+        ('clients', '0005_client_name_lower_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['clientId', 'createdAt'], name='case_client_created_idx'),
+        ),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0012_client_created_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentChunk',
+            fields=[
+                ('hash', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('size', models.PositiveIntegerField()),
+                ('createdAt', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DocumentChunkRef',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('documentId', models.BigIntegerField()),
+                ('position', models.PositiveIntegerField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='archivedcasedocument',
+            name='isLatest',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddField(
+            model_name='archivedcasedocument',
+            name='original',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='cases.archivedcasedocument'),
+        ),
+        migrations.AddField(
+            model_name='archivedcasedocument',
+            name='size',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedcasedocument',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='casedocument',
+            name='fileName',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='casedocument',
+            name='isLatest',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddField(
+            model_name='casedocument',
+            name='original',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='laterVersions', to='cases.casedocument'),
+        ),
+        migrations.AddField(
+            model_name='casedocument',
+            name='size',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='casedocument',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddConstraint(
+            model_name='casedocument',
+            constraint=models.UniqueConstraint(fields=('original', 'version'), name='document_version_unique'),
+        ),
+        migrations.AddField(
+            model_name='documentchunkref',
+            name='chunk',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='refs', to='cases.documentchunk'),
+        ),
+        migrations.AddConstraint(
+            model_name='documentchunkref',
+            constraint=models.UniqueConstraint(fields=('documentId', 'position'), name='chunkref_document_position_unique'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0013_document_versions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedcasedocument',
+            name='fileName',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
@@ -1,5 +1,14 @@
-from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
 from clients.models import Client
+from core.fields import LowercaseCharField
+from .signals import cases_status_changed
+
+# The values offered by the case form
+CASE_STATUSES = ('active', 'pending', 'review', 'closed')
+CASE_PRIORITIES = ('low', 'medium', 'high', 'urgent')
 
 class CaseType(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -12,49 +21,233 @@ class Case(models.Model):
     title = models.CharField(max_length=255)
     caseNumber = models.CharField(max_length=100, null=True, blank=True)
     caseType = models.ForeignKey(CaseType, on_delete=models.PROTECT, related_name="cases", null=True, blank=True)
-    status = models.CharField(max_length=50, default="active")
-    priority = models.CharField(max_length=50, default="medium")
+    status = LowercaseCharField(max_length=50, default="active")
+    priority = LowercaseCharField(max_length=50, default="medium")
     description = models.TextField(null=True, blank=True)
     clientId = models.ForeignKey(Client, on_delete=models.CASCADE, related_name="cases", null=True, blank=True)
     createdAt = models.DateTimeField(auto_now_add=True)
     updatedAt = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['createdAt'], name='case_created_idx'),
+            models.Index(fields=['updatedAt'], name='case_updated_idx'),
+            models.Index(fields=['status', 'createdAt'], name='case_status_created_idx'),
+            models.Index(fields=['priority', 'createdAt'], name='case_priority_created_idx'),
+            models.Index(fields=['caseType', 'createdAt'], name='case_type_created_idx'),
+            # A client's latest cases, for the client detail endpoint
+            models.Index(fields=['clientId', 'createdAt'], name='case_client_created_idx'),
+            # Prefix search in the admin is a range scan on these
+            models.Index(Lower('title'), name='case_title_lower_idx'),
+            models.Index(Lower('caseNumber'), name='case_number_lower_idx'),
+        ]
+
+    @staticmethod
+    def type_code(case_type):
+        # Use provided code or get type code (First letters of each word)
+        if case_type.code:
+            return case_type.code
+        return "".join([word[0].upper() for word in case_type.name.split()])
+
+    @classmethod
+    def allocate_case_numbers(cls, case_type, count, year=None):
+        """Reserve `count` consecutive case numbers for `case_type` in `year`."""
+        if year is None:
+            year = timezone.now().year
+
+        # Count existing cases of same type in same year (archived ones keep their numbers)
+        existing = sum(
+            model.objects.filter(caseType=case_type, createdAt__year=year).count()
+            for model in (cls, ArchivedCase)
+        )
+
+        # Fallback if createdAt isn't set yet (for new records before save)
+        if existing == 0:
+            from django.db.models import Q
+            existing = sum(
+                model.objects.filter(caseType=case_type).filter(Q(caseNumber__contains=f"/{year}/")).count()
+                for model in (cls, ArchivedCase)
+            )
+
+        type_code = cls.type_code(case_type)
+        return [f"{type_code}/{year}/{(existing + i + 1):03d}" for i in range(count)]
+
+    @classmethod
+    def bulk_set_status(cls, queryset, status, batch_size=1000):
+        """
+        Move every case in `queryset` to `status` with one UPDATE per batch.
+
+        save() is bypassed, so the status history rows are bulk-inserted here
+        and cases_status_changed lets rollups and the change log follow.
+        Returns the number of cases whose status changed.
+        """
+        status = status.lower()
+        pending = queryset.exclude(status=status).order_by('pk')
+        changed, last = 0, 0
+        while True:
+            with transaction.atomic():
+                rows = list(pending.filter(pk__gt=last).values(
+                    'id', 'status', 'createdAt', 'caseType_id', 'clientId_id')[:batch_size])
+                if not rows:
+                    return changed
+                ids = [row['id'] for row in rows]
+                cls.objects.filter(pk__in=ids).update(status=status, updatedAt=timezone.now())
+                CaseStatusChange.objects.bulk_create([
+                    CaseStatusChange(case_id=row['id'], fromStatus=row['status'], toStatus=status) for row in rows
+                ])
+                cases_status_changed.send(sender=cls, cases=rows, status=status)
+            changed += len(rows)
+            last = ids[-1]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so save() can record transitions
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
     def save(self, *args, **kwargs):
         if not self.caseNumber and self.caseType:
-            from django.utils import timezone
-            year = timezone.now().year
-            
-            # Use provided code or get type code (First letters of each word)
-            if self.caseType.code:
-                type_code = self.caseType.code
-            else:
-                type_code = "".join([word[0].upper() for word in self.caseType.name.split()])
-            
-            # Count existing cases of same type in same year
-            count = Case.objects.filter(
-                caseType=self.caseType,
-                createdAt__year=year
-            ).count()
-            
-            # Fallback if createdAt isn't set yet (for new records before save)
-            if count == 0:
-                from django.db.models import Q
-                count = Case.objects.filter(caseType=self.caseType).filter(
-                    Q(caseNumber__contains=f"/{year}/")
-                ).count()
-
-            self.caseNumber = f"{type_code}/{year}/{(count + 1):03d}"
+            self.caseNumber = self.allocate_case_numbers(self.caseType, 1)[0]
+
+        adding = self._state.adding
+        previous = None if adding else getattr(self, '_loaded_status', None)
+        if not adding and previous is None:
+            previous = Case.objects.filter(pk=self.pk).values_list('status', flat=True).first()
             
         super().save(*args, **kwargs)
 
+        if adding or previous != self.status:
+            CaseStatusChange.objects.create(case=self, fromStatus=previous, toStatus=self.status)
+        self._loaded_status = self.status
+
     def __str__(self):
         return f"{self.caseNumber} - {self.title}" if self.caseNumber else self.title
 
+class CaseStatusChange(models.Model):
+    case = models.ForeignKey(Case, on_delete=models.CASCADE, related_name="statusChanges")
+    fromStatus = LowercaseCharField(max_length=50, null=True, blank=True)
+    toStatus = LowercaseCharField(max_length=50)
+    changedAt = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['case', 'changedAt'], name='statuschange_case_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.case_id}: {self.fromStatus} -> {self.toStatus}"
+
 class CaseDocument(models.Model):
     case = models.ForeignKey(Case, on_delete=models.CASCADE, related_name="documents")
+    # Emptied once a superseded version is stored as chunks (see cases.versions)
     file = models.FileField(upload_to="case_documents/")
     title = models.CharField(max_length=255)
     uploadedAt = models.DateTimeField(auto_now_add=True)
+    # Version chain: every later version points at the first one, which has no `original`
+    original = models.ForeignKey('self', on_delete=models.CASCADE, related_name="laterVersions", null=True, blank=True)
+    version = models.PositiveIntegerField(default=1)
+    isLatest = models.BooleanField(default=True)
+    size = models.BigIntegerField(null=True, blank=True)
+    # Name of the uploaded file, kept for downloads after `file` is emptied
+    fileName = models.CharField(max_length=255, blank=True, default="")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['case', 'uploadedAt'], name='document_case_time_idx'),
+        ]
+        constraints = [
+            # Two concurrent uploads cannot both become version n + 1
+            models.UniqueConstraint(fields=['original', 'version'], name='document_version_unique'),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.case.caseNumber})"
+
+class CaseDocumentText(models.Model):
+    STATUS_CHOICES = (
+        ('done', 'Done'),
+        ('unsupported', 'Unsupported'),
+        ('failed', 'Failed'),
+    )
+
+    document = models.OneToOneField(CaseDocument, on_delete=models.CASCADE, primary_key=True, related_name="extracted")
+    contentHash = models.CharField(max_length=64, db_index=True)
+    text = models.TextField(blank=True, default="")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="done")
+    extractedAt = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Text of {self.document_id} ({self.status})"
+
+class DocumentChunk(models.Model):
+    """A content-addressed block of document data, stored once however many versions contain it."""
+    hash = models.CharField(max_length=64, primary_key=True)
+    size = models.PositiveIntegerField()
+    createdAt = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.hash
+
+class DocumentChunkRef(models.Model):
+    """
+    One entry of a stored version's chunk list. `documentId` is a plain id
+    rather than a foreign key so archiving a case (which moves its document
+    rows under the same ids) leaves the manifests alone.
+    """
+    documentId = models.BigIntegerField()
+    position = models.PositiveIntegerField()
+    chunk = models.ForeignKey(DocumentChunk, on_delete=models.PROTECT, related_name="refs")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['documentId', 'position'], name='chunkref_document_position_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.documentId}[{self.position}] = {self.chunk_id}"
+
+class ArchivedCase(models.Model):
+    """Cold-tier copy of a closed case, keeping the primary key of the Case row it replaced."""
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=255)
+    caseNumber = models.CharField(max_length=100, null=True, blank=True)
+    caseType = models.ForeignKey(CaseType, on_delete=models.PROTECT, related_name="archivedCases", null=True, blank=True)
+    status = LowercaseCharField(max_length=50)
+    priority = LowercaseCharField(max_length=50)
+    description = models.TextField(null=True, blank=True)
+    clientId = models.ForeignKey(Client, on_delete=models.CASCADE, related_name="archivedCases", null=True, blank=True)
+    createdAt = models.DateTimeField()
+    updatedAt = models.DateTimeField()
+    archivedAt = models.DateTimeField(default=timezone.now)
+    # [{fromStatus, toStatus, changedAt}, ...] from CaseStatusChange, oldest first
+    statusHistory = models.JSONField(default=list, encoder=DjangoJSONEncoder)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['createdAt'], name='archivedcase_created_idx'),
+            models.Index(Lower('title'), name='archivedcase_title_lower_idx'),
+            models.Index(Lower('caseNumber'), name='archivedcase_number_lower_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.caseNumber} - {self.title} (archived)" if self.caseNumber else f"{self.title} (archived)"
+
+class ArchivedCaseDocument(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    case = models.ForeignKey(ArchivedCase, on_delete=models.CASCADE, related_name="documents")
+    # The stored file is left where it is; only the metadata moves
+    file = models.FileField(upload_to="case_documents/")
+    title = models.CharField(max_length=255)
+    uploadedAt = models.DateTimeField()
+    # The version chain is archived along with the case; chunk manifests stay where they are
+    original = models.ForeignKey('self', on_delete=models.DO_NOTHING, db_constraint=False, related_name="+", null=True, blank=True)
+    version = models.PositiveIntegerField(default=1)
+    isLatest = models.BooleanField(default=True)
+    size = models.BigIntegerField(null=True, blank=True)
+    fileName = models.CharField(max_length=255, blank=True, default="")
+    # {contentHash, text, status} from CaseDocumentText, so a restore needs no re-extraction
+    extracted = models.JSONField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.title} (archived)"
@@ -0,0 +1,54 @@
+from django.db import connection
+
+from .models import CaseDocument, CaseDocumentText
+
+FTS_TABLE = 'cases_casedocumenttext_fts'
+SNIPPET_TOKENS = 16
+
+
+def _match_expression(query):
+    # Quote every term so user input can never be parsed as FTS5 syntax
+    terms = [term.replace('"', '""') for term in query.split()]
+    return ' '.join(f'"{term}"' for term in terms if term)
+
+
+def _fts_matches(query, case_id, limit):
+    sql = (
+        f"SELECT f.rowid, snippet({FTS_TABLE}, 0, '[', ']', '…', {SNIPPET_TOKENS}) "
+        f"FROM {FTS_TABLE} f "
+        f"JOIN cases_casedocument d ON d.id = f.rowid "
+        f"WHERE {FTS_TABLE} MATCH %s AND d.\"isLatest\""
+    )
+    params = [_match_expression(query)]
+    if case_id is not None:
+        sql += " AND d.case_id = %s"
+        params.append(case_id)
+    sql += " ORDER BY rank LIMIT %s"
+    params.append(limit)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def _fallback_matches(query, case_id, limit):
+    texts = CaseDocumentText.objects.filter(text__icontains=query, document__isLatest=True)
+    if case_id is not None:
+        texts = texts.filter(document__case_id=case_id)
+    matches = []
+    for document_id, text in texts.values_list('document_id', 'text')[:limit]:
+        position = text.lower().find(query.lower())
+        start = max(position - 80, 0)
+        matches.append((document_id, '…' + text[start:position + len(query) + 80] + '…'))
+    return matches
+
+
+def search_documents(query, case_id=None, limit=20):
+    """Return [(CaseDocument, snippet)] for documents whose text matches `query`, best first."""
+    if not _match_expression(query):
+        return []
+    if connection.vendor == 'sqlite':
+        matches = _fts_matches(query, case_id, limit)
+    else:
+        matches = _fallback_matches(query, case_id, limit)
+    documents = CaseDocument.objects.select_related('case').in_bulk([document_id for document_id, _ in matches])
+    return [(documents[document_id], snippet) for document_id, snippet in matches if document_id in documents]
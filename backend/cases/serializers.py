@@ -1,5 +1,6 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
-from .models import Case, CaseDocument, CaseType
+from .models import ArchivedCase, ArchivedCaseDocument, Case, CaseDocument, CaseType
 from clients.serializers import ClientSerializer
 
 class CaseTypeSerializer(serializers.ModelSerializer):
@@ -11,6 +12,7 @@ class CaseDocumentSerializer(serializers.ModelSerializer):
     class Meta:
         model = CaseDocument
         fields = '__all__'
+        read_only_fields = ('original', 'version', 'isLatest', 'size', 'fileName')
 
 class CaseSerializer(serializers.ModelSerializer):
     client = ClientSerializer(source='clientId', read_only=True)
@@ -22,5 +24,48 @@ class CaseSerializer(serializers.ModelSerializer):
         model = Case
         fields = '__all__'
 
+    @staticmethod
+    def setup_eager_loading(queryset, prefix=''):
+        queryset = queryset.select_related(f'{prefix}clientId', f'{prefix}caseType')
+        queryset = queryset.prefetch_related(
+            # Earlier versions are reached through /api/case-documents/{id}/versions
+            Prefetch(f'{prefix}documents', queryset=CaseDocument.objects.filter(isLatest=True)),
+            f'{prefix}reminders',
+        )
+        return ClientSerializer.setup_eager_loading(queryset, prefix=f'{prefix}clientId__')
+
+    def get_reminders(self, obj):
+        # Iterate the (possibly prefetched) reminders instead of issuing a .values() query
+        return [
+            {'id': reminder.id, 'title': reminder.title, 'dueDate': reminder.dueDate}
+            for reminder in obj.reminders.all()
+        ]
+
+class ArchivedCaseDocumentSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedCaseDocument
+        exclude = ('extracted',)
+
+class ArchivedCaseSerializer(serializers.ModelSerializer):
+    clientName = serializers.CharField(source='clientId.name', read_only=True, default=None)
+    type_details = CaseTypeSerializer(source='caseType', read_only=True)
+    documents = ArchivedCaseDocumentSerializer(many=True, read_only=True)
+    reminders = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ArchivedCase
+        fields = '__all__'
+
+    @staticmethod
+    def setup_eager_loading(queryset, prefix=''):
+        queryset = queryset.select_related(f'{prefix}clientId', f'{prefix}caseType')
+        return queryset.prefetch_related(
+            Prefetch(f'{prefix}documents', queryset=ArchivedCaseDocument.objects.filter(isLatest=True)),
+            f'{prefix}reminders',
+        )
+
     def get_reminders(self, obj):
-        return list(obj.reminders.all().values('id', 'title', 'dueDate'))
+        return [
+            {'id': reminder.id, 'title': reminder.title, 'dueDate': reminder.dueDate, 'completed': reminder.completed}
+            for reminder in obj.reminders.all()
+        ]
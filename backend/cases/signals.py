@@ -0,0 +1,13 @@
+from django.dispatch import Signal
+
+# Sent with `cases=[...]` after Case.objects.bulk_create(), which skips post_save
+cases_bulk_created = Signal()
+
+# Sent with `case_ids=[...]` after cases move between the hot and archive tables;
+# the rows are moved with raw deletes/bulk inserts, so no per-row signals fire
+cases_archived = Signal()
+cases_restored = Signal()
+
+# Sent with `cases=[{id, status, createdAt, caseType_id, clientId_id}]` (values before
+# the change) and `status` after Case.bulk_set_status() moved them with a plain UPDATE
+cases_status_changed = Signal()
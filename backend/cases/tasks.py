@@ -0,0 +1,13 @@
+from jobs.queue import task
+from .versions import chunk_superseded, purge_unused_chunks
+
+
+@task('cases.chunk_superseded')
+def chunk_superseded_version(payload):
+    """Move a replaced document version from its plain file into the shared chunk store."""
+    chunk_superseded(payload['id'])
+
+
+@task('cases.purge_chunks')
+def purge_chunks(payload):
+    purge_unused_chunks()
@@ -1,3 +1,676 @@
-from django.test import TestCase
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from clients.models import Client
+from analytics.models import CaseRollup
+from analytics.rollups import rebuild
+from core.changelists import EstimatedCountPaginator
+from history.models import ChangeEntry
+from history.recorder import flush
+from jobs.queue import run_pending
+from reminders.models import Reminder, ReminderOccurrence
+from .archive import archivable_cases, archive_cases, restore_case
+from .extraction import run_extraction
+from .importers import import_matters
+from .models import (
+    ArchivedCase, ArchivedCaseDocument, Case, CaseDocument, CaseDocumentText, CaseStatusChange, CaseType,
+    DocumentChunk, DocumentChunkRef,
+)
+from .versions import MAX_CHUNK, iter_chunks, purge_unused_chunks
 
-# Create your tests here.
+FIXTURE_SIZES = (1, 5, 20)
+
+
+def build_cases(count):
+    """Create `count` cases, each with its own client, a document and two reminders."""
+    case_type, _ = CaseType.objects.get_or_create(name="Civil Law", defaults={"code": "CIV"})
+    cases = []
+    for i in range(count):
+        client = Client.objects.create(name=f"Client {i}", email=f"client{i}@example.com")
+        case = Case.objects.create(title=f"Case {i}", caseType=case_type, clientId=client)
+        CaseDocument.objects.create(case=case, title=f"Plaint {i}", file=f"case_documents/plaint_{i}.pdf")
+        for j in range(2):
+            Reminder.objects.create(title=f"Hearing {i}.{j}", dueDate=timezone.now(), caseId=case)
+        cases.append(case)
+    return cases
+
+
+class CaseQueryBudgetTests(APITestCase):
+    # main select (client + type joined), documents, reminders, client's cases
+    CASE_QUERIES = 4
+
+    def tearDown(self):
+        Case.objects.all().delete()
+        Client.objects.all().delete()
+
+    def test_case_list_query_count_is_constant(self):
+        for size in FIXTURE_SIZES:
+            with self.subTest(size=size):
+                build_cases(size)
+                with self.assertNumQueries(self.CASE_QUERIES):
+                    response = self.client.get('/api/cases')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.data), Case.objects.count())
+
+    def test_case_list_filtered_by_client_query_count_is_constant(self):
+        for size in FIXTURE_SIZES:
+            with self.subTest(size=size):
+                case = build_cases(size)[0]
+                with self.assertNumQueries(self.CASE_QUERIES):
+                    response = self.client.get('/api/cases', {'clientId': case.clientId_id})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.data), 1)
+
+    def test_case_detail_query_count_is_constant(self):
+        for size in FIXTURE_SIZES:
+            with self.subTest(size=size):
+                case = build_cases(size)[0]
+                with self.assertNumQueries(self.CASE_QUERIES):
+                    response = self.client.get(f'/api/cases/{case.id}')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.data['reminders']), 2)
+                self.assertEqual(response.data['client']['cases'][0]['documentCount'], 1)
+                self.assertEqual(response.data['client']['cases'][0]['reminderCount'], 2)
+
+    def test_case_type_list_query_count_is_constant(self):
+        for size in FIXTURE_SIZES:
+            with self.subTest(size=size):
+                for i in range(size):
+                    CaseType.objects.create(name=f"Type {size}-{i}")
+                with self.assertNumQueries(1):
+                    response = self.client.get('/api/case-types')
+                self.assertEqual(response.status_code, 200)
+
+    def test_case_document_list_query_count_is_constant(self):
+        for size in FIXTURE_SIZES:
+            with self.subTest(size=size):
+                build_cases(size)
+                with self.assertNumQueries(1):
+                    response = self.client.get('/api/case-documents')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.data), CaseDocument.objects.count())
+
+
+class ImportMattersTests(APITestCase):
+    CSV = (
+        "title,caseType,status,clientName,clientNic,clientEmail\n"
+        "Partition Action,Land Law,active,Aruna Perera,781234567V,aruna@example.com\n"
+        "Lease Dispute,Land Law,pending,Aruna P.,781234567V,\n"
+        "Bail Application,Criminal Law,active,Nimal Silva,,nimal@example.com\n"
+        ",Land Law,active,No Title,,\n"
+    )
+
+    def test_csv_import_resolves_clients_and_allocates_numbers(self):
+        CaseType.objects.create(name="Land Law", code="LND")
+        existing = Client.objects.create(name="Nimal Silva", email="nimal@example.com")
+        progress_calls = []
+
+        stats = import_matters(BytesIO(self.CSV.encode()), fmt='csv', chunk_size=2, progress=progress_calls.append)
+
+        self.assertEqual(stats['casesCreated'], 3)
+        self.assertEqual(stats['clientsCreated'], 1)
+        self.assertEqual(stats['caseTypesCreated'], 1)
+        self.assertEqual(stats['skipped'], 1)
+        self.assertEqual(len(progress_calls), 2)
+        self.assertEqual(Client.objects.get(nic="781234567V").cases.count(), 2)
+        self.assertEqual(existing.cases.get().title, "Bail Application")
+        numbers = sorted(Case.objects.filter(caseType__code="LND").values_list('caseNumber', flat=True))
+        year = timezone.now().year
+        self.assertEqual(numbers, [f"LND/{year}/001", f"LND/{year}/002"])
+
+    def test_jsonl_upload_endpoint(self):
+        body = (
+            '{"title": "Trade Mark Infringement", "caseType": "Commercial Law", "clientName": "Hemas", "clientEmail": "legal@hemas.com"}\n'
+            '\n'
+            '{"title": "Licensing Arbitration", "caseType": "Commercial Law", "clientEmail": "legal@hemas.com"}\n'
+        )
+        upload = SimpleUploadedFile("matters.jsonl", body.encode(), content_type="application/x-ndjson")
+        response = self.client.post('/api/cases/import', {'file': upload}, format='multipart')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['casesCreated'], 2)
+        self.assertEqual(Client.objects.count(), 1)
+        self.assertEqual(Case.objects.filter(caseNumber__startswith="CL/").count(), 2)
+
+    def test_upload_endpoint_rejects_malformed_jsonl(self):
+        upload = SimpleUploadedFile("matters.jsonl", b"not json\n")
+        response = self.client.post('/api/cases/import', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 400)
+
+    def test_upload_endpoint_rejects_non_utf8_csv(self):
+        body = "title,clientName\nServitude Claim,Renée Fernando\n".encode('latin-1')
+        upload = SimpleUploadedFile("matters.csv", body, content_type="text/csv")
+        response = self.client.post('/api/cases/import', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("UTF-8", response.data['message'])
+
+    def test_malformed_line_stops_the_import_and_reports_what_was_saved(self):
+        body = (
+            '{"title": "Partition Action"}\n'
+            '{"title": "Lease Dispute"}\n'
+            '{"title": "Bail Application"}\n'
+            '{"title": "Servitude Claim"\n'
+            '{"title": "Never Read"}\n'
+        )
+        upload = SimpleUploadedFile("matters.jsonl", body.encode(), content_type="application/x-ndjson")
+        response = self.client.post('/api/cases/import', {'file': upload}, format='multipart')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['casesCreated'], 3)
+        self.assertEqual(response.data['stoppedAt']['row'], 4)
+        self.assertIn("Line 4", response.data['message'])
+        self.assertEqual(Case.objects.count(), 3)
+
+        path = os.path.join(tempfile.mkdtemp(), "matters.jsonl")
+        self.addCleanup(shutil.rmtree, os.path.dirname(path))
+        with open(path, 'w') as f:
+            f.write(body)
+        with self.assertRaisesMessage(CommandError, "Stopped at row 4"):
+            call_command('import_matters', path, stdout=StringIO())
+        self.assertEqual(Case.objects.count(), 6)
+
+    def test_clients_are_matched_on_normalized_nic_and_email(self):
+        existing = Client.objects.create(name="Aruna Perera", nic="781234567V", email="Aruna@Example.com")
+        csv_body = (
+            "title,clientName,clientNic,clientEmail\n"
+            "Partition Action,Aruna Perera,197812304567,\n"
+            "Lease Dispute,Aruna P.,,aruna@example.COM\n"
+        )
+        stats = import_matters(BytesIO(csv_body.encode()), fmt='csv')
+
+        self.assertEqual(stats['clientsCreated'], 0)
+        self.assertEqual(existing.cases.count(), 2)
+
+    def test_unknown_status_and_priority_are_skipped(self):
+        csv_body = (
+            "title,status,priority\n"
+            "Partition Action,Pending,HIGH\n"
+            "Lease Dispute,on hold,low\n"
+            "Bail Application,active,critical\n"
+        )
+        stats = import_matters(BytesIO(csv_body.encode()), fmt='csv')
+
+        self.assertEqual(stats['casesCreated'], 1)
+        self.assertEqual([error['row'] for error in stats['errors']], [2, 3])
+        case = Case.objects.get()
+        self.assertEqual((case.status, case.priority), ("pending", "high"))
+
+
+class CaseExportTests(APITestCase):
+    def test_csv_export_streams_joined_names_in_one_query(self):
+        for size in FIXTURE_SIZES:
+            with self.subTest(size=size):
+                build_cases(size)
+                with self.assertNumQueries(1):
+                    response = self.client.get('/api/cases/export')
+                    body = b''.join(response.streaming_content).decode()
+                lines = body.strip().splitlines()
+                self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+                self.assertTrue(lines[0].startswith('id,caseNumber,title,caseType'))
+                self.assertEqual(len(lines), Case.objects.count() + 1)
+                self.assertIn('Civil Law', lines[1])
+
+    def test_gzipped_ndjson_export(self):
+        case = build_cases(2)[0]
+        response = self.client.get('/api/cases/export', {'output': 'ndjson', 'gzip': '1', 'clientId': case.clientId_id})
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertIn('cases.ndjson.gz', response['Content-Disposition'])
+        rows = [json.loads(line) for line in gzip.decompress(b''.join(response.streaming_content)).splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['client'], case.clientId.name)
+        self.assertEqual(rows[0]['caseNumber'], case.caseNumber)
+
+    def test_csv_cells_are_not_read_as_formulas(self):
+        Case.objects.create(title='=HYPERLINK("http://example.com")', description="-2+3")
+        response = self.client.get('/api/cases/export')
+        body = b''.join(response.streaming_content).decode()
+        self.assertIn('"\'=HYPERLINK(""http://example.com"")"', body)
+        self.assertIn(",'-2+3,", body)
+        response = self.client.get('/api/cases/export', {'output': 'ndjson'})
+        row = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(row['title'], '=HYPERLINK("http://example.com")')
+
+    def test_unknown_output_is_rejected(self):
+        response = self.client.get('/api/cases/export', {'output': 'xml'})
+        self.assertEqual(response.status_code, 400)
+
+
+class DocumentSearchTests(APITestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root, DOCUMENT_EXTRACTION_WORKERS=0)
+        self.settings_override.enable()
+        self.case = Case.objects.create(title="Partition Action")
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def upload(self, name, content):
+        upload = SimpleUploadedFile(name, content)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/case-documents', {
+                'case': self.case.id, 'title': name, 'file': upload,
+            }, format='multipart')
+        self.assertEqual(response.status_code, 201)
+        return CaseDocument.objects.get(pk=response.data['id'])
+
+    def test_uploaded_text_is_extracted_and_searchable(self):
+        document = self.upload("plaint.txt", b"The plaintiff relies on Deed No. 4521 attested by the notary.")
+        self.upload("answer.txt", b"The defendant denies every averment.")
+
+        self.assertEqual(document.extracted.status, 'done')
+        response = self.client.get('/api/case-documents/search', {'q': '4521'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['id'] for r in response.data], [document.id])
+        self.assertIn('[4521]', response.data[0]['snippet'])
+        self.assertEqual(response.data[0]['caseNumber'], self.case.caseNumber)
+
+    def test_search_input_is_not_parsed_as_fts_syntax(self):
+        self.upload("plaint.txt", b"Deed No. 4521")
+        response = self.client.get('/api/case-documents/search', {'q': 'deed" OR (NEAR'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, [])
+
+    def test_search_limit_is_clamped(self):
+        self.upload("plaint.txt", b"Deed No. 4521")
+        self.upload("answer.txt", b"Deed No. 4521 is disputed.")
+        response = self.client.get('/api/case-documents/search', {'q': '4521', 'limit': -1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
+
+    def test_deleting_a_document_removes_it_from_the_index(self):
+        document = self.upload("plaint.txt", b"Deed No. 4521")
+        document.delete()
+        response = self.client.get('/api/case-documents/search', {'q': '4521'})
+        self.assertEqual(response.data, [])
+
+    def test_unchanged_content_is_skipped(self):
+        document = self.upload("plaint.txt", b"Deed No. 4521")
+        content_hash = document.extracted.contentHash
+        self.assertEqual(run_extraction(document.file.path, content_hash), (content_hash, 'unchanged', None))
+
+    def test_unsupported_files_are_recorded(self):
+        document = self.upload("photo.bin", b"\x00\x01")
+        self.assertEqual(CaseDocumentText.objects.get(document=document).status, 'unsupported')
+
+
+class CaseTimelineTests(APITestCase):
+    def setUp(self):
+        self.case = Case.objects.create(title="Partition Action")
+        base = timezone.now()
+        for i in range(7):
+            document = CaseDocument.objects.create(case=self.case, title=f"Doc {i}", file=f"case_documents/doc_{i}.pdf")
+            CaseDocument.objects.filter(pk=document.pk).update(uploadedAt=base + timezone.timedelta(hours=i * 3))
+            Reminder.objects.create(title=f"Reminder {i}", dueDate=base + timezone.timedelta(hours=i * 3 + 1), caseId=self.case)
+        # A tie across sources must not drop or repeat events
+        Reminder.objects.create(title="Tied", dueDate=base + timezone.timedelta(hours=3), caseId=self.case)
+        self.case.status = "closed"
+        self.case.save()
+        other = Case.objects.create(title="Unrelated")
+        Reminder.objects.create(title="Other", dueDate=base, caseId=other)
+
+    def walk(self, order, limit):
+        events, cursor, pages = [], None, 0
+        while True:
+            params = {'limit': limit, 'order': order}
+            if cursor:
+                params['cursor'] = cursor
+            with self.assertNumQueries(4):
+                response = self.client.get(f'/api/cases/{self.case.id}/timeline', params)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data['results']), limit)
+            events.extend(response.data['results'])
+            pages += 1
+            cursor = response.data['next']
+            if not cursor:
+                return events, pages
+
+    def test_pages_merge_every_source_in_order_without_gaps(self):
+        events, pages = self.walk('asc', 4)
+        self.assertEqual(len(events), 7 + 8 + 2)
+        self.assertEqual(pages, 5)
+        self.assertEqual(len({(e['type'], e['id']) for e in events}), len(events))
+        timestamps = [e['timestamp'] for e in events]
+        self.assertEqual(timestamps, sorted(timestamps))
+        self.assertEqual([e['toStatus'] for e in events if e['type'] == 'status'], ['active', 'closed'])
+
+    def test_descending_is_the_reverse_of_ascending(self):
+        ascending, _ = self.walk('asc', 5)
+        descending, _ = self.walk('desc', 3)
+        self.assertEqual([(e['type'], e['id']) for e in descending], [(e['type'], e['id']) for e in reversed(ascending)])
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(f'/api/cases/{self.case.id}/timeline', {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, 400)
+
+
+class DocumentVersionTests(APITestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root, DOCUMENT_EXTRACTION_WORKERS=0)
+        self.settings_override.enable()
+        self.case = Case.objects.create(title="Partition Action")
+        self.draft = os.urandom(1024 * 1024)
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def upload(self, content, name="plaint.txt"):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/case-documents', {
+                'case': self.case.id, 'title': "Plaint", 'file': SimpleUploadedFile(name, content),
+            }, format='multipart')
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+    def upload_version(self, document_id, content, name="plaint.txt"):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/api/case-documents/{document_id}/versions', {
+                'file': SimpleUploadedFile(name, content),
+            }, format='multipart')
+        self.assertEqual(response.status_code, 201)
+        run_pending()
+        return response.data['id']
+
+    def download(self, document_id):
+        response = self.client.get(f'/api/case-documents/{document_id}/download')
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content)
+
+    def test_chunk_boundaries_survive_an_insertion(self):
+        edited = self.draft[:300_000] + b"inserted clause" + self.draft[300_000:]
+        before = [data for _, data in iter_chunks(BytesIO(self.draft))]
+        after = [data for _, data in iter_chunks(BytesIO(edited))]
+        self.assertEqual(b''.join(after), edited)
+        self.assertLessEqual(max(map(len, after)), MAX_CHUNK)
+        self.assertLessEqual(len(set(after) - set(before)), 2)
+
+    def test_new_version_replaces_the_latest_and_keeps_history(self):
+        first = self.upload(b"Deed No. 4521, first draft")
+        second = self.upload_version(first, b"Deed No. 4521, second draft")
+
+        listed = self.client.get('/api/case-documents').data
+        self.assertEqual([d['id'] for d in listed], [second])
+        self.assertEqual([d['id'] for d in self.client.get(f'/api/cases/{self.case.id}').data['documents']], [second])
+        history = self.client.get(f'/api/case-documents/{first}/versions').data
+        self.assertEqual([(d['id'], d['version'], d['isLatest']) for d in history], [(second, 2, True), (first, 1, False)])
+        search = self.client.get('/api/case-documents/search', {'q': '4521'}).data
+        self.assertEqual([d['id'] for d in search], [second])
+
+        superseded = CaseDocument.objects.get(pk=first)
+        self.assertFalse(superseded.file)
+        self.assertEqual(superseded.fileName, "plaint.txt")
+        self.assertTrue(DocumentChunkRef.objects.filter(documentId=first).exists())
+        self.assertEqual(self.download(first), b"Deed No. 4521, first draft")
+        self.assertEqual(self.download(second), b"Deed No. 4521, second draft")
+
+    def test_a_small_edit_stores_only_the_changed_chunks(self):
+        first = self.upload(self.draft, "plaint.bin")
+        revised = self.draft[:500_000] + b"amended paragraph 12" + self.draft[500_020:]
+        second = self.upload_version(first, revised, "plaint.bin")
+        self.upload_version(second, revised + b"%%EOF", "plaint.bin")
+
+        stored = sum(DocumentChunk.objects.values_list('size', flat=True))
+        self.assertLess(stored, len(self.draft) + 2 * MAX_CHUNK)
+        self.assertEqual(self.download(first), self.draft)
+        self.assertEqual(self.download(second), revised)
+
+    def test_chunked_version_survives_archive_and_restore(self):
+        first = self.upload(b"Notice to quit, first draft", "notice.txt")
+        second = self.upload_version(first, b"Notice to quit, served", "notice.txt")
+        Case.objects.filter(pk=self.case.pk).update(status="closed")
+
+        archive_cases([self.case.pk])
+        self.assertEqual(ArchivedCaseDocument.objects.get(pk=first).fileName, "notice.txt")
+        restore_case(ArchivedCase.objects.get(pk=self.case.pk))
+
+        response = self.client.get(f'/api/case-documents/{first}/download')
+        self.assertEqual(response['Content-Type'], 'text/plain')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="notice.txt"')
+        self.assertEqual(b''.join(response.streaming_content), b"Notice to quit, first draft")
+        self.assertEqual(self.download(second), b"Notice to quit, served")
+
+    def test_download_names_are_quoted(self):
+        document = self.upload(b"Statement", "déclaration.txt")
+        response = self.client.get(f'/api/case-documents/{document}/download')
+        self.assertEqual(response['Content-Disposition'], "attachment; filename*=utf-8''d%C3%A9claration.txt")
+
+    def test_new_content_must_be_uploaded_as_a_version(self):
+        first = self.upload(b"Deed No. 4521, first draft")
+        second = self.upload_version(first, b"Deed No. 4521, second draft")
+
+        def replacement():
+            return {'file': SimpleUploadedFile("plaint.txt", b"rewritten history")}
+
+        for document in (first, second):
+            response = self.client.patch(f'/api/case-documents/{document}', replacement(), format='multipart')
+            self.assertEqual(response.status_code, 400)
+            self.assertIn(f'/api/case-documents/{document}/versions', response.data['message'])
+        self.assertEqual(self.download(first), b"Deed No. 4521, first draft")
+        self.assertEqual(self.download(second), b"Deed No. 4521, second draft")
+        self.assertEqual(CaseDocument.objects.count(), 2)
+
+        response = self.client.patch(f'/api/case-documents/{second}', {'title': "Plaint (draft)"}, format='multipart')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(CaseDocument.objects.get(pk=second).title, "Plaint (draft)")
+
+    def test_deleting_a_document_removes_its_history_and_chunks(self):
+        first = self.upload(self.draft)
+        second = self.upload_version(first, self.draft + b"appendix")
+        chunk_files = [os.path.join(self.media_root, 'document_chunks', h[:2], h)
+                       for h in DocumentChunk.objects.values_list('hash', flat=True)]
+        self.assertTrue(chunk_files and all(map(os.path.exists, chunk_files)))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.delete(f'/api/case-documents/{second}').status_code, 204)
+
+        self.assertFalse(CaseDocument.objects.exists())
+        self.assertFalse(DocumentChunkRef.objects.exists())
+        self.assertEqual(purge_unused_chunks(), len(chunk_files))
+        self.assertFalse(any(map(os.path.exists, chunk_files)))
+
+
+class CaseArchiveTests(APITestCase):
+    def setUp(self):
+        self.case_type = CaseType.objects.create(name="Civil Law", code="CIV")
+        self.client_obj = Client.objects.create(name="Aruna Perera")
+        self.case = Case.objects.create(title="Partition", caseType=self.case_type, clientId=self.client_obj)
+        self.case.status = "Closed"
+        self.case.save()
+        self.document = CaseDocument.objects.create(case=self.case, title="Plaint", file="case_documents/plaint.txt")
+        CaseDocumentText.objects.create(document=self.document, contentHash="abc", text="Deed No. 4521")
+        self.reminder = Reminder.objects.create(
+            title="Mention", dueDate=timezone.now(), caseId=self.case, recurrence="weekly", recurrenceCount=4,
+        )
+        ReminderOccurrence.objects.create(
+            reminder=self.reminder, originalDate=self.reminder.dueDate + timedelta(weeks=1), cancelled=True,
+        )
+        self.created_at = timezone.now() - timedelta(days=800)
+        Case.objects.filter(pk=self.case.pk).update(createdAt=self.created_at, updatedAt=timezone.now() - timedelta(days=400))
+        self.open_case = Case.objects.create(title="Lease", caseType=self.case_type, clientId=self.client_obj)
+        rebuild()
+
+    def archive(self):
+        return archive_cases(list(archivable_cases().values_list('pk', flat=True)))
+
+    def test_only_old_terminal_cases_are_archived(self):
+        self.assertEqual(self.archive(), 1)
+        self.assertEqual(list(Case.objects.values_list('pk', flat=True)), [self.open_case.pk])
+        self.assertFalse(Reminder.objects.exists())
+        self.assertFalse(CaseStatusChange.objects.filter(case=self.case.pk).exists())
+
+        response = self.client.get('/api/cases')
+        self.assertEqual([case['id'] for case in response.data], [self.open_case.pk])
+        self.assertEqual(self.client.get(f'/api/cases/{self.case.pk}').status_code, 404)
+        self.assertEqual(self.client.get('/api/case-documents/search', {'q': '4521'}).data, [])
+
+        archived = self.client.get(f'/api/archived-cases/{self.case.pk}').data
+        self.assertEqual(archived['caseNumber'], self.case.caseNumber)
+        self.assertEqual([document['title'] for document in archived['documents']], ["Plaint"])
+        self.assertEqual([reminder['id'] for reminder in archived['reminders']], [self.reminder.pk])
+
+    def test_archiving_keeps_rollups_and_case_numbers(self):
+        before = sorted(CaseRollup.objects.values_list('month', 'status', 'count'))
+        self.archive()
+        self.assertEqual(sorted(CaseRollup.objects.values_list('month', 'status', 'count')), before)
+        rebuild()
+        self.assertEqual(sorted(CaseRollup.objects.values_list('month', 'status', 'count')), before)
+
+        Case.objects.filter(pk=self.open_case.pk).update(createdAt=self.created_at)
+        new_case = Case.objects.create(title="Servitude", caseType=self.case_type)
+        new_case_year = Case.objects.create(title="Servitude", caseType=self.case_type, createdAt=self.created_at)
+        self.assertNotEqual(new_case.caseNumber, self.case.caseNumber)
+        self.assertNotEqual(new_case_year.caseNumber, self.case.caseNumber)
+
+    def test_restore_round_trips_everything(self):
+        status_change_ids = list(self.case.statusChanges.order_by('changedAt', 'pk').values_list('pk', flat=True))
+        self.archive()
+        response = self.client.post(f'/api/archived-cases/{self.case.pk}/restore')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['id'], self.case.pk)
+        self.assertFalse(ArchivedCase.objects.exists())
+
+        case = Case.objects.get(pk=self.case.pk)
+        self.assertEqual(case.createdAt, self.created_at)
+        self.assertEqual(case.status, "closed")
+        self.assertEqual(list(case.statusChanges.values_list('toStatus', flat=True)), ['active', 'closed'])
+        self.assertEqual(list(case.statusChanges.values_list('pk', flat=True)), status_change_ids)
+        self.assertEqual(ReminderOccurrence.objects.get(reminder=self.reminder.pk).cancelled, True)
+        self.assertEqual([r['id'] for r in self.client.get('/api/case-documents/search', {'q': '4521'}).data], [self.document.pk])
+        # A restore counts as a change, so the case is not swept straight back into the archive
+        self.assertFalse(archivable_cases().exists())
+
+    def test_history_archived_without_ids_gets_new_ones(self):
+        self.archive()
+        archived = ArchivedCase.objects.get(pk=self.case.pk)
+        for change in archived.statusHistory:
+            del change['id']
+        archived.save()
+        with CaptureQueriesContext(connection) as queries:
+            restore_case(archived)
+        insert = next(query['sql'] for query in queries if query['sql'].startswith('INSERT INTO "cases_casestatuschange"'))
+        self.assertNotIn('"id"', insert)
+        self.assertEqual(CaseStatusChange.objects.filter(case=self.case.pk).count(), 2)
+
+    def test_archive_action_requires_terminal_status(self):
+        self.assertEqual(self.client.post(f'/api/cases/{self.open_case.pk}/archive').status_code, 400)
+        self.assertEqual(self.client.post(f'/api/cases/{self.case.pk}/archive').status_code, 200)
+        self.assertTrue(ArchivedCase.objects.filter(pk=self.case.pk).exists())
+
+
+class CaseFilteringTests(APITestCase):
+    def setUp(self):
+        self.civil = CaseType.objects.create(name="Civil Law", code="CIV")
+        self.land = CaseType.objects.create(name="Land Law", code="LND")
+        now = timezone.now()
+        self.cases = {}
+        for title, status, priority, case_type, age in (
+            ("Partition", "Active", "high", self.civil, 1),
+            ("Lease", "pending", "low", self.land, 10),
+            ("Servitude", "CLOSED", "medium", self.civil, 40),
+            ("Boundary", "active", "low", self.land, 90),
+        ):
+            case = Case.objects.create(title=title, status=status, priority=priority, caseType=case_type)
+            Case.objects.filter(pk=case.pk).update(createdAt=now - timedelta(days=age))
+            self.cases[title] = case
+
+    def titles(self, params):
+        response = self.client.get('/api/cases', params)
+        self.assertEqual(response.status_code, 200)
+        return [case['title'] for case in response.data]
+
+    def test_status_is_stored_and_matched_in_lower_case(self):
+        self.assertEqual(self.cases["Servitude"].status, "closed")
+        self.assertEqual(Case.objects.filter(status="Closed").count(), 1)
+
+    def test_multi_value_filters_and_date_ranges(self):
+        self.assertEqual(self.titles({'status': 'active,Pending'}), ["Partition", "Lease", "Boundary"])
+        self.assertEqual(self.titles({'status': ['active'], 'caseType': [self.land.pk]}), ["Boundary"])
+        self.assertEqual(self.titles({'priority': ['low', 'medium']}), ["Lease", "Servitude", "Boundary"])
+        since = (timezone.now() - timedelta(days=30)).date().isoformat()
+        self.assertEqual(self.titles({'createdAtFrom': since}), ["Partition", "Lease"])
+        self.assertEqual(self.titles({'createdAtTo': since}), ["Servitude", "Boundary"])
+
+    def test_ordering_and_window(self):
+        self.assertEqual(self.titles({'ordering': 'title'}), ["Boundary", "Lease", "Partition", "Servitude"])
+        self.assertEqual(self.titles({'ordering': '-priority,title'}), ["Servitude", "Boundary", "Lease", "Partition"])
+        # page select, then documents and reminders prefetched for the two returned rows only
+        with self.assertNumQueries(3):
+            self.assertEqual(self.titles({'ordering': 'title', 'limit': 2, 'offset': 1}), ["Lease", "Partition"])
+
+    def test_unknown_ordering_and_bad_values_are_rejected(self):
+        for params in ({'ordering': 'description'}, {'caseType': 'civil'}, {'createdAtFrom': 'yesterday'}, {'limit': 'x'}):
+            with self.subTest(params=params):
+                response = self.client.get('/api/cases', params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('message', response.data)
+
+
+class CaseAdminTests(APITestCase):
+    def setUp(self):
+        self.client.force_login(get_user_model().objects.create_superuser("admin", "admin@example.com", "pw"))
+
+    def changelist_queries(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/admin/cases/case/', params)
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        counts = []
+        for size in FIXTURE_SIZES:
+            build_cases(size)
+            counts.append(self.changelist_queries()[1])
+        self.assertEqual(len(set(counts)), 1, counts)
+
+    def test_search_matches_prefix_case_insensitively(self):
+        build_cases(3)
+        Case.objects.create(title="Partition of Lot 4")
+        response, _ = self.changelist_queries(q="PARTITION")
+        self.assertEqual([case.title for case in response.context['cl'].result_list], ["Partition of Lot 4"])
+        response, _ = self.changelist_queries(q="civ/")
+        self.assertEqual(response.context['cl'].result_count, 3)
+
+    def test_bulk_status_action_keeps_history_and_rollups(self):
+        cases = build_cases(3)
+        Case.objects.filter(pk=cases[0].pk).update(status="closed")
+        rebuild()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/admin/cases/case/', {
+                'action': 'mark_closed', '_selected_action': [case.pk for case in cases],
+            })
+        self.assertEqual(response.status_code, 302)
+        flush()
+        self.assertEqual(set(Case.objects.values_list('status', flat=True)), {"closed"})
+        self.assertEqual(CaseStatusChange.objects.filter(toStatus="closed").count(), 2)
+        self.assertEqual(
+            sorted(ChangeEntry.objects.filter(action='update').values_list('objectId', flat=True)),
+            [cases[1].pk, cases[2].pk],
+        )
+        before = sorted(CaseRollup.objects.filter(count__gt=0).values_list('month', 'status', 'count'))
+        rebuild()
+        self.assertEqual(sorted(CaseRollup.objects.filter(count__gt=0).values_list('month', 'status', 'count')), before)
+
+    def test_paginator_count_is_bounded(self):
+        build_cases(3)
+        with mock.patch('core.changelists.COUNT_LIMIT', 2):
+            filtered = Case.objects.filter(title__startswith="Case").order_by('pk')
+            self.assertEqual(EstimatedCountPaginator(filtered, 10).count, 2)
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+            self.assertEqual(EstimatedCountPaginator(Case.objects.order_by('pk'), 10).count, 3)
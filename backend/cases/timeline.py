@@ -0,0 +1,113 @@
+import base64
+import heapq
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from reminders.models import Reminder
+from .models import CaseDocument, CaseStatusChange
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _document_event(document):
+    return {
+        'type': 'document',
+        'id': document.id,
+        'timestamp': document.uploadedAt,
+        'title': document.title,
+        'file': document.file.url if document.file else None,
+    }
+
+
+def _reminder_event(reminder):
+    return {
+        'type': 'reminder',
+        'id': reminder.id,
+        'timestamp': reminder.dueDate,
+        'title': reminder.title,
+        'reminderType': reminder.type,
+        'completed': reminder.completed,
+        'location': reminder.location,
+    }
+
+
+def _status_event(change):
+    return {
+        'type': 'status',
+        'id': change.id,
+        'timestamp': change.changedAt,
+        'title': f"Status changed to {change.toStatus}" if change.fromStatus else f"Case opened as {change.toStatus}",
+        'fromStatus': change.fromStatus,
+        'toStatus': change.toStatus,
+    }
+
+
+# (rank, queryset factory, timestamp field, event builder); the rank breaks timestamp ties between sources
+SOURCES = (
+    (0, lambda case_id: CaseStatusChange.objects.filter(case_id=case_id), 'changedAt', _status_event),
+    (1, lambda case_id: CaseDocument.objects.filter(case_id=case_id), 'uploadedAt', _document_event),
+    (2, lambda case_id: Reminder.objects.filter(caseId_id=case_id), 'dueDate', _reminder_event),
+)
+
+
+def encode_cursor(event, rank):
+    raw = json.dumps([event['timestamp'].isoformat(), rank, event['id']])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        timestamp, rank, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        moment = parse_datetime(timestamp)
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+    if moment is None or not isinstance(rank, int) or not isinstance(pk, int):
+        raise InvalidCursor(cursor)
+    return moment, rank, pk
+
+
+def _after(field, rank, cursor, descending):
+    """Keyset condition: rows of this source strictly past the cursor in (timestamp, rank, id) order."""
+    moment, cursor_rank, cursor_pk = cursor
+    past, past_or_equal, past_pk = ('lt', 'lte', 'lt') if descending else ('gt', 'gte', 'gt')
+    if rank == cursor_rank:
+        return Q(**{f'{field}__{past}': moment}) | Q(**{field: moment, f'pk__{past_pk}': cursor_pk})
+    # A different source at the same timestamp sorts before or after the cursor by rank alone
+    if (rank > cursor_rank) != descending:
+        return Q(**{f'{field}__{past_or_equal}': moment})
+    return Q(**{f'{field}__{past}': moment})
+
+
+def case_timeline(case_id, cursor=None, limit=DEFAULT_PAGE_SIZE, descending=True):
+    """
+    One page of the case's merged event stream.
+
+    Each source is read through its (case, timestamp) index with LIMIT
+    page+1 past the cursor, and the three sorted runs are merged lazily, so
+    a page costs three small index range scans however long the history is.
+    """
+    decoded = decode_cursor(cursor) if cursor else None
+    streams = []
+    for rank, source, field, build in SOURCES:
+        queryset = source(case_id)
+        if decoded:
+            queryset = queryset.filter(_after(field, rank, decoded, descending))
+        ordering = (f'-{field}', '-pk') if descending else (field, 'pk')
+        rows = queryset.order_by(*ordering)[:limit + 1]
+        streams.append([((getattr(row, field), rank, row.pk), build(row)) for row in rows])
+
+    merged = heapq.merge(*streams, key=lambda item: item[0], reverse=descending)
+    page = []
+    for key, event in merged:
+        if len(page) == limit:
+            return page, encode_cursor(page[-1], page_rank)
+        page.append(event)
+        page_rank = key[1]
+    return page, None
@@ -0,0 +1,11 @@
+from rest_framework import routers
+from .views import ArchivedCaseViewSet, CaseViewSet, CaseDocumentViewSet, CaseTypeViewSet
+
+router = routers.DefaultRouter(trailing_slash=False)
+router.include_root_view = False
+router.register(r'cases', CaseViewSet)
+router.register(r'archived-cases', ArchivedCaseViewSet)
+router.register(r'case-types', CaseTypeViewSet)
+router.register(r'case-documents', CaseDocumentViewSet)
+
+urlpatterns = router.urls
@@ -0,0 +1,241 @@
+import hashlib
+import os
+import re
+import tempfile
+from bisect import bisect_left
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from jobs.queue import enqueue
+from .extraction import schedule_extraction
+from .models import ArchivedCaseDocument, CaseDocument, DocumentChunk, DocumentChunkRef
+
+CHUNK_DIRECTORY = 'document_chunks'
+# Chunk boundaries depend only on the last WINDOW bytes, so an insertion or
+# deletion moves the boundaries around the edit and nowhere else
+WINDOW = 8
+MIN_CHUNK = 16 * 1024
+MAX_CHUNK = 256 * 1024
+READ_SIZE = 4 * 1024 * 1024
+READ_BLOCK = 1024 * 1024
+# A superseded file is deleted this long after its chunks are stored, so running downloads finish
+DELETE_DELAY = timedelta(minutes=10)
+PURGE_DELAY = timedelta(minutes=5)
+
+
+def _tables():
+    # Fixed, arbitrary byte permutations: changing them changes every boundary and defeats deduplication
+    tables = []
+    for lag in range(2 * WINDOW):
+        stream = b''.join(hashlib.sha256(b'case document chunk table %d %d' % (lag, i)).digest() for i in range(8))
+        tables.append(bytes.maketrans(bytes(range(256)), stream))
+    return tables
+
+
+_TABLES = _tables()
+_ZERO = re.compile(b'\x00')
+
+
+def _boundaries(buffer):
+    """
+    Offsets in `buffer` after which a chunk may end.
+
+    Each byte gets two 8-bit tabulation hashes of the WINDOW bytes ending at
+    it, one table per position in the window. They are computed for the whole
+    buffer at once with translate() and big-integer XORs, so the per-byte
+    work happens in C; a boundary is where both hashes are zero, on average
+    once every 64 KiB.
+    """
+    first = second = 0
+    for lag in range(WINDOW):
+        first ^= int.from_bytes(buffer.translate(_TABLES[lag]), 'little') << (8 * lag)
+        second ^= int.from_bytes(buffer.translate(_TABLES[WINDOW + lag]), 'little') << (8 * lag)
+    hashes = (first | second).to_bytes(len(buffer) + WINDOW, 'little')[:len(buffer)]
+    return [match.start() + 1 for match in _ZERO.finditer(hashes, WINDOW - 1)]
+
+
+def iter_chunks(f):
+    """Yield (offset, data) for content-defined chunks of the binary file `f`."""
+    buffer, offset = b'', 0
+    while True:
+        block = f.read(READ_SIZE)
+        buffer += block
+        cuts = _boundaries(buffer)
+        start = 0
+        while True:
+            index = bisect_left(cuts, start + MIN_CHUNK)
+            if index < len(cuts) and cuts[index] <= start + MAX_CHUNK:
+                end = cuts[index]
+            elif start + MAX_CHUNK <= len(buffer):
+                end = start + MAX_CHUNK
+            else:
+                break
+            yield offset + start, buffer[start:end]
+            start = end
+        buffer, offset = buffer[start:], offset + start
+        if not block:
+            if buffer:
+                yield offset, buffer
+            return
+
+
+def chunk_name(digest):
+    return f"{CHUNK_DIRECTORY}/{digest[:2]}/{digest}"
+
+
+def _chunk_path(digest):
+    return os.path.join(str(settings.MEDIA_ROOT), *chunk_name(digest).split('/'))
+
+
+def _write_chunk(digest, data):
+    path = _chunk_path(digest)
+    if os.path.exists(path):
+        return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, temporary = tempfile.mkstemp(dir=os.path.dirname(path))
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(temporary, path)
+    return True
+
+
+def write_chunks(path):
+    """Split `path` into chunks, writing those not stored yet; returns [(digest, offset, size)]."""
+    chunks = []
+    with open(path, 'rb') as f:
+        for offset, data in iter_chunks(f):
+            digest = hashlib.sha256(data).hexdigest()
+            _write_chunk(digest, data)
+            chunks.append((digest, offset, len(data)))
+    return chunks
+
+
+def store_chunks(document):
+    """
+    Store a version's file as chunks and record its manifest. Returns the
+    number of chunks, or None when the version has no local file to read.
+    """
+    try:
+        path = document.file.path
+    except (NotImplementedError, ValueError):
+        return None
+    if not os.path.exists(path):
+        return None
+    chunks = write_chunks(path)
+    with transaction.atomic():
+        DocumentChunkRef.objects.filter(documentId=document.pk).delete()
+        DocumentChunk.objects.bulk_create(
+            [DocumentChunk(hash=digest, size=size) for digest, _, size in chunks], ignore_conflicts=True,
+        )
+        DocumentChunkRef.objects.bulk_create([
+            DocumentChunkRef(documentId=document.pk, position=position, chunk_id=digest)
+            for position, (digest, _, _) in enumerate(chunks)
+        ], batch_size=500)
+    # A chunk that already existed may have been purged between the write
+    # pass and the commit above; the manifest now protects it, so put it back
+    missing = [(digest, offset, size) for digest, offset, size in chunks if not os.path.exists(_chunk_path(digest))]
+    if missing:
+        with open(path, 'rb') as f:
+            for digest, offset, size in missing:
+                f.seek(offset)
+                _write_chunk(digest, f.read(size))
+    return len(chunks)
+
+
+def release_file(document):
+    """Drop the plain file of a superseded version whose chunks are stored."""
+    name = document.file.name
+    if not name:
+        return False
+    released = CaseDocument.objects.filter(pk=document.pk, isLatest=False).update(
+        file='', fileName=document.fileName or os.path.basename(name),
+    )
+    if not released:
+        return False
+    enqueue('core.delete_media', {'names': [name]}, delay=DELETE_DELAY)
+    return True
+
+
+def chunk_superseded(document_id):
+    document = CaseDocument.objects.filter(pk=document_id, isLatest=False).first()
+    if document is None or not document.file:
+        return
+    if store_chunks(document) is not None:
+        release_file(document)
+
+
+def chain(document):
+    """Every version of `document`'s chain, oldest first."""
+    root = document.original_id or document.pk
+    return CaseDocument.objects.filter(Q(pk=root) | Q(original=root)).order_by('version')
+
+
+@transaction.atomic
+def add_version(document, file, title=None):
+    """
+    Make `file` the latest version of `document`'s chain. The previous latest
+    version is stored as chunks by a job once this commits; raises
+    IntegrityError if another version was added concurrently.
+    """
+    versions = chain(document)
+    latest = versions.filter(isLatest=True).last() or versions.last()
+    created = CaseDocument.objects.create(
+        case_id=latest.case_id, file=file, title=title or latest.title, size=file.size,
+        original_id=document.original_id or document.pk, version=latest.version + 1,
+    )
+    versions.filter(isLatest=True).exclude(pk=created.pk).update(isLatest=False)
+    enqueue('cases.chunk_superseded', {'id': latest.pk})
+    transaction.on_commit(lambda: schedule_extraction(created.pk))
+    return created
+
+
+def missing_chunks(document):
+    return [
+        digest for digest in DocumentChunkRef.objects.filter(documentId=document.pk).values_list('chunk_id', flat=True)
+        if not os.path.exists(_chunk_path(digest))
+    ]
+
+
+def read_version(document):
+    """Yield the content of any version, from its file or reassembled from its chunks."""
+    if document.file:
+        with document.file.open('rb') as f:
+            while block := f.read(READ_BLOCK):
+                yield block
+        return
+    refs = DocumentChunkRef.objects.filter(documentId=document.pk).order_by('position')
+    for digest in refs.values_list('chunk_id', flat=True).iterator(chunk_size=1000):
+        with open(_chunk_path(digest), 'rb') as f:
+            yield f.read()
+
+
+def purge_unused_chunks(batch_size=1000):
+    """Delete chunks no stored version refers to any more; returns how many were removed."""
+    used = DocumentChunkRef.objects.filter(chunk=OuterRef('pk'))
+    purged = 0
+    while hashes := list(DocumentChunk.objects.filter(~Exists(used)).values_list('pk', flat=True)[:batch_size]):
+        with transaction.atomic():
+            # Checked again inside the write: a version stored meanwhile may use some of them
+            DocumentChunk.objects.filter(pk__in=hashes).filter(~Exists(used)).delete()
+            deleted = set(hashes) - set(DocumentChunk.objects.filter(pk__in=hashes).values_list('pk', flat=True))
+            # Files go while the write is still open, so no new manifest can claim them half-deleted
+            for digest in deleted:
+                try:
+                    os.remove(_chunk_path(digest))
+                except FileNotFoundError:
+                    pass
+        purged += len(deleted)
+    return purged
+
+
+@receiver(post_delete, sender=CaseDocument)
+@receiver(post_delete, sender=ArchivedCaseDocument)
+def drop_manifest(sender, instance, **kwargs):
+    # Archiving moves rows with raw deletes, which send no signal, so this only runs for real deletions
+    if DocumentChunkRef.objects.filter(documentId=instance.pk).delete()[0]:
+        transaction.on_commit(lambda: enqueue('cases.purge_chunks', delay=PURGE_DELAY, unique=True))
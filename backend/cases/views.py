@@ -1,35 +1,202 @@
-from rest_framework import viewsets, permissions
-from .models import Case, CaseDocument, CaseType
-from .serializers import CaseSerializer, CaseDocumentSerializer, CaseTypeSerializer
+from rest_framework import exceptions, viewsets, permissions
+from rest_framework.decorators import action
+import mimetypes
+import os
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
+from django.utils.http import content_disposition_header
+from rest_framework.response import Response
+from .models import ArchivedCase, Case, CaseDocument, CaseType
+from .serializers import ArchivedCaseSerializer, CaseSerializer, CaseDocumentSerializer, CaseTypeSerializer
+from .archive import NotArchivable, archive_case, restore_case
+from .importers import detect_format, import_matters
+from .extraction import schedule_extraction
+from .search import search_documents
+from .versions import add_version, chain, missing_chunks, read_version
+from .timeline import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursor, case_timeline
+from django.shortcuts import get_object_or_404
+from core.exports import export_response
+from core.filters import StructuredFilterMixin
 from rest_framework.parsers import MultiPartParser, FormParser
-from rest_framework.authentication import SessionAuthentication
-
-class CsrfExemptSessionAuthentication(SessionAuthentication):
-    def enforce_csrf(self, request):
-        return  # Skip CSRF check for development
+from core.authentication import CsrfExemptSessionAuthentication, SignedTokenAuthentication
 
 class CaseTypeViewSet(viewsets.ModelViewSet):
     queryset = CaseType.objects.all().order_by('name')
     serializer_class = CaseTypeSerializer
-    authentication_classes = (CsrfExemptSessionAuthentication,)
+    authentication_classes = (SignedTokenAuthentication, CsrfExemptSessionAuthentication)
     permission_classes = [permissions.AllowAny]
 
-class CaseViewSet(viewsets.ModelViewSet):
+CASE_EXPORT_COLUMNS = (
+    ('id', 'id'),
+    ('caseNumber', 'caseNumber'),
+    ('title', 'title'),
+    ('caseType', 'caseType__name'),
+    ('status', 'status'),
+    ('priority', 'priority'),
+    ('client', 'clientId__name'),
+    ('clientNic', 'clientId__nic'),
+    ('description', 'description'),
+    ('createdAt', 'createdAt'),
+    ('updatedAt', 'updatedAt'),
+)
+
+class CaseViewSet(StructuredFilterMixin, viewsets.ModelViewSet):
     queryset = Case.objects.all().order_by('-createdAt')
     serializer_class = CaseSerializer
-    authentication_classes = (CsrfExemptSessionAuthentication,)
+    authentication_classes = (SignedTokenAuthentication, CsrfExemptSessionAuthentication)
     permission_classes = [permissions.AllowAny]
+    # Each filter hits an index leading with its column (plus createdAt for the default order)
+    filter_fields = {
+        'status': ('status', str.lower),
+        'priority': ('priority', str.lower),
+        'caseType': ('caseType_id', int),
+        'clientId': ('clientId_id', int),
+    }
+    date_range_fields = ('createdAt', 'updatedAt')
+    ordering_fields = ('createdAt', 'updatedAt', 'title', 'caseNumber', 'status', 'priority')
+    default_ordering = ('-createdAt',)
     
     def get_queryset(self):
-        queryset = Case.objects.all().order_by('-createdAt')
+        return CaseSerializer.setup_eager_loading(Case.objects.all())
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        return export_response(request, self.filter_queryset(self.get_queryset()), CASE_EXPORT_COLUMNS, 'cases')
+
+    @action(detail=True, methods=['get'])
+    def timeline(self, request, pk=None):
+        # Skip get_object(): the detail queryset eager-loads everything the timeline pages through
+        case = get_object_or_404(Case.objects.only('id'), pk=pk)
+        try:
+            limit = min(max(int(request.query_params.get('limit', DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        except ValueError:
+            return Response({'message': 'limit must be an integer'}, status=400)
+        descending = request.query_params.get('order', 'desc') != 'asc'
+        try:
+            events, next_cursor = case_timeline(case.id, request.query_params.get('cursor'), limit, descending)
+        except InvalidCursor:
+            return Response({'message': 'Invalid cursor'}, status=400)
+        return Response({'results': events, 'next': next_cursor})
+
+    @action(detail=True, methods=['post'])
+    def archive(self, request, pk=None):
+        case = get_object_or_404(Case.objects.only('id', 'status'), pk=pk)
+        try:
+            archive_case(case)
+        except NotArchivable as e:
+            return Response({'message': str(e)}, status=400)
+        return Response({'message': 'Case archived', 'id': case.pk})
+
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=(MultiPartParser, FormParser))
+    def import_matters(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'message': 'File is required'}, status=400)
+        fmt = request.data.get('format') or detect_format(upload.name)
+        stats = import_matters(upload.file, fmt=fmt)
+        stopped = stats['stoppedAt']
+        if stopped:
+            # Chunks before the bad row are committed; the counts say what a retry must skip
+            message = f"Import stopped at row {stopped['row']}: {stopped['message']}"
+            return Response({'message': message, **stats}, status=400)
+        return Response(stats, status=201)
+
+class ArchivedCaseViewSet(viewsets.ReadOnlyModelViewSet):
+    """Read access to the archive tier; the regular case endpoints never touch these tables."""
+    queryset = ArchivedCase.objects.all().order_by('-createdAt')
+    serializer_class = ArchivedCaseSerializer
+    authentication_classes = (SignedTokenAuthentication, CsrfExemptSessionAuthentication)
+    permission_classes = [permissions.AllowAny]
+
+    def get_queryset(self):
+        queryset = ArchivedCaseSerializer.setup_eager_loading(ArchivedCase.objects.all().order_by('-createdAt'))
         client_id = self.request.query_params.get('clientId', None)
         if client_id is not None:
             queryset = queryset.filter(clientId=client_id)
         return queryset
 
+    @action(detail=True, methods=['post'])
+    def restore(self, request, pk=None):
+        archived = get_object_or_404(ArchivedCase, pk=pk)
+        case = restore_case(archived)
+        return Response(CaseSerializer(CaseSerializer.setup_eager_loading(Case.objects.all()).get(pk=case.pk)).data)
+
 class CaseDocumentViewSet(viewsets.ModelViewSet):
     queryset = CaseDocument.objects.all().order_by('-uploadedAt')
     serializer_class = CaseDocumentSerializer
     parser_classes = (MultiPartParser, FormParser)
-    authentication_classes = (CsrfExemptSessionAuthentication,)
+    authentication_classes = (SignedTokenAuthentication, CsrfExemptSessionAuthentication)
     permission_classes = [permissions.AllowAny]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # Listings show each document once, at its latest version
+        return queryset.filter(isLatest=True) if self.action == 'list' else queryset
+
+    def perform_create(self, serializer):
+        upload = serializer.validated_data.get('file')
+        document = serializer.save(size=upload.size if upload else None)
+        # Text extraction happens after the response path, in the extraction pool
+        transaction.on_commit(lambda: schedule_extraction(document.pk))
+
+    def perform_update(self, serializer):
+        if 'file' in serializer.validated_data:
+            # Replacing the file in place would drop the old content from the version history
+            raise exceptions.ValidationError({
+                'message': f'Upload new content with POST /api/case-documents/{serializer.instance.pk}/versions',
+            })
+        serializer.save()
+
+    def perform_destroy(self, instance):
+        # A document goes with its whole history; deleting the first version cascades to the rest
+        CaseDocument.objects.filter(pk=instance.original_id or instance.pk).first().delete()
+
+    @action(detail=True, methods=['get', 'post'])
+    def versions(self, request, pk=None):
+        """List every version of a document, newest first, or upload a new latest version."""
+        document = self.get_object()
+        if request.method == 'GET':
+            versions = chain(document).order_by('-version')
+            return Response(CaseDocumentSerializer(versions, many=True, context={'request': request}).data)
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'message': 'file is required'}, status=400)
+        try:
+            created = add_version(document, upload, title=request.data.get('title') or None)
+        except IntegrityError:
+            return Response({'message': 'Another version was uploaded at the same time; try again'}, status=409)
+        return Response(CaseDocumentSerializer(created, context={'request': request}).data, status=201)
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        """The content of any version, reassembled from the chunk store if it has been superseded."""
+        document = self.get_object()
+        if not document.file and missing_chunks(document):
+            return Response({'message': 'Stored content of this version is incomplete'}, status=500)
+        name = os.path.basename(document.file.name) if document.file else document.fileName
+        response = StreamingHttpResponse(
+            read_version(document), content_type=mimetypes.guess_type(name)[0] or 'application/octet-stream',
+        )
+        if document.size is not None:
+            response['Content-Length'] = document.size
+        response['Content-Disposition'] = content_disposition_header(True, name)
+        return response
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'message': 'Query parameter q is required'}, status=400)
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+        except ValueError:
+            return Response({'message': 'limit must be an integer'}, status=400)
+        case_id = request.query_params.get('caseId', None)
+
+        results = []
+        for document, snippet in search_documents(query, case_id=case_id, limit=limit):
+            data = CaseDocumentSerializer(document, context={'request': request}).data
+            data['caseNumber'] = document.case.caseNumber
+            data['snippet'] = snippet
+            results.append(data)
+        return Response(results)
@@ -1,8 +1,17 @@
 from django.contrib import admin
+from core.changelists import ScalableAdmin, status_action
 from .models import Client
+from .normalization import canonical_email, canonical_nic, canonical_phone
 
 @admin.register(Client)
-class ClientAdmin(admin.ModelAdmin):
+class ClientAdmin(ScalableAdmin):
     list_display = ('name', 'email', 'phone', 'status', 'createdAt')
-    search_fields = ('name', 'email')
+    prefix_search_fields = ('name',)
+    exact_search_fields = {
+        'normalizedEmail': canonical_email,
+        'normalizedNic': canonical_nic,
+        'normalizedPhone': canonical_phone,
+    }
+    search_help_text = "Start of the name, or an exact email, NIC or phone number"
     list_filter = ('status',)
+    actions = [status_action(status) for status in ('active', 'inactive')]
@@ -0,0 +1,110 @@
+from collections import defaultdict
+
+from django.db.models import Count, Q
+
+from .models import Client
+from .normalization import canonical_email, canonical_nic, canonical_phone, name_key
+
+# (raw field, indexed shadow column, normalizer)
+MATCH_FIELDS = (
+    ('nic', 'normalizedNic', canonical_nic),
+    ('email', 'normalizedEmail', canonical_email),
+    ('phone', 'normalizedPhone', canonical_phone),
+)
+LOOKUP_BATCH_SIZE = 500
+
+
+def find_matches(values, exclude_pk=None):
+    """
+    Clients sharing a normalized NIC, email or phone with `values`, as [(client, [fields])].
+
+    Each key is an equality probe on its own index, so the check costs a few
+    B-tree lookups regardless of table size.
+    """
+    keys = {}
+    for field, column, normalize in MATCH_FIELDS:
+        key = normalize(values.get(field))
+        if key:
+            keys[column] = (field, key)
+    if not keys:
+        return []
+
+    condition = Q()
+    for column, (_, key) in keys.items():
+        condition |= Q(**{column: key})
+    queryset = Client.objects.filter(condition)
+    if exclude_pk is not None:
+        queryset = queryset.exclude(pk=exclude_pk)
+    return [
+        (client, [field for column, (field, key) in keys.items() if getattr(client, column) == key])
+        for client in queryset.order_by('pk')
+    ]
+
+
+class _Clusters:
+    """Union-find over client ids, remembering which keys linked them."""
+
+    def __init__(self):
+        self.parent = {}
+        self.reasons = defaultdict(set)
+
+    def find(self, pk):
+        root = pk
+        while self.parent.get(root, root) != root:
+            root = self.parent[root]
+        while pk != root:
+            self.parent[pk], pk = root, self.parent.get(pk, pk)
+        return root
+
+    def union(self, pks, reason):
+        root = self.find(pks[0])
+        for pk in pks:
+            self.reasons[pk].add(reason)
+            other = self.find(pk)
+            if other != root:
+                self.parent[other] = root
+
+    def groups(self):
+        members = defaultdict(list)
+        for pk in self.reasons:
+            members[self.find(pk)].append(pk)
+        return [
+            (sorted(pks), sorted(set().union(*(self.reasons[pk] for pk in pks))))
+            for pks in members.values() if len(pks) > 1
+        ]
+
+
+def duplicate_groups(include_names=True):
+    """
+    Groups of probable duplicates as [(client ids, reasons)].
+
+    Exact matches come from GROUP BY over the indexed shadow columns. Near
+    matches on names are found by blocking: every client is hashed once to
+    an order- and punctuation-insensitive name key and only clients sharing
+    a key are linked, so the pass is linear rather than all-pairs.
+    """
+    clusters = _Clusters()
+    for field, column, _ in MATCH_FIELDS:
+        shared = list(
+            Client.objects.exclude(**{f'{column}__isnull': True})
+            .values_list(column, flat=True).annotate(total=Count('id')).filter(total__gt=1).order_by()
+        )
+        for start in range(0, len(shared), LOOKUP_BATCH_SIZE):
+            by_key = defaultdict(list)
+            rows = Client.objects.filter(**{f'{column}__in': shared[start:start + LOOKUP_BATCH_SIZE]})
+            for pk, key in rows.values_list('pk', column):
+                by_key[key].append(pk)
+            for pks in by_key.values():
+                clusters.union(pks, field)
+
+    if include_names:
+        first_by_name = {}
+        for pk, name in Client.objects.order_by('pk').values_list('pk', 'name').iterator(chunk_size=2000):
+            key = name_key(name)
+            if key is None:
+                continue
+            if key in first_by_name:
+                clusters.union([first_by_name[key], pk], 'name')
+            else:
+                first_by_name[key] = pk
+    return sorted(clusters.groups())
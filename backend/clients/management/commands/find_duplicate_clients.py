@@ -0,0 +1,24 @@
+import json
+from django.core.management.base import BaseCommand
+from clients.duplicates import duplicate_groups
+from clients.models import Client
+
+
+class Command(BaseCommand):
+    help = "Report groups of clients that share a normalized NIC, email or phone, or have near-identical names"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--no-names', action='store_true', help="Only match on NIC, email and phone")
+        parser.add_argument('--json', action='store_true', help="Print the groups as JSON")
+
+    def handle(self, *args, **options):
+        groups = duplicate_groups(include_names=not options['no_names'])
+        if options['json']:
+            self.stdout.write(json.dumps([{'clientIds': pks, 'matchedOn': reasons} for pks, reasons in groups]))
+            return
+
+        for pks, reasons in groups:
+            names = dict(Client.objects.filter(pk__in=pks).values_list('pk', 'name'))
+            members = ', '.join(f"#{pk} {names.get(pk, '?')}" for pk in pks)
+            self.stdout.write(f"  [{', '.join(reasons)}] {members}")
+        self.stdout.write(self.style.SUCCESS(f"Found {len(groups)} groups of possible duplicates"))
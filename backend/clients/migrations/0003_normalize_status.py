@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:01
+
+import core.fields
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+
+def lowercase_status(apps, schema_editor):
+    Client = apps.get_model('clients', 'Client')
+    Client.objects.update(status=Lower('status'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0002_client_nic'),
+    ]
+
+    operations = [
+        migrations.RunPython(lowercase_status, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='client',
+            name='status',
+            field=core.fields.LowercaseCharField(default='active', max_length=50),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['createdAt'], name='client_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['status', 'createdAt'], name='client_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['name'], name='client_name_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:03
+
+import clients.normalization
+import core.fields
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def backfill_normalized_contacts(apps, schema_editor):
+    Client = apps.get_model('clients', 'Client')
+    batch = []
+    for client in Client.objects.only('id', 'nic', 'email', 'phone').iterator(chunk_size=BATCH_SIZE):
+        client.normalizedNic = clients.normalization.canonical_nic(client.nic)
+        client.normalizedEmail = clients.normalization.canonical_email(client.email)
+        client.normalizedPhone = clients.normalization.canonical_phone(client.phone)
+        batch.append(client)
+        if len(batch) >= BATCH_SIZE:
+            Client.objects.bulk_update(batch, ['normalizedNic', 'normalizedEmail', 'normalizedPhone'])
+            batch = []
+    Client.objects.bulk_update(batch, ['normalizedNic', 'normalizedEmail', 'normalizedPhone'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0003_normalize_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='client',
+            name='normalizedEmail',
+            field=core.fields.NormalizedField(max_length=254, normalizer=clients.normalization.canonical_email, source='email'),
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='normalizedNic',
+            field=core.fields.NormalizedField(max_length=20, normalizer=clients.normalization.canonical_nic, source='nic'),
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='normalizedPhone',
+            field=core.fields.NormalizedField(max_length=20, normalizer=clients.normalization.canonical_phone, source='phone'),
+        ),
+        migrations.RunPython(backfill_normalized_contacts, migrations.RunPython.noop),
+    ]
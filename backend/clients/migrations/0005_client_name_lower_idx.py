@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:07
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0004_client_normalized_contacts'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='client_name_lower_idx'),
+        ),
+    ]
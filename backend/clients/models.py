@@ -1,4 +1,8 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Lower
+from core.fields import LowercaseCharField, NormalizedField
+from .normalization import canonical_email, canonical_nic, canonical_phone
+from .signals import clients_status_changed
 
 class Client(models.Model):
     name = models.CharField(max_length=255)
@@ -6,8 +10,37 @@ class Client(models.Model):
     phone = models.CharField(max_length=50, null=True, blank=True)
     nic = models.CharField(max_length=20, null=True, blank=True)
     address = models.TextField(null=True, blank=True)
-    status = models.CharField(max_length=50, default="active")
+    status = LowercaseCharField(max_length=50, default="active")
     createdAt = models.DateTimeField(auto_now_add=True)
+    # Canonical shadows of nic/email/phone for indexed duplicate matching
+    normalizedNic = NormalizedField(max_length=20, source='nic', normalizer=canonical_nic)
+    normalizedEmail = NormalizedField(max_length=254, source='email', normalizer=canonical_email)
+    normalizedPhone = NormalizedField(max_length=20, source='phone', normalizer=canonical_phone)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['createdAt'], name='client_created_idx'),
+            models.Index(fields=['status', 'createdAt'], name='client_status_created_idx'),
+            models.Index(fields=['name'], name='client_name_idx'),
+            models.Index(Lower('name'), name='client_name_lower_idx'),
+        ]
+
+    @classmethod
+    def bulk_set_status(cls, queryset, status, batch_size=1000):
+        """Move every client in `queryset` to `status` with one UPDATE per batch; returns the number changed."""
+        status = status.lower()
+        pending = queryset.exclude(status=status).order_by('pk')
+        changed, last = 0, 0
+        while True:
+            with transaction.atomic():
+                rows = list(pending.filter(pk__gt=last).values('id', 'status')[:batch_size])
+                if not rows:
+                    return changed
+                ids = [row['id'] for row in rows]
+                cls.objects.filter(pk__in=ids).update(status=status)
+                clients_status_changed.send(sender=cls, clients=rows, status=status)
+            changed += len(rows)
+            last = ids[-1]
 
     def __str__(self):
         return self.name
@@ -0,0 +1,61 @@
+import re
+
+from django.conf import settings
+
+OLD_NIC = re.compile(r'^(\d{2})(\d{3})(\d{4})[VX]$')
+NEW_NIC = re.compile(r'^\d{12}$')
+NON_DIGITS = re.compile(r'\D')
+NAME_NOISE = re.compile(r'[^a-z0-9 ]')
+
+
+def canonical_nic(value):
+    """
+    Sri Lankan NIC in the 12-digit form.
+
+    An old 9-digit + V/X number YYDDDSSSC becomes 19YYDDD0SSSC, the same
+    number the Department of Registration of Persons issues on conversion,
+    so both forms of one person's NIC compare equal.
+    """
+    if not value:
+        return None
+    compact = re.sub(r'[\s-]', '', value).upper()
+    match = OLD_NIC.match(compact)
+    if match:
+        year, day, serial = match.groups()
+        return f"19{year}{day}0{serial}"
+    if NEW_NIC.match(compact):
+        return compact
+    # Passports and malformed entries still match themselves exactly
+    return compact or None
+
+
+def canonical_email(value):
+    if not value:
+        return None
+    return value.strip().lower() or None
+
+
+def canonical_phone(value):
+    """E.164 (+<country><number>); local numbers get DEFAULT_PHONE_COUNTRY_CODE."""
+    if not value:
+        return None
+    value = value.strip()
+    international = value.startswith('+') or value.startswith('00')
+    digits = NON_DIGITS.sub('', value)
+    if value.startswith('00'):
+        digits = digits[2:]
+    if not digits:
+        return None
+    country = settings.DEFAULT_PHONE_COUNTRY_CODE
+    if not international:
+        if digits.startswith('0'):
+            digits = country + digits.lstrip('0')
+        elif not digits.startswith(country) or len(digits) <= 9:
+            digits = country + digits
+    return f"+{digits}"
+
+
+def name_key(value):
+    """Order- and punctuation-insensitive form of a name, used to block near-duplicate candidates."""
+    tokens = NAME_NOISE.sub(' ', (value or '').lower()).split()
+    return ' '.join(sorted(tokens)) or None
@@ -1,5 +1,67 @@
+from django.db.models import Count, F, Func, IntegerField, OuterRef, Prefetch, Q, Subquery
+from django.utils import timezone
 from rest_framework import serializers
 from .models import Client
+from cases.models import Case, CaseDocument
+from reminders.models import Reminder
+
+# Cases listed by the client detail endpoint unless ?caseLimit= asks for more
+CLIENT_DETAIL_CASES = 20
+CLIENT_DETAIL_MAX_CASES = 100
+
+
+def count_of(queryset):
+    """A correlated `SELECT COUNT(*)` over `queryset`, which should be filtered on an OuterRef."""
+    return Subquery(
+        queryset.order_by().annotate(count=Func(F('pk'), function='COUNT')).values('count'),
+        output_field=IntegerField(),
+    )
+
+
+def compact_cases(client, limit):
+    """
+    The client's most recent cases as flat dicts in one query: the counts and
+    the next pending reminder are correlated subqueries, so nothing is
+    joined and no row of any other table is loaded.
+    """
+    # Recurring series whose first occurrence has passed are left out: their next date is not a column
+    pending = Reminder.objects.filter(caseId=OuterRef('pk'), completed=False).filter(
+        Q(recurrence='') | Q(dueDate__gte=timezone.now())
+    ).order_by('dueDate', 'id')
+    rows = (
+        Case.objects.filter(clientId=client).order_by('-createdAt', '-id')
+        .annotate(
+            documentCount=count_of(CaseDocument.objects.filter(case=OuterRef('pk'), isLatest=True)),
+            reminderCount=count_of(Reminder.objects.filter(caseId=OuterRef('pk'))),
+            nextReminderId=Subquery(pending.values('id')[:1]),
+            nextReminderTitle=Subquery(pending.values('title')[:1]),
+            nextReminderDueDate=Subquery(pending.values('dueDate')[:1]),
+        )
+        .values(
+            'id', 'title', 'caseNumber', 'status', 'priority', 'updatedAt', 'caseType__name',
+            'documentCount', 'reminderCount', 'nextReminderId', 'nextReminderTitle', 'nextReminderDueDate',
+        )[:limit]
+    )
+    return [
+        {
+            'id': row['id'],
+            'title': row['title'],
+            'caseNumber': row['caseNumber'],
+            'status': row['status'],
+            'priority': row['priority'],
+            'updatedAt': row['updatedAt'],
+            'caseType': row['caseType__name'],
+            'documentCount': row['documentCount'],
+            'reminderCount': row['reminderCount'],
+            'nextReminder': {
+                'id': row['nextReminderId'],
+                'title': row['nextReminderTitle'],
+                'dueDate': row['nextReminderDueDate'],
+            } if row['nextReminderId'] else None,
+        }
+        for row in rows
+    ]
+
 
 class ClientSerializer(serializers.ModelSerializer):
     cases = serializers.SerializerMethodField()
@@ -8,14 +70,34 @@ class ClientSerializer(serializers.ModelSerializer):
         model = Client
         fields = '__all__'
 
+    @staticmethod
+    def setup_eager_loading(queryset, prefix=''):
+        # Load every client's cases with their counts in one extra query
+        return queryset.prefetch_related(
+            Prefetch(f'{prefix}cases', queryset=Case.objects.annotate(
+                documentCount=Count('documents', filter=Q(documents__isLatest=True), distinct=True),
+                reminderCount=Count('reminders', distinct=True),
+            ))
+        )
+
     def get_cases(self, obj):
         cases = []
         for case in obj.cases.all():
+            document_count = getattr(case, 'documentCount', None)
+            reminder_count = getattr(case, 'reminderCount', None)
             cases.append({
                 'id': case.id,
                 'title': case.title,
                 'caseNumber': case.caseNumber,
-                'documentCount': case.documents.count(),
-                'reminderCount': case.reminders.count()
+                'documentCount': document_count if document_count is not None else case.documents.filter(isLatest=True).count(),
+                'reminderCount': reminder_count if reminder_count is not None else case.reminders.count()
             })
         return cases
+
+
+class ClientDetailSerializer(ClientSerializer):
+    """A client with its case total and a bounded, compact list of its latest cases."""
+    caseCount = serializers.IntegerField(read_only=True)
+
+    def get_cases(self, obj):
+        return compact_cases(obj, self.context.get('caseLimit', CLIENT_DETAIL_CASES))
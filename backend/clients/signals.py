@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent with `clients=[{id, status}]` (values before the change) and `status`
+# after Client.bulk_set_status() moved them with a plain UPDATE
+clients_status_changed = Signal()
@@ -1,3 +1,151 @@
-from django.test import TestCase
+import json
+from io import StringIO
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+from cases.models import Case, CaseDocument
+from reminders.models import Reminder
+from datetime import timedelta
+from django.utils import timezone
+from .models import Client
+from .normalization import canonical_nic, canonical_phone
 
-# Create your tests here.
+FIXTURE_SIZES = (1, 5, 20)
+
+
+def build_clients(count, cases_per_client=3):
+    """Create `count` clients, each owning cases with a document and a reminder."""
+    clients = []
+    for i in range(count):
+        client = Client.objects.create(name=f"Client {i}", nic=f"{i:09d}V")
+        for j in range(cases_per_client):
+            case = Case.objects.create(title=f"Case {i}.{j}", clientId=client)
+            CaseDocument.objects.create(case=case, title="Plaint", file=f"case_documents/plaint_{i}_{j}.pdf")
+            Reminder.objects.create(title="Hearing", dueDate=timezone.now(), caseId=case)
+        clients.append(client)
+    return clients
+
+
+class ClientQueryBudgetTests(APITestCase):
+    # main select, cases with annotated document/reminder counts
+    CLIENT_QUERIES = 2
+
+    def tearDown(self):
+        Client.objects.all().delete()
+
+    def test_client_list_query_count_is_constant(self):
+        for size in FIXTURE_SIZES:
+            with self.subTest(size=size):
+                build_clients(size)
+                with self.assertNumQueries(self.CLIENT_QUERIES):
+                    response = self.client.get('/api/clients')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.data), Client.objects.count())
+
+    def test_client_detail_query_count_is_constant(self):
+        for size in FIXTURE_SIZES:
+            with self.subTest(size=size):
+                client = build_clients(1, cases_per_client=size)[0]
+                with self.assertNumQueries(self.CLIENT_QUERIES):
+                    response = self.client.get(f'/api/clients/{client.id}')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.data['cases']), size)
+                self.assertTrue(all(c['documentCount'] == 1 for c in response.data['cases']))
+                self.assertTrue(all(c['reminderCount'] == 1 for c in response.data['cases']))
+
+
+class ClientDetailTests(APITestCase):
+    def test_cases_are_compact_and_bounded(self):
+        client = build_clients(1, cases_per_client=30)[0]
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/clients/{client.id}', {'caseLimit': 5})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['caseCount'], 30)
+        self.assertEqual([c['title'] for c in response.data['cases']], [f"Case 0.{j}" for j in range(29, 24, -1)])
+        self.assertNotIn('client', response.data['cases'][0])
+        self.assertEqual(len(self.client.get(f'/api/clients/{client.id}').data['cases']), 20)
+        self.assertEqual(self.client.get(f'/api/clients/{client.id}', {'caseLimit': 'all'}).status_code, 400)
+
+    def test_next_reminder_is_the_earliest_pending_one(self):
+        client = Client.objects.create(name="Aruna Perera")
+        case = Case.objects.create(title="Land dispute", clientId=client)
+        now = timezone.now()
+        Reminder.objects.create(title="Done", dueDate=now - timedelta(days=3), caseId=case, completed=True)
+        Reminder.objects.create(title="Old series", dueDate=now - timedelta(days=2), caseId=case, recurrence='weekly')
+        due = Reminder.objects.create(title="Filing deadline", dueDate=now + timedelta(days=1), caseId=case)
+        Reminder.objects.create(title="Hearing", dueDate=now + timedelta(days=5), caseId=case)
+        Case.objects.create(title="Quiet case", clientId=client)
+
+        cases = {c['title']: c for c in self.client.get(f'/api/clients/{client.id}').data['cases']}
+
+        self.assertEqual(cases['Land dispute']['reminderCount'], 4)
+        self.assertEqual(cases['Land dispute']['nextReminder']['id'], due.id)
+        self.assertEqual(cases['Land dispute']['nextReminder']['title'], "Filing deadline")
+        self.assertIsNone(cases['Quiet case']['nextReminder'])
+        self.assertEqual(cases['Quiet case']['documentCount'], 0)
+
+
+class ClientExportTests(APITestCase):
+    def test_ndjson_export(self):
+        build_clients(3, cases_per_client=1)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/clients/export', {'output': 'ndjson'})
+            rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual({row['nic'] for row in rows}, set(Client.objects.values_list('nic', flat=True)))
+
+
+class ClientFilteringTests(APITestCase):
+    def test_status_filter_and_name_ordering(self):
+        Client.objects.create(name="Hemas Holdings", status="Inactive")
+        Client.objects.create(name="Aruna Perera")
+        Client.objects.create(name="Chathura Silva", status="ACTIVE")
+        response = self.client.get('/api/clients', {'status': 'active', 'ordering': 'name'})
+        self.assertEqual([client['name'] for client in response.data], ["Aruna Perera", "Chathura Silva"])
+        self.assertEqual({client['status'] for client in response.data}, {"active"})
+
+    def test_detail_requests_ignore_list_filters(self):
+        client = Client.objects.create(name="Hemas Holdings", status="inactive")
+        response = self.client.get(f'/api/clients/{client.pk}', {'status': 'active', 'createdAtTo': '2000-01-01'})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.patch(f'/api/clients/{client.pk}?status=active', {'phone': '0771234567'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+
+class DuplicateClientTests(APITestCase):
+    def test_normalization(self):
+        self.assertEqual(canonical_nic("851234567v"), "198512304567")
+        self.assertEqual(canonical_nic("198512304567"), "198512304567")
+        self.assertEqual(canonical_phone("077 123 4567"), "+94771234567")
+        self.assertEqual(canonical_phone("+94 (77) 123-4567"), "+94771234567")
+        self.assertEqual(canonical_phone("0094771234567"), "+94771234567")
+
+    def test_lookup_matches_other_formats(self):
+        existing = Client.objects.create(name="Aruna Perera", nic="851234567V", email="Aruna@Example.com",
+                                         phone="077 123 4567")
+        Client.objects.create(name="Someone Else", nic="901234567V")
+        self.assertEqual(existing.normalizedNic, "198512304567")
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/clients/duplicates', {
+                'nic': '198512304567', 'email': ' aruna@example.COM', 'phone': '+94771234567'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([match['id'] for match in response.data], [existing.id])
+        self.assertEqual(response.data[0]['matchedOn'], ['nic', 'email', 'phone'])
+        self.assertEqual(self.client.get('/api/clients/duplicates').status_code, 400)
+
+    def test_create_reports_duplicates(self):
+        existing = Client.objects.create(name="Aruna Perera", phone="0771234567")
+        response = self.client.post('/api/clients', {'name': "A. Perera", 'phone': "77 123 4567"}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([(match['id'], match['matchedOn']) for match in response.data['duplicates']],
+                         [(existing.id, ['phone'])])
+
+    def test_command_groups_duplicates(self):
+        first = Client.objects.create(name="Aruna Perera", nic="851234567V")
+        second = Client.objects.create(name="PERERA, Aruna", email="aruna@example.com")
+        third = Client.objects.create(name="Aruna K. Perera", nic="198512304567", email="ARUNA@example.com")
+        Client.objects.create(name="Chathura Silva", nic="901234567V")
+        out = StringIO()
+        call_command('find_duplicate_clients', '--json', stdout=out)
+        self.assertEqual(json.loads(out.getvalue()), [
+            {'clientIds': [first.id, second.id, third.id], 'matchedOn': ['email', 'name', 'nic']},
+        ])
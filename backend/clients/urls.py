@@ -0,0 +1,8 @@
+from rest_framework import routers
+from .views import ClientViewSet
+
+router = routers.DefaultRouter(trailing_slash=False)
+router.include_root_view = False
+router.register(r'clients', ClientViewSet)
+
+urlpatterns = router.urls
@@ -1,13 +1,86 @@
+from django.db.models import OuterRef
 from rest_framework import viewsets, permissions
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from .duplicates import MATCH_FIELDS, find_matches
 from .models import Client
-from .serializers import ClientSerializer
-from cases.views import CsrfExemptSessionAuthentication
+from cases.models import Case
+from .serializers import (
+    CLIENT_DETAIL_CASES, CLIENT_DETAIL_MAX_CASES, ClientDetailSerializer, ClientSerializer, count_of,
+)
+from core.authentication import CsrfExemptSessionAuthentication, SignedTokenAuthentication
+from core.exports import export_response
+from core.filters import StructuredFilterMixin
 
-class ClientViewSet(viewsets.ModelViewSet):
+CLIENT_EXPORT_COLUMNS = (
+    ('id', 'id'),
+    ('name', 'name'),
+    ('nic', 'nic'),
+    ('email', 'email'),
+    ('phone', 'phone'),
+    ('address', 'address'),
+    ('status', 'status'),
+    ('createdAt', 'createdAt'),
+)
+
+class ClientViewSet(StructuredFilterMixin, viewsets.ModelViewSet):
     queryset = Client.objects.all().order_by('-createdAt')
     serializer_class = ClientSerializer
-    authentication_classes = (CsrfExemptSessionAuthentication,)
+    authentication_classes = (SignedTokenAuthentication, CsrfExemptSessionAuthentication)
     permission_classes = [permissions.AllowAny]
+    filter_fields = {
+        'status': ('status', str.lower),
+    }
+    date_range_fields = ('createdAt',)
+    ordering_fields = ('createdAt', 'name')
+    default_ordering = ('-createdAt',)
+
+    def get_queryset(self):
+        if self.action == 'retrieve':
+            return super().get_queryset().annotate(caseCount=count_of(Case.objects.filter(clientId=OuterRef('pk'))))
+        return ClientSerializer.setup_eager_loading(super().get_queryset())
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        The client plus its latest cases, each with document/reminder counts
+        and the next pending reminder: two queries and a bounded payload
+        however many cases the client has (`caseCount` gives the total).
+        """
+        try:
+            limit = min(max(int(request.query_params.get('caseLimit', CLIENT_DETAIL_CASES)), 1), CLIENT_DETAIL_MAX_CASES)
+        except ValueError:
+            return Response({'message': 'caseLimit must be an integer'}, status=400)
+        serializer = ClientDetailSerializer(self.get_object(), context={**self.get_serializer_context(), 'caseLimit': limit})
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        return export_response(request, self.filter_queryset(self.get_queryset()), CLIENT_EXPORT_COLUMNS, 'clients')
+
+    @staticmethod
+    def _duplicates(values, exclude_pk=None):
+        return [
+            {'id': client.id, 'name': client.name, 'nic': client.nic, 'email': client.email,
+             'phone': client.phone, 'matchedOn': fields}
+            for client, fields in find_matches(values, exclude_pk=exclude_pk)
+        ]
+
+    @action(detail=False, methods=['get'])
+    def duplicates(self, request):
+        """Check a prospective client's NIC/email/phone before creating it."""
+        values = {field: request.query_params.get(field) for field, _, _ in MATCH_FIELDS}
+        if not any(values.values()):
+            return Response({'message': 'Provide at least one of nic, email or phone'}, status=400)
+        exclude = request.query_params.get('exclude')
+        if exclude is not None and not exclude.isdigit():
+            return Response({'message': 'exclude must be a client id'}, status=400)
+        return Response(self._duplicates(values, exclude_pk=exclude and int(exclude)))
+
+    def create(self, request, *args, **kwargs):
+        # Possible duplicates are reported, not rejected: relatives can share a phone or email
+        response = super().create(request, *args, **kwargs)
+        response.data['duplicates'] = self._duplicates(response.data, exclude_pk=response.data['id'])
+        return response
 
     def perform_destroy(self, instance):
         # Explicitly delete all cases associated with this client
@@ -0,0 +1,156 @@
+import hashlib
+import logging
+import os
+import threading
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connection
+
+from jobs.queue import enqueue
+
+logger = logging.getLogger(__name__)
+
+# Square variants, sized for 2x displays: sidebar/lists, profile header, full view
+AVATAR_SIZES = {'small': 80, 'medium': 160, 'large': 320}
+AVATAR_DIRECTORY = 'avatars/sized'
+HASH_BLOCK_SIZE = 1024 * 1024
+QUALITY = 80
+# Replaced files are deleted this long after the change, once the pool has finished with them
+DELETE_DELAY = timedelta(minutes=10)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _output_format():
+    from PIL import features
+
+    return ('WEBP', 'webp') if features.check('webp') else ('JPEG', 'jpg')
+
+
+def render_variants(path, media_root):
+    """
+    Worker-process entry point: decode `path` once and write every size.
+
+    Pixels are re-encoded from scratch and no EXIF/ICC/XMP block is passed
+    to the encoder, so location and camera metadata never reach the output.
+    Returns {size name: storage-relative path}.
+    """
+    from PIL import Image, ImageOps
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(partial(f.read, HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    prefix = digest.hexdigest()[:16]
+    image_format, extension = _output_format()
+
+    largest = max(AVATAR_SIZES.values())
+    with Image.open(path) as image:
+        # Let the JPEG decoder downscale by 1/2..1/8 while decoding instead of materializing every pixel
+        image.draft('RGB', (largest, largest))
+        # Apply the orientation tag before it is dropped along with the rest of the metadata
+        image = ImageOps.exif_transpose(image)
+        if image.mode != 'RGB':
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            rgba = image.convert('RGBA')
+            background.paste(rgba, mask=rgba.getchannel('A'))
+            image = background
+        # Crop to a centred square once; the smaller sizes are resized from this
+        image = ImageOps.fit(image, (largest, largest), method=Image.LANCZOS)
+
+        variants = {}
+        os.makedirs(os.path.join(media_root, AVATAR_DIRECTORY), exist_ok=True)
+        for name, size in sorted(AVATAR_SIZES.items(), key=lambda item: -item[1]):
+            variant = image if size == largest else image.resize((size, size), Image.LANCZOS)
+            relative = f"{AVATAR_DIRECTORY}/{prefix}_{size}.{extension}"
+            variant.save(os.path.join(media_root, relative), image_format, quality=QUALITY, optimize=True)
+            variants[name] = relative
+    return variants
+
+
+def _schedule_deletion(names):
+    # Names are content-addressed, so other users (or a re-upload) may share
+    # them; the job only deletes the files no row refers to
+    names = sorted(names)
+    if names:
+        enqueue('core.delete_media', {'names': names}, delay=DELETE_DELAY)
+
+
+def store_variants(user_id, original, variants):
+    """Point the user at the optimized files, unless a newer upload has replaced `original` meanwhile."""
+    from .authentication import user_cache
+    from .models import User
+
+    user = User.objects.filter(pk=user_id).only('avatar', 'avatarVariants').first()
+    if user is None or user.avatar.name != original:
+        _schedule_deletion(set(variants.values()))
+        return
+    stale = set(user.avatarVariants.values()) - set(variants.values())
+    # The raw upload is replaced by the largest variant; it is never served again
+    User.objects.filter(pk=user_id, avatar=original).update(avatar=variants['large'], avatarVariants=variants)
+    user_cache.evict_user(user_id)
+    _schedule_deletion((stale | {original}) - set(variants.values()))
+
+
+def clear_variants(user):
+    """
+    Forget the generated files when the avatar is removed or replaced.
+
+    The files are deleted by a job after the change commits; names are
+    content-addressed, so the job keeps any that another user or a re-upload
+    of the same picture is using.
+    """
+    _schedule_deletion(set(user.avatarVariants.values()))
+    user.avatarVariants = {}
+
+
+def get_executor():
+    global _executor
+    from concurrent.futures import ProcessPoolExecutor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=settings.AVATAR_WORKERS)
+        return _executor
+
+
+def _on_rendered(user_id, original, future):
+    try:
+        store_variants(user_id, original, future.result())
+    except Exception:
+        logger.exception("Could not optimize avatar for user %s", user_id)
+    finally:
+        connection.close()
+
+
+def schedule_avatar_processing(user_id):
+    """
+    Re-encode a freshly uploaded avatar off the request path.
+
+    With AVATAR_WORKERS = 0 the work runs inline (tests, management commands).
+    """
+    from .models import User
+
+    user = User.objects.filter(pk=user_id).only('avatar').first()
+    if user is None or not user.avatar:
+        return
+    try:
+        path = user.avatar.path
+    except NotImplementedError:
+        logger.warning("Avatar storage for user %s has no local path; skipping optimization", user_id)
+        return
+    if not os.path.exists(path):
+        return
+
+    if settings.AVATAR_WORKERS == 0:
+        try:
+            store_variants(user_id, user.avatar.name, render_variants(path, str(settings.MEDIA_ROOT)))
+        except Exception:
+            logger.exception("Could not optimize avatar for user %s", user_id)
+        return
+    future = get_executor().submit(render_variants, path, str(settings.MEDIA_ROOT))
+    future.add_done_callback(partial(_on_rendered, user_id, user.avatar.name))
@@ -0,0 +1,212 @@
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from functools import partial
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from .maintenance import UnsupportedDatabase, iter_media_files
+
+BACKUP_PAGES_PER_STEP = 256
+BLOCK_SIZE = 1024 * 1024
+DATABASE_FILE = 'db.sqlite3'
+MANIFEST_FILE = 'manifest.json'
+OBJECTS_DIRECTORY = 'objects'
+
+
+class BackupError(Exception):
+    pass
+
+
+def _hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(partial(f.read, BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _object_path(root, digest):
+    return os.path.join(root, OBJECTS_DIRECTORY, digest[:2], digest)
+
+
+def _store_object(root, path):
+    """Copy `path` into the object store under its content hash, hashing while copying."""
+    digest = hashlib.sha256()
+    objects = os.path.join(root, OBJECTS_DIRECTORY)
+    os.makedirs(objects, exist_ok=True)
+    fd, temporary = tempfile.mkstemp(dir=objects)
+    try:
+        with open(path, 'rb') as source, os.fdopen(fd, 'wb') as target:
+            for block in iter(partial(source.read, BLOCK_SIZE), b''):
+                digest.update(block)
+                target.write(block)
+        destination = _object_path(root, digest.hexdigest())
+        if os.path.exists(destination):
+            os.remove(temporary)
+        else:
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            os.replace(temporary, destination)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    return digest.hexdigest()
+
+
+def _integrity_check(path):
+    check = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return check.execute("PRAGMA integrity_check").fetchone()[0]
+    finally:
+        check.close()
+
+
+def list_backups(root=None):
+    root = str(root or settings.BACKUP_ROOT)
+    if not os.path.isdir(root):
+        return []
+    return sorted(
+        name for name in os.listdir(root)
+        if os.path.isfile(os.path.join(root, name, MANIFEST_FILE))
+    )
+
+
+def load_manifest(root, name):
+    with open(os.path.join(root, name, MANIFEST_FILE)) as f:
+        return json.load(f)
+
+
+def backup_database(destination, pages=BACKUP_PAGES_PER_STEP, pause=0.0, progress=None):
+    """
+    Copy the live database with SQLite's online backup API.
+
+    Pages are copied `pages` at a time and the source is only read-locked
+    during a step, so writers get in between steps; a write from another
+    connection makes SQLite restart the copy, so the result is always a
+    consistent snapshot.
+    """
+    if connection.vendor != 'sqlite':
+        raise UnsupportedDatabase("Online backup uses SQLite's backup API")
+    connection.ensure_connection()
+    target = sqlite3.connect(destination)
+    try:
+        def report(status, remaining, total):
+            if pause:
+                time.sleep(pause)
+            if progress:
+                progress(total - remaining, total)
+
+        connection.connection.backup(target, pages=pages, progress=report)
+    finally:
+        target.close()
+
+
+def backup(root=None, pages=BACKUP_PAGES_PER_STEP, pause=0.0, progress=None):
+    """
+    Write a snapshot directory containing the database copy and a manifest of the media.
+
+    Media files go into a content-addressed object store shared by all
+    snapshots. A file whose size and mtime match the previous manifest is not
+    even re-read, and content that is already stored is never copied again.
+    """
+    root = str(root or settings.BACKUP_ROOT)
+    previous = list_backups(root)
+    known = load_manifest(root, previous[-1])['media'] if previous else {}
+
+    name = timezone.now().strftime('%Y%m%dT%H%M%S%fZ')
+    directory = os.path.join(root, name)
+    os.makedirs(directory)
+    database = os.path.join(directory, DATABASE_FILE)
+    backup_database(database, pages=pages, pause=pause, progress=progress)
+    status = _integrity_check(database)
+    if status != 'ok':
+        raise BackupError(f"Backup copy failed its integrity check: {status}")
+
+    media, copied = {}, 0
+    for storage_name, path in iter_media_files(directories=('',)):
+        stat = os.stat(path)
+        entry = known.get(storage_name)
+        if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime \
+                and os.path.exists(_object_path(root, entry['sha256'])):
+            media[storage_name] = entry
+            continue
+        digest = _hash_file(path)
+        if not os.path.exists(_object_path(root, digest)):
+            digest = _store_object(root, path)
+            copied += 1
+        media[storage_name] = {'sha256': digest, 'size': stat.st_size, 'mtime': stat.st_mtime}
+
+    manifest = {
+        'createdAt': timezone.now().isoformat(),
+        'database': {'file': DATABASE_FILE, 'sha256': _hash_file(database), 'size': os.path.getsize(database)},
+        'media': media,
+    }
+    # Written last: a snapshot without a manifest is incomplete and never listed
+    with open(os.path.join(directory, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=1)
+    return name, manifest, copied
+
+
+def verify(root, name):
+    """Return a list of problems with snapshot `name` (empty when it is intact)."""
+    directory = os.path.join(root, name)
+    manifest = load_manifest(root, name)
+    problems = []
+    database = os.path.join(directory, manifest['database']['file'])
+    if not os.path.exists(database):
+        return [f"missing database copy {database}"]
+    if _hash_file(database) != manifest['database']['sha256']:
+        problems.append("database copy does not match its recorded checksum")
+    else:
+        status = _integrity_check(database)
+        if status != 'ok':
+            problems.append(f"database integrity check failed: {status}")
+    for storage_name, entry in manifest['media'].items():
+        path = _object_path(root, entry['sha256'])
+        if not os.path.exists(path) or _hash_file(path) != entry['sha256']:
+            problems.append(f"media object for {storage_name} is missing or corrupt")
+    return problems
+
+
+def restore(root, name, media_root=None, pages=BACKUP_PAGES_PER_STEP):
+    """
+    Verify snapshot `name`, then copy it over the live database and media.
+
+    The database is written through the backup API into the open connection,
+    so other connections see either the old or the restored database. Media
+    files already identical to the snapshot are left untouched.
+    """
+    problems = verify(root, name)
+    if problems:
+        raise BackupError("; ".join(problems))
+    if connection.vendor != 'sqlite':
+        raise UnsupportedDatabase("Online restore uses SQLite's backup API")
+
+    manifest = load_manifest(root, name)
+    source = sqlite3.connect(f"file:{os.path.join(root, name, manifest['database']['file'])}?mode=ro", uri=True)
+    try:
+        connection.ensure_connection()
+        source.backup(connection.connection, pages=pages)
+    finally:
+        source.close()
+
+    media_root = str(media_root or settings.MEDIA_ROOT)
+    restored = 0
+    for storage_name, entry in manifest['media'].items():
+        path = os.path.join(media_root, *storage_name.split('/'))
+        if os.path.exists(path) and os.path.getsize(path) == entry['size'] and _hash_file(path) == entry['sha256']:
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temporary = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, 'wb') as target, open(_object_path(root, entry['sha256']), 'rb') as source_file:
+            for block in iter(partial(source_file.read, BLOCK_SIZE), b''):
+                target.write(block)
+        os.replace(temporary, path)
+        restored += 1
+    return restored
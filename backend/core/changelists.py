@@ -0,0 +1,88 @@
+from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils.functional import cached_property
+
+# Counting stops here; past it an unfiltered list shows the planner's row estimate
+COUNT_LIMIT = 10000
+# Sorts after every character a user can type, closing a prefix range
+PREFIX_END = '\U0010ffff'
+
+
+def estimated_rows(model):
+    """Row count recorded by the last ANALYZE, or None if the table has no statistics."""
+    if connection.vendor != 'sqlite':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+        if cursor.fetchone() is None:
+            return None
+        cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s", [model._meta.db_table])
+        counts = [int(stat.split()[0]) for stat, in cursor.fetchall() if stat]
+    return max(counts) if counts else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that never counts more than COUNT_LIMIT rows.
+
+    Small results are counted exactly. A larger unfiltered list reports the
+    sqlite_stat1 estimate kept fresh by db_maintenance; a larger filtered one
+    reports COUNT_LIMIT, so its last pages are reached by narrowing the filter.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        bounded = queryset.order_by().values('pk')[:COUNT_LIMIT + 1].count()
+        if bounded <= COUNT_LIMIT:
+            return bounded
+        if not queryset.query.where:
+            return estimated_rows(queryset.model) or COUNT_LIMIT
+        return COUNT_LIMIT
+
+
+def status_action(status):
+    """Admin action moving the selected rows to `status` through the model's bulk_set_status()."""
+    def action(modeladmin, request, queryset):
+        changed = queryset.model.bulk_set_status(queryset, status)
+        modeladmin.message_user(request, f"Marked {changed} {queryset.model._meta.verbose_name_plural} as {status}.")
+
+    action.__name__ = f"mark_{status}"
+    return admin.action(description=f"Mark selected as {status}")(action)
+
+
+class ScalableAdmin(admin.ModelAdmin):
+    """
+    ModelAdmin for large tables: bounded counts and index-backed search.
+
+    Search never runs LIKE '%term%' scans. `prefix_search_fields` match the
+    start of the lowercased value through a range on a Lower() expression
+    index; `exact_search_fields` map a field to the normalizer whose output
+    it stores, and match the normalized term by equality.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    prefix_search_fields = ()
+    exact_search_fields = {}
+
+    def get_search_fields(self, request):
+        # Non-empty so the search box is shown; get_search_results() does the matching
+        return tuple(self.prefix_search_fields) + tuple(self.exact_search_fields)
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        lowered = term.lower()
+        condition = Q()
+        for field in self.prefix_search_fields:
+            queryset = queryset.alias(**{f'_{field}_lower': Lower(field)})
+            condition |= Q(**{f'_{field}_lower__gte': lowered, f'_{field}_lower__lt': lowered + PREFIX_END})
+        for field, normalize in self.exact_search_fields.items():
+            value = normalize(term)
+            if value:
+                condition |= Q(**{field: value})
+        return queryset.filter(condition), False
@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from cases.models import Case
+from clients.models import Client
+from jobs.queue import enqueue
+from reminders.models import Reminder
+from .metrics import collector
+from .models import DashboardSnapshot
+
+SNAPSHOT_ID = 1
+
+
+def dashboard_stats():
+    total_cases = Case.objects.count()
+    active_cases = Case.objects.filter(status='active').count()
+    total_clients = Client.objects.count()
+    pending_reminders = Reminder.objects.filter(completed=False).count()
+
+    return {
+        'totalCases': total_cases,
+        'activeCases': active_cases,
+        'totalClients': total_clients,
+        'pendingReminders': pending_reminders
+    }
+
+
+def store_dashboard_stats():
+    stats = dashboard_stats()
+    # Two autocommit statements rather than update_or_create(): on SQLite a read
+    # that upgrades to a write inside one transaction fails at once if another
+    # connection is writing, instead of waiting for the lock
+    values = {'stats': stats, 'computedAt': timezone.now()}
+    if not DashboardSnapshot.objects.filter(pk=SNAPSHOT_ID).update(**values):
+        DashboardSnapshot.objects.get_or_create(pk=SNAPSHOT_ID, defaults=values)
+    return stats
+
+
+def invalidate_dashboard_stats():
+    """Drop the snapshot once the current transaction commits, so the next read counts afresh."""
+    transaction.on_commit(lambda: DashboardSnapshot.objects.filter(pk=SNAPSHOT_ID).delete())
+
+
+def current_dashboard_stats():
+    """
+    The stored counters, in one primary-key read.
+
+    Writes to cases, clients and reminders drop the snapshot, so the request
+    after one counts inline. Otherwise, once the counters are older than
+    DASHBOARD_STATS_MAX_AGE a refresh job is queued and the slightly stale
+    numbers are served meanwhile; the request counts inline when the snapshot
+    is older than DASHBOARD_STATS_HARD_MAX_AGE because no worker has run the job.
+    """
+    snapshot = DashboardSnapshot.objects.filter(pk=SNAPSHOT_ID).first()
+    if snapshot is None:
+        collector.inc('cache_requests_total', cache='dashboard', result='miss')
+        return store_dashboard_stats()
+    age = timezone.now() - snapshot.computedAt
+    if age > timedelta(seconds=settings.DASHBOARD_STATS_HARD_MAX_AGE):
+        collector.inc('cache_requests_total', cache='dashboard', result='expired')
+        return store_dashboard_stats()
+    if age > timedelta(seconds=settings.DASHBOARD_STATS_MAX_AGE):
+        collector.inc('cache_requests_total', cache='dashboard', result='stale')
+        enqueue('core.refresh_dashboard_stats', priority=1, unique=True)
+    else:
+        collector.inc('cache_requests_total', cache='dashboard', result='hit')
+    return snapshot.stats
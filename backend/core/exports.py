@@ -0,0 +1,86 @@
+import csv
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework.response import Response
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+}
+# Spreadsheets evaluate a cell starting with one of these as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class Echo:
+    """File-like object that hands each written line straight back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_cell(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _csv_lines(headers, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(headers)
+    for row in rows:
+        yield writer.writerow([_csv_cell(value) for value in row])
+
+
+def _ndjson_lines(headers, rows):
+    encoder = DjangoJSONEncoder()
+    for row in rows:
+        yield encoder.encode(dict(zip(headers, row))) + '\n'
+
+
+def _gzip(chunks):
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _encoded(chunks):
+    for chunk in chunks:
+        yield chunk.encode('utf-8')
+
+
+def export_response(request, queryset, columns, filename):
+    """
+    Stream `queryset` as CSV or NDJSON.
+
+    `columns` is a sequence of (header, lookup) pairs; lookups may span
+    relations (e.g. 'clientId__name') and are fetched with a single joined
+    query that is read in chunks, so memory stays flat for any table size.
+    """
+    output = request.query_params.get('output', 'csv').lower()
+    if output not in EXPORT_FORMATS:
+        return Response({'message': f'Unsupported output: {output}'}, status=400)
+    compress = request.query_params.get('gzip', '').lower() in ('1', 'true', 'yes')
+
+    headers = [header for header, _ in columns]
+    rows = (
+        queryset.prefetch_related(None)
+        .values_list(*[lookup for _, lookup in columns])
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    lines = _csv_lines(headers, rows) if output == 'csv' else _ndjson_lines(headers, rows)
+
+    content_type, extension = EXPORT_FORMATS[output]
+    if compress:
+        response = StreamingHttpResponse(_gzip(lines), content_type='application/gzip')
+        extension += '.gz'
+    else:
+        response = StreamingHttpResponse(_encoded(lines), content_type=f'{content_type}; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{extension}"'
+    return response
@@ -0,0 +1,57 @@
+from django.db import models
+
+
+class LowercaseCharField(models.CharField):
+    """
+    CharField stored in lower case.
+
+    Values are normalized on save (including bulk_create) and in lookups, so
+    `filter(status='Closed')` matches and plain indexed equality replaces
+    `iexact`, which SQLite cannot serve from an index.
+    """
+
+    def to_python(self, value):
+        value = super().to_python(value)
+        return value.lower() if isinstance(value, str) else value
+
+    def get_prep_value(self, value):
+        value = super().get_prep_value(value)
+        return value.lower() if isinstance(value, str) else value
+
+    def pre_save(self, model_instance, add):
+        value = getattr(model_instance, self.attname)
+        if isinstance(value, str):
+            value = value.lower()
+            setattr(model_instance, self.attname, value)
+        return value
+
+
+class NormalizedField(models.CharField):
+    """
+    Read-only shadow of another field in canonical form, for indexed matching.
+
+    The value is recomputed from `source` with `normalizer` whenever the row
+    is saved or bulk-created, so callers never set it themselves.
+    """
+
+    def __init__(self, *args, source=None, normalizer=None, **kwargs):
+        self.source = source
+        self.normalizer = normalizer
+        kwargs.setdefault('editable', False)
+        kwargs.setdefault('null', True)
+        kwargs.setdefault('blank', True)
+        kwargs.setdefault('db_index', True)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['source'] = self.source
+        kwargs['normalizer'] = self.normalizer
+        for key in ('editable', 'null', 'blank', 'db_index'):
+            kwargs.pop(key, None)
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        value = self.normalizer(getattr(model_instance, self.source))
+        setattr(model_instance, self.attname, value)
+        return value
@@ -0,0 +1,116 @@
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+MAX_LIMIT = 500
+
+
+class InvalidFilter(ValueError):
+    pass
+
+
+def parse_moment(value, end_of_day=False):
+    """Accept an ISO datetime or a plain date; return an aware datetime or None."""
+    if not value:
+        return None
+    day = parse_date(value)
+    if day is not None:
+        moment = datetime.combine(day, time.max if end_of_day else time.min)
+    else:
+        moment = parse_datetime(value)
+        if moment is None:
+            return None
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def param_values(params, name):
+    """Values of a multi-value parameter, given repeated (?a=1&a=2) or comma-separated (?a=1,2)."""
+    return [value.strip() for raw in params.getlist(name) for value in raw.split(',') if value.strip()]
+
+
+class WindowPagination(BasePagination):
+    """
+    Opt-in ?limit=&offset= slicing that keeps the plain list response.
+
+    Without `limit` the whole (filtered) list is returned as before. There is
+    no total count, so a page reads only the rows it returns.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        limit = request.query_params.get('limit')
+        if limit is None:
+            return None
+        try:
+            limit = min(max(int(limit), 1), MAX_LIMIT)
+            offset = max(int(request.query_params.get('offset', 0)), 0)
+        except ValueError:
+            raise InvalidFilter("limit and offset must be integers")
+        return list(queryset[offset:offset + limit])
+
+    def get_paginated_response(self, data):
+        return Response(data)
+
+
+class StructuredFilterMixin:
+    """
+    Whitelisted query-string filtering and ordering for a viewset.
+
+    filter_fields: {param: (model lookup, value parser)}, matched with `__in`
+    date_range_fields: fields filterable with ?<field>From= / ?<field>To=
+    ordering_fields: fields accepted in ?ordering=a,-b
+    filtered_actions: the actions the parameters apply to; get_object() also
+    calls filter_queryset(), and a detail lookup must not depend on them
+    """
+    filter_fields = {}
+    date_range_fields = ()
+    ordering_fields = ()
+    default_ordering = ()
+    filtered_actions = ('list', 'export')
+    pagination_class = WindowPagination
+
+    def filter_queryset(self, queryset):
+        if self.action not in self.filtered_actions:
+            return queryset
+        params = self.request.query_params
+        for param, (lookup, parse) in self.filter_fields.items():
+            values = param_values(params, param)
+            if not values:
+                continue
+            try:
+                values = [parse(value) for value in values]
+            except ValueError:
+                raise InvalidFilter(f"Invalid value for {param}")
+            queryset = queryset.filter(**{f'{lookup}__in': values})
+
+        for field in self.date_range_fields:
+            for suffix, lookup, end_of_day in (('From', 'gte', False), ('To', 'lte', True)):
+                raw = params.get(f'{field}{suffix}')
+                if not raw:
+                    continue
+                moment = parse_moment(raw, end_of_day=end_of_day)
+                if moment is None:
+                    raise InvalidFilter(f"Invalid date for {field}{suffix}")
+                queryset = queryset.filter(**{f'{field}__{lookup}': moment})
+
+        return queryset.order_by(*self.get_ordering(param_values(params, 'ordering')))
+
+    def get_ordering(self, requested):
+        ordering = []
+        for term in requested:
+            if term.lstrip('-') not in self.ordering_fields:
+                raise InvalidFilter(f"Cannot order by {term.lstrip('-')}")
+            ordering.append(term)
+        ordering = ordering or list(self.default_ordering)
+        # A unique tie-breaker keeps limit/offset windows stable
+        ordering.append('-pk' if ordering and ordering[0].startswith('-') else 'pk')
+        return ordering
+
+    def handle_exception(self, exc):
+        if isinstance(exc, InvalidFilter):
+            return Response({'message': str(exc)}, status=400)
+        return super().handle_exception(exc)
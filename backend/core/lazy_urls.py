@@ -0,0 +1,30 @@
+from django.urls import Resolver404, URLResolver
+from django.urls.resolvers import RoutePattern
+
+
+class LazyURLResolver(URLResolver):
+    """
+    Resolver for an app's urls module that is imported on the first request for it.
+
+    `prefixes` are the first path segments the module serves, so requests
+    for other apps are turned away without importing it (and with it the
+    app's views and serializers). reverse() and the URL system checks still
+    load every module.
+    """
+
+    def __init__(self, route, urlconf_name, prefixes):
+        super().__init__(RoutePattern(route, is_endpoint=False), urlconf_name)
+        self.prefixes = tuple(prefixes)
+
+    def serves(self, path):
+        return any(path == prefix or path.startswith((f"{prefix}/", f"{prefix}.")) for prefix in self.prefixes)
+
+    def resolve(self, path):
+        match = self.pattern.match(str(path))
+        if match and not self.serves(match[0]):
+            raise Resolver404({'path': match[0]})
+        return super().resolve(path)
+
+
+def lazy_include(route, urlconf_name, prefixes):
+    return LazyURLResolver(route, urlconf_name, prefixes)
@@ -0,0 +1,163 @@
+import os
+import time
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from cases.models import ArchivedCaseDocument, CaseDocument, DocumentChunk
+from cases.versions import CHUNK_DIRECTORY
+from .avatars import AVATAR_DIRECTORY, AVATAR_SIZES
+from .models import User
+
+# Media directories owned by FileFields; anything else under MEDIA_ROOT is left alone
+MANAGED_MEDIA_DIRECTORIES = ('case_documents', CHUNK_DIRECTORY, 'avatars')
+# Keeps ANALYZE cheap on big tables: statistics come from a sample of each index
+ANALYSIS_LIMIT = 1000
+DEFAULT_BATCH_SIZE = 1000
+
+
+class UnsupportedDatabase(Exception):
+    pass
+
+
+def _sqlite_only():
+    if connection.vendor != 'sqlite':
+        raise UnsupportedDatabase(f"{connection.vendor} manages its own statistics and free space")
+
+
+def _pragma(name):
+    with connection.cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
+
+
+def analyze(full=False):
+    """
+    Refresh the query planner statistics without a long write lock.
+
+    The first run (no sqlite_stat1 yet) or `full` runs ANALYZE; later runs use
+    PRAGMA optimize, which only re-analyzes tables whose statistics have
+    drifted. Both sample at most ANALYSIS_LIMIT rows per index unless `full`.
+    """
+    _sqlite_only()
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA analysis_limit = %d" % (0 if full else ANALYSIS_LIMIT))
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+        if full or cursor.fetchone() is None:
+            cursor.execute("ANALYZE")
+            return 'analyze'
+        cursor.execute("PRAGMA optimize")
+        return 'optimize'
+
+
+def enable_incremental_vacuum():
+    """One-off switch to auto_vacuum=INCREMENTAL; the required VACUUM rewrites the file and blocks writers."""
+    _sqlite_only()
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        cursor.execute("VACUUM")
+
+
+def incremental_vacuum(step_pages=256, pause=0.05):
+    """
+    Return free pages to the filesystem a few at a time.
+
+    Each step is its own short transaction with a pause in between, so
+    writers are never held off for longer than one step. Returns the number
+    of pages released, or None when auto_vacuum is not INCREMENTAL.
+    """
+    _sqlite_only()
+    if _pragma('auto_vacuum') != 2:
+        return None
+    released = 0
+    while (free := _pragma('freelist_count')) > 0:
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA incremental_vacuum(%d)" % step_pages)
+            cursor.fetchall()
+        released += free - _pragma('freelist_count')
+        if pause:
+            time.sleep(pause)
+    return released
+
+
+def purge_sessions(batch_size=DEFAULT_BATCH_SIZE):
+    """Delete expired sessions in small batches instead of one long DELETE."""
+    if settings.SESSION_ENGINE != 'django.contrib.sessions.backends.db':
+        from importlib import import_module
+        import_module(settings.SESSION_ENGINE).SessionStore.clear_expired()
+        return None
+
+    from django.contrib.sessions.models import Session
+
+    expired = Session.objects.filter(expire_date__lt=timezone.now())
+    purged = 0
+    while keys := list(expired.values_list('pk', flat=True)[:batch_size]):
+        purged += Session.objects.filter(pk__in=keys).delete()[0]
+    return purged
+
+
+def iter_media_files(root=None, directories=MANAGED_MEDIA_DIRECTORIES):
+    """Yield (storage name, path) for every file under `directories`, streaming the tree."""
+    root = str(root or settings.MEDIA_ROOT)
+    pending = [os.path.join(root, directory) for directory in directories]
+    while pending:
+        directory = pending.pop()
+        try:
+            entries = os.scandir(directory)
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield os.path.relpath(entry.path, root).replace(os.sep, '/'), entry.path
+
+
+def _avatar_owner_name(name):
+    # Sized avatars share a content-hash prefix; a user references the set through the largest one
+    directory, _, filename = name.rpartition('/')
+    if directory != AVATAR_DIRECTORY or '_' not in filename:
+        return name
+    prefix, _, size_and_extension = filename.rpartition('_')
+    extension = os.path.splitext(size_and_extension)[1]
+    return f"{AVATAR_DIRECTORY}/{prefix}_{max(AVATAR_SIZES.values())}{extension}"
+
+
+def _referenced(names):
+    owners = {name: _avatar_owner_name(name) for name in names}
+    referenced = set(CaseDocument.objects.filter(file__in=names).values_list('file', flat=True))
+    referenced |= set(ArchivedCaseDocument.objects.filter(file__in=names).values_list('file', flat=True))
+    # Chunk files are named after their hash
+    chunks = {name.rpartition('/')[2]: name for name in names if name.startswith(f"{CHUNK_DIRECTORY}/")}
+    referenced |= {chunks[digest] for digest in DocumentChunk.objects.filter(hash__in=chunks).values_list('hash', flat=True)}
+    used_avatars = set(User.objects.filter(avatar__in=set(owners.values())).values_list('avatar', flat=True))
+    referenced |= {name for name, owner in owners.items() if owner in used_avatars}
+    return referenced
+
+
+def find_orphans(min_age=timedelta(hours=24), batch_size=DEFAULT_BATCH_SIZE, root=None):
+    """
+    Yield (storage name, path, size) of media files no row refers to.
+
+    The tree is walked lazily and checked batch by batch with IN
+    queries, so memory is bounded by `batch_size` rather than by the number
+    of files or rows. Files newer than `min_age` are skipped: their row may
+    not be committed yet, or the avatar worker may still be using them.
+    """
+    cutoff = time.time() - min_age.total_seconds()
+    files = iter_media_files(root)
+    while batch := list(islice(files, batch_size)):
+        referenced = _referenced([name for name, _ in batch])
+        for name, path in batch:
+            if name in referenced:
+                continue
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if stat.st_mtime < cutoff:
+                yield name, path, stat.st_size
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from core.backup import BACKUP_PAGES_PER_STEP, BackupError, backup
+from core.maintenance import UnsupportedDatabase
+
+
+class Command(BaseCommand):
+    help = "Snapshot the database online (SQLite backup API) and back up new media files by content hash"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--root', default=None, help="Backup directory (default: BACKUP_ROOT)")
+        parser.add_argument('--pages', type=int, default=BACKUP_PAGES_PER_STEP, help="Database pages copied per step")
+        parser.add_argument('--pause', type=float, default=0.0, help="Seconds to yield to writers between steps")
+
+    def handle(self, *args, **options):
+        def progress(done, total):
+            if options['verbosity'] > 1:
+                self.stdout.write(f"  {done}/{total} pages")
+
+        try:
+            name, manifest, copied = backup(options['root'], pages=options['pages'], pause=options['pause'], progress=progress)
+        except (BackupError, UnsupportedDatabase) as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(
+            f"Backup {name} written to {options['root'] or settings.BACKUP_ROOT}: "
+            f"{manifest['database']['size']} byte database, {len(manifest['media'])} media files ({copied} new)"
+        ))
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+from core.maintenance import (
+    DEFAULT_BATCH_SIZE, UnsupportedDatabase, analyze, enable_incremental_vacuum, incremental_vacuum, purge_sessions,
+)
+
+TASKS = ('analyze', 'vacuum', 'sessions')
+
+
+class Command(BaseCommand):
+    help = "Online database upkeep: planner statistics, incremental vacuum and expired-session purging"
+
+    def add_arguments(self, parser):
+        parser.add_argument('tasks', nargs='*', help=f"Any of {', '.join(TASKS)} (default: all)")
+        parser.add_argument('--full-analyze', action='store_true', help="Analyze every row instead of a sample")
+        parser.add_argument('--vacuum-step', type=int, default=256, help="Pages released per vacuum step")
+        parser.add_argument('--enable-incremental-vacuum', action='store_true',
+                            help="Switch the database to auto_vacuum=INCREMENTAL (runs a blocking VACUUM once)")
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Sessions deleted per batch")
+
+    def handle(self, *args, **options):
+        tasks = options['tasks'] or TASKS
+        unknown = set(tasks) - set(TASKS)
+        if unknown:
+            raise CommandError(f"Unknown task(s): {', '.join(sorted(unknown))}")
+        try:
+            if options['enable_incremental_vacuum']:
+                self.stdout.write("Rebuilding the database with auto_vacuum=INCREMENTAL; writers are blocked meanwhile")
+                enable_incremental_vacuum()
+
+            if 'analyze' in tasks:
+                mode = analyze(full=options['full_analyze'])
+                self.stdout.write(f"Planner statistics refreshed ({mode})")
+
+            if 'vacuum' in tasks:
+                released = incremental_vacuum(step_pages=options['vacuum_step'])
+                if released is None:
+                    self.stdout.write("Incremental vacuum is not enabled; rerun with --enable-incremental-vacuum once")
+                else:
+                    self.stdout.write(f"Released {released} free pages")
+        except UnsupportedDatabase as e:
+            raise CommandError(str(e))
+
+        if 'sessions' in tasks:
+            purged = purge_sessions(batch_size=options['batch_size'])
+            self.stdout.write("Expired sessions purged" if purged is None else f"Purged {purged} expired sessions")
+
+        self.stdout.write(self.style.SUCCESS("Maintenance complete"))
@@ -0,0 +1,31 @@
+from concurrent.futures import ProcessPoolExecutor
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from core.avatars import render_variants, store_variants
+from core.models import User
+
+
+class Command(BaseCommand):
+    help = "Re-encode avatars that have no optimized sizes yet (e.g. uploaded before the pipeline existed)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None, help="Process pool size (default: CPU count)")
+
+    def handle(self, *args, **options):
+        jobs = []
+        for user in User.objects.exclude(avatar='').exclude(avatar__isnull=True).filter(avatarVariants={}).only('avatar'):
+            if user.avatar.storage.exists(user.avatar.name):
+                jobs.append((user.pk, user.avatar.name, user.avatar.path))
+
+        failed = 0
+        with ProcessPoolExecutor(max_workers=options['workers']) as executor:
+            futures = [(user_id, name, executor.submit(render_variants, path, str(settings.MEDIA_ROOT)))
+                       for user_id, name, path in jobs]
+            for user_id, name, future in futures:
+                try:
+                    store_variants(user_id, name, future.result())
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f"  User {user_id}: {e}")
+
+        self.stdout.write(self.style.SUCCESS(f"Optimized {len(jobs) - failed} avatars, {failed} failed"))
@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from core.backup import BackupError, list_backups, restore, verify
+from core.maintenance import UnsupportedDatabase
+
+
+class Command(BaseCommand):
+    help = "Verify a backup snapshot and restore the database and media from it"
+
+    def add_arguments(self, parser):
+        parser.add_argument('snapshot', nargs='?', default='latest', help="Snapshot name (default: latest)")
+        parser.add_argument('--root', default=None, help="Backup directory (default: BACKUP_ROOT)")
+        parser.add_argument('--verify-only', action='store_true', help="Check the snapshot without restoring it")
+        parser.add_argument('--noinput', '--no-input', action='store_false', dest='interactive',
+                            help="Do not ask for confirmation")
+
+    def handle(self, *args, **options):
+        root = str(options['root'] or settings.BACKUP_ROOT)
+        snapshots = list_backups(root)
+        if not snapshots:
+            raise CommandError(f"No backups found in {root}")
+        name = snapshots[-1] if options['snapshot'] == 'latest' else options['snapshot']
+        if name not in snapshots:
+            raise CommandError(f"Unknown snapshot {name}; available: {', '.join(snapshots)}")
+
+        if options['verify_only']:
+            problems = verify(root, name)
+            for problem in problems:
+                self.stderr.write(f"  {problem}")
+            if problems:
+                raise CommandError(f"Snapshot {name} failed verification")
+            self.stdout.write(self.style.SUCCESS(f"Snapshot {name} is intact"))
+            return
+
+        if options['interactive']:
+            answer = input(f"This replaces the current database and media with snapshot {name}. Type 'yes' to continue: ")
+            if answer != 'yes':
+                raise CommandError("Restore cancelled")
+        try:
+            restored = restore(root, name)
+        except (BackupError, UnsupportedDatabase) as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f"Restored snapshot {name} ({restored} media files written)"))
@@ -0,0 +1,61 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from core.startup import SCENARIOS, profile, regressions, slowest_imports
+
+
+class Command(BaseCommand):
+    help = "Measure cold-start time of the app (setup, first request, full URLconf) in fresh interpreters"
+    # The point is to time the checks' imports in the child processes, not to pay for them here
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('scenarios', nargs='*', help=f"Any of {', '.join(SCENARIOS)} (default: all)")
+        parser.add_argument('--repeat', type=int, default=5, help="Runs per scenario; the median is reported")
+        parser.add_argument('--imports', type=int, default=0, metavar='N', help="Also list the N slowest imports")
+        parser.add_argument('--json', action='store_true', help="Print the results as JSON")
+        parser.add_argument('--save', default=None, metavar='FILE', help="Write the results to FILE as a baseline")
+        parser.add_argument('--compare', default=None, metavar='FILE', help="Fail if slower than the baseline in FILE")
+        parser.add_argument('--max-regression', type=float, default=0.2,
+                            help="Allowed slowdown over the baseline, as a fraction (default: 0.2)")
+
+    def handle(self, *args, **options):
+        scenarios = options['scenarios'] or SCENARIOS
+        unknown = set(scenarios) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f"Unknown scenario: {', '.join(sorted(unknown))}")
+        results = {scenario: profile(scenario, repeat=options['repeat']) for scenario in scenarios}
+        if options['imports']:
+            for scenario in scenarios:
+                results[scenario]['slowestImports'] = [
+                    {'module': name, 'cumulative': cumulative, 'self': own}
+                    for cumulative, own, name in slowest_imports(scenario, options['imports'])
+                ]
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=1))
+        else:
+            for scenario, result in results.items():
+                self.stdout.write(
+                    f"{scenario}: {result['median'] * 1000:.0f} ms median, {result['min'] * 1000:.0f} ms min "
+                    f"(django.setup() {result['setup'] * 1000:.0f} ms, {result['modules']} modules)"
+                )
+                for entry in result.get('slowestImports', ()):
+                    self.stdout.write(f"  {entry['cumulative'] * 1000:7.1f} ms  {entry['module']}")
+        if options['save']:
+            with open(options['save'], 'w') as f:
+                json.dump(results, f, indent=1)
+
+        if options['compare']:
+            try:
+                with open(options['compare']) as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Could not read baseline {options['compare']}: {e}")
+            slower = regressions(results, baseline, options['max_regression'])
+            if slower:
+                raise CommandError("Startup regressed: " + ", ".join(
+                    f"{scenario} {before * 1000:.0f} ms -> {after * 1000:.0f} ms"
+                    for scenario, (before, after) in slower.items()
+                ))
+            self.stdout.write(self.style.SUCCESS("No startup regression against the baseline"))
@@ -0,0 +1,32 @@
+import os
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from core.maintenance import DEFAULT_BATCH_SIZE, MANAGED_MEDIA_DIRECTORIES, find_orphans
+
+
+class Command(BaseCommand):
+    help = "Report (or with --delete, remove) media files that no document or avatar refers to"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--delete', action='store_true', help="Delete the orphans instead of only listing them")
+        parser.add_argument('--min-age-hours', type=float, default=24,
+                            help="Ignore files modified more recently than this (default: 24)")
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        count = total = 0
+        orphans = find_orphans(min_age=timedelta(hours=options['min_age_hours']), batch_size=options['batch_size'])
+        for name, path, size in orphans:
+            if options['delete']:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+            count += 1
+            total += size
+            self.stdout.write(f"  {'deleted' if options['delete'] else 'orphan'}: {name} ({size} bytes)")
+
+        scope = ', '.join(f"{directory}/" for directory in MANAGED_MEDIA_DIRECTORIES)
+        action = "Deleted" if options['delete'] else "Found"
+        suffix = "" if options['delete'] or not count else "; rerun with --delete to remove them"
+        self.stdout.write(self.style.SUCCESS(f"{action} {count} orphaned files ({total} bytes) in {scope}{suffix}"))
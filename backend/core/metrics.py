@@ -0,0 +1,322 @@
+import atexit
+import hmac
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from bisect import bisect_left
+
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse
+
+try:
+    import fcntl
+except ImportError:  # Windows: exited processes' files are simply kept
+    fcntl = None
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+ARCHIVE_FILE = 'exited.json'
+LOCK_FILE = 'exited.lock'
+
+# name: (type, help, histogram buckets)
+METRICS = {
+    'http_requests_total': ('counter', "HTTP requests by route, method and status.", None),
+    'http_request_duration_seconds': (
+        'histogram', "Time to build the response, and to stream it for exports, by route and method.",
+        (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    ),
+    'db_queries_total': (
+        'counter', "SQL queries run on the request thread, by route and method (not the dashboard's pool threads).",
+        None,
+    ),
+    'db_query_seconds_total': (
+        'counter', "Time spent in SQL on the request thread, by route and method (not the dashboard's pool threads).",
+        None,
+    ),
+    'db_query_duration_seconds': (
+        'histogram', "Duration of single SQL queries run on request threads.",
+        (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+    ),
+    'cache_requests_total': ('counter', "In-process cache lookups by cache and result.", None),
+}
+
+
+class Collector:
+    """
+    Counters and histograms aggregated in memory under one lock.
+
+    With METRICS_DIR set, every process writes its totals to its own file at
+    most every METRICS_FLUSH_INTERVAL seconds (atomically, by rename), and a
+    scrape adds up the files of all processes. Nothing is shared while
+    serving, so recording a value costs a dict update.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+        if hasattr(os, 'register_at_fork'):
+            # A forked worker starts from zero instead of reporting its parent's totals again
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._values = {}
+        self._flushed = time.monotonic()
+        self._filename = f"{os.getpid()}-{uuid.uuid4().hex[:8]}.json"
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        buckets = METRICS[name][2]
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                # One count per bucket, one for +Inf, then the sum of the observed values
+                series = self._values[key] = [0] * (len(buckets) + 2)
+            series[bisect_left(buckets, value)] += 1
+            series[-1] += value
+
+    def series(self):
+        with self._lock:
+            return [[name, labels, value[:] if isinstance(value, list) else value]
+                    for (name, labels), value in self._values.items()]
+
+    def flush(self):
+        directory = settings.METRICS_DIR
+        if not directory:
+            return
+        self._flushed = time.monotonic()
+        _write(os.path.join(str(directory), self._filename), {'series': self.series()})
+
+    def maybe_flush(self):
+        if settings.METRICS_DIR and time.monotonic() - self._flushed >= settings.METRICS_FLUSH_INTERVAL:
+            self.flush()
+
+
+collector = Collector()
+atexit.register(collector.flush)
+
+
+def _write(path, data):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(data, f)
+    os.replace(temporary, path)
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _process_files(directory):
+    return [name for name in os.listdir(directory) if name.endswith('.json') and name != ARCHIVE_FILE]
+
+
+def _merge(totals, series):
+    for name, labels, value in series:
+        key = (name, tuple(tuple(pair) for pair in labels))
+        if isinstance(value, list):
+            current = totals.get(key)
+            totals[key] = value if current is None else [a + b for a, b in zip(current, value)]
+        else:
+            totals[key] = totals.get(key, 0) + value
+
+
+def _compact(directory, archive):
+    """
+    Fold the files of exited processes into ARCHIVE_FILE so the directory
+    does not grow with every restart. The archive lists the files it already
+    contains until they are deleted, so an interrupted run never counts a
+    file twice.
+    """
+    exited = [name for name in _process_files(directory) if not _alive(int(name.split('-')[0]))]
+    if not exited:
+        return archive
+    totals = {}
+    _merge(totals, archive['series'])
+    for name in set(exited) - set(archive['merged']):
+        _merge(totals, (_read(os.path.join(directory, name)) or {'series': []})['series'])
+    archive = {'series': [[name, labels, value] for (name, labels), value in totals.items()], 'merged': exited}
+    archive_path = os.path.join(directory, ARCHIVE_FILE)
+    _write(archive_path, archive)
+    for name in exited:
+        os.remove(os.path.join(directory, name))
+    archive = {**archive, 'merged': []}
+    _write(archive_path, archive)
+    return archive
+
+
+def _collect_files(directory):
+    archive = _read(os.path.join(directory, ARCHIVE_FILE)) or {'series': [], 'merged': []}
+    if fcntl is not None:
+        archive = _compact(directory, archive)
+    totals = {}
+    _merge(totals, archive['series'])
+    for name in set(_process_files(directory)) - set(archive['merged']):
+        data = _read(os.path.join(directory, name))
+        if data:
+            _merge(totals, data['series'])
+    return totals
+
+
+def collect():
+    """{(name, labels): value} summed over every process that has reported."""
+    directory = settings.METRICS_DIR
+    if not directory:
+        totals = {}
+        _merge(totals, collector.series())
+        return totals
+    directory = str(directory)
+    collector.flush()
+    if fcntl is None:
+        return _collect_files(directory)
+    # Scrapes take turns so that none reads a file while another is folding it into the archive
+    with open(os.path.join(directory, LOCK_FILE), 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        return _collect_files(directory)
+
+
+_media_usage = {'measuredAt': None, 'usage': {}}
+
+
+def media_usage():
+    """{directory: (files, bytes)}; the tree walk is repeated at most every METRICS_MEDIA_INTERVAL seconds."""
+    from .maintenance import MANAGED_MEDIA_DIRECTORIES, iter_media_files
+
+    measured = _media_usage['measuredAt']
+    if measured is None or time.monotonic() - measured >= settings.METRICS_MEDIA_INTERVAL:
+        usage = {}
+        for directory in MANAGED_MEDIA_DIRECTORIES:
+            files = size = 0
+            for _, path in iter_media_files(directories=(directory,)):
+                try:
+                    size += os.path.getsize(path)
+                except FileNotFoundError:
+                    continue
+                files += 1
+            usage[directory] = (files, size)
+        _media_usage.update(measuredAt=time.monotonic(), usage=usage)
+    return _media_usage['usage']
+
+
+def gauges():
+    """Point-in-time values read from the database and the media tree on each scrape."""
+    from django.db.models import Count
+
+    from cases.models import Case, CaseDocument
+    from clients.models import Client
+    from jobs.models import Job
+    from reminders.models import Reminder
+
+    values = [
+        ('app_rows', "Rows in the main tables.", {'model': model._meta.model_name}, model.objects.count())
+        for model in (Case, Client, Reminder)
+    ]
+    values.append((
+        'documents_pending_extraction', "Uploaded case documents whose text has not been extracted yet.", {},
+        CaseDocument.objects.filter(isLatest=True, extracted__isnull=True).count(),
+    ))
+    for row in Job.objects.exclude(status=Job.DONE).values('name', 'status').annotate(count=Count('pk')):
+        values.append((
+            'jobs', "Background jobs that are queued, running or failed, by task.",
+            {'name': row['name'], 'status': row['status']}, row['count'],
+        ))
+    for directory, (files, size) in media_usage().items():
+        values.append(('media_files', "Files in the managed media directories.", {'directory': directory}, files))
+        values.append(('media_storage_bytes', "Bytes used by the managed media directories.",
+                       {'directory': directory}, size))
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT page_count * page_size FROM pragma_page_count(), pragma_page_size()")
+            values.append(('database_size_bytes', "Size of the database file.", {}, cursor.fetchone()[0]))
+    return values
+
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _labels(labels, **extra):
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(totals, gauge_values=()):
+    """The Prometheus text exposition format."""
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        series = sorted((labels, value) for (metric, labels), value in totals.items() if metric == name)
+        if not series:
+            continue
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        for labels, value in series:
+            if kind != 'histogram':
+                lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip([*buckets, '+Inf'], value[:-1]):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(labels, le=bound)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {_number(value[-1])}")
+            lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+    described = set()
+    for name, help_text, labels, value in gauge_values:
+        if name not in described:
+            described.add(name)
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        lines.append(f"{name}{_labels(labels.items())} {_number(value)}")
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    """
+    GET /metrics. Scrapers send METRICS_TOKEN as a bearer token; only with
+    DEBUG on may the token be left unset.
+    """
+    if not settings.METRICS_TOKEN and not settings.DEBUG:
+        return HttpResponse("Set METRICS_TOKEN to enable /metrics\n", status=403, content_type=CONTENT_TYPE)
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), expected):
+            return HttpResponse("Forbidden\n", status=403, content_type=CONTENT_TYPE)
+    return HttpResponse(render(collect(), gauges()), content_type=CONTENT_TYPE)
+
+
+_PATTERN_GROUP = re.compile(r'\(\?P<(\w+)>[^)]*\)')
+
+
+def route_label(request):
+    """The matched URL pattern with DRF's regex groups shown as <name>, e.g. api/cases/<pk>."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return _PATTERN_GROUP.sub(r'<\1>', match.route).replace('\\', '').replace('/?$', '').rstrip('$')
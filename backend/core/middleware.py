@@ -0,0 +1,58 @@
+import time
+
+from django.db import connection
+
+from .metrics import collector, route_label
+
+
+class MetricsMiddleware:
+    """
+    Counts requests, their duration and the SQL they run, labelled by the
+    matched route. Placed first so the other middleware is timed too.
+
+    A streamed response (the exports) is recorded when its body has been
+    sent, so its duration and queries include the stream. Queries run on
+    other threads, such as the dashboard bundle's pool, are not counted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = {'count': 0, 'seconds': 0.0}
+
+        def timed(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                elapsed = time.perf_counter() - started
+                queries['count'] += 1
+                queries['seconds'] += elapsed
+                collector.observe('db_query_duration_seconds', elapsed)
+
+        def record():
+            labels = {'method': request.method, 'route': route_label(request)}
+            collector.inc('http_requests_total', status=response.status_code, **labels)
+            collector.observe('http_request_duration_seconds', time.perf_counter() - started, **labels)
+            collector.inc('db_queries_total', queries['count'], **labels)
+            collector.inc('db_query_seconds_total', queries['seconds'], **labels)
+            collector.maybe_flush()
+
+        started = time.perf_counter()
+        with connection.execute_wrapper(timed):
+            response = self.get_response(request)
+        if response.streaming:
+            response.streaming_content = self._stream(response.streaming_content, timed, record)
+        else:
+            record()
+        return response
+
+    @staticmethod
+    def _stream(content, timed, record):
+        # The body is produced while the server sends it, after __call__ has returned
+        try:
+            with connection.execute_wrapper(timed):
+                yield from content
+        finally:
+            record()
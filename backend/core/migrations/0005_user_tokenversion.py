@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_systemsettings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='tokenVersion',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_user_tokenversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='avatarVariants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
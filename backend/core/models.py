@@ -1,4 +1,5 @@
 from django.contrib.auth.models import AbstractUser
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 
 class User(AbstractUser):
@@ -7,7 +8,11 @@ class User(AbstractUser):
     barNumber = models.CharField(max_length=100, null=True, blank=True)
     practiceAreas = models.TextField(null=True, blank=True)
     avatar = models.ImageField(upload_to='avatars/', null=True, blank=True)
+    # {size name: storage path} of the re-encoded copies written by core.avatars
+    avatarVariants = models.JSONField(default=dict, blank=True)
     createdAt = models.DateTimeField(auto_now_add=True)
+    # Bumped on logout to revoke every signed token issued before it
+    tokenVersion = models.PositiveIntegerField(default=0)
     
     def __str__(self):
         return self.username
@@ -21,3 +26,11 @@ class SystemSettings(models.Model):
 
     def __str__(self):
         return "System Settings"
+
+class DashboardSnapshot(models.Model):
+    """Last computed dashboard counters; a single row refreshed by the core.refresh_dashboard_stats job."""
+    stats = models.JSONField(encoder=DjangoJSONEncoder, default=dict)
+    computedAt = models.DateTimeField()
+
+    def __str__(self):
+        return f"Dashboard stats @ {self.computedAt}"
@@ -1,26 +1,52 @@
+from django.core.files.storage import default_storage
+from django.db import transaction
 from rest_framework import serializers
+from .authentication import revoke_tokens
+from .avatars import AVATAR_SIZES, clear_variants, schedule_avatar_processing
 from .models import User, SystemSettings
 
 class UserSerializer(serializers.ModelSerializer):
+    avatarUrls = serializers.SerializerMethodField()
+
     class Meta:
         model = User
-        fields = ('id', 'username', 'email', 'fullName', 'phone', 'barNumber', 'practiceAreas', 'avatar', 'password', 'createdAt')
+        fields = ('id', 'username', 'email', 'fullName', 'phone', 'barNumber', 'practiceAreas', 'avatar', 'avatarUrls', 'password', 'createdAt')
         extra_kwargs = {
             'password': {'write_only': True},
             'createdAt': {'read_only': True}
         }
 
+    def get_avatarUrls(self, obj):
+        if not obj.avatar:
+            return None
+        # Until the worker has produced the sizes, every size falls back to the upload itself
+        names = obj.avatarVariants or dict.fromkeys(AVATAR_SIZES, obj.avatar.name)
+        request = self.context.get('request')
+        urls = {size: default_storage.url(name) for size, name in names.items()}
+        return {size: request.build_absolute_uri(url) for size, url in urls.items()} if request else urls
+
     def create(self, validated_data):
         user = User.objects.create_user(**validated_data)
+        if user.avatar:
+            transaction.on_commit(lambda: schedule_avatar_processing(user.pk))
         return user
 
     def update(self, instance, validated_data):
         password = validated_data.pop('password', None)
+        avatar_changed = 'avatar' in validated_data
+        if avatar_changed:
+            clear_variants(instance)
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         if password:
             instance.set_password(password)
         instance.save()
+        if password:
+            # Tokens issued with the old password stop working, access and refresh alike
+            revoke_tokens(instance)
+            instance.refresh_from_db(fields=['tokenVersion'])
+        if avatar_changed and instance.avatar:
+            transaction.on_commit(lambda: schedule_avatar_processing(instance.pk))
         return instance
 
 class SystemSettingsSerializer(serializers.ModelSerializer):
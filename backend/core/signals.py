@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from cases.models import Case
+from cases.signals import cases_archived, cases_bulk_created, cases_restored, cases_status_changed
+from clients.models import Client
+from clients.signals import clients_status_changed
+from reminders.models import Reminder
+from .authentication import user_cache
+from .dashboard import invalidate_dashboard_stats
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def evict_cached_user(sender, instance, **kwargs):
+    user_cache.evict_user(instance.pk)
+
+
+@receiver(post_save, sender=Case)
+@receiver(post_save, sender=Client)
+@receiver(post_save, sender=Reminder)
+@receiver(post_delete, sender=Case)
+@receiver(post_delete, sender=Client)
+@receiver(post_delete, sender=Reminder)
+@receiver(cases_bulk_created)
+@receiver(cases_status_changed)
+@receiver(cases_archived)
+@receiver(cases_restored)
+@receiver(clients_status_changed)
+def invalidate_dashboard_snapshot(sender, **kwargs):
+    invalidate_dashboard_stats()
@@ -0,0 +1,83 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+
+# Each scenario runs in a fresh interpreter and prints its own timings as JSON
+_PRELUDE = """
+import json, sys, time
+start = time.perf_counter()
+import django
+django.setup()
+setup = time.perf_counter()
+"""
+_SCENARIOS = {
+    'setup': "",
+    'first-request': """
+import io
+from django.core.handlers.wsgi import WSGIHandler
+environ = {
+    'REQUEST_METHOD': 'GET', 'PATH_INFO': '/api/auth/me', 'QUERY_STRING': '', 'SERVER_NAME': 'localhost',
+    'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1', 'wsgi.url_scheme': 'http', 'wsgi.input': io.BytesIO(),
+    'wsgi.errors': sys.stderr,
+}
+WSGIHandler()(environ, lambda status, headers: None)
+""",
+    'full-urlconf': """
+from django.urls import get_resolver
+get_resolver().reverse_dict
+""",
+}
+_EPILOGUE = """
+done = time.perf_counter()
+print(json.dumps({'setup': setup - start, 'total': done - start, 'modules': len(sys.modules)}))
+"""
+SCENARIOS = tuple(_SCENARIOS)
+
+
+def _run(scenario, *flags):
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'backend_main.settings')}
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, *flags, '-c', _PRELUDE + _SCENARIOS[scenario] + _EPILOGUE],
+        cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    wall = time.perf_counter() - started
+    return {**json.loads(result.stdout.strip().splitlines()[-1]), 'wall': wall}, result.stderr
+
+
+def profile(scenario, repeat=5):
+    """Start `scenario` `repeat` times in a new interpreter; times are in seconds."""
+    runs = [_run(scenario)[0] for _ in range(repeat)]
+    return {
+        'median': statistics.median(run['wall'] for run in runs),
+        'min': min(run['wall'] for run in runs),
+        'setup': statistics.median(run['setup'] for run in runs),
+        'inProcess': statistics.median(run['total'] for run in runs),
+        'modules': runs[-1]['modules'],
+    }
+
+
+def slowest_imports(scenario, limit=15):
+    """The modules with the highest cumulative import time in `scenario`, from `python -X importtime`."""
+    _, stderr = _run(scenario, '-X', 'importtime')
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        imports.append((int(cumulative) / 1e6, int(own) / 1e6, name.strip()))
+    return sorted(imports, reverse=True)[:limit]
+
+
+def regressions(results, baseline, max_regression):
+    """Scenarios whose median grew by more than `max_regression` (a fraction) over `baseline`."""
+    return {
+        scenario: (baseline[scenario]['median'], result['median'])
+        for scenario, result in results.items()
+        if scenario in baseline and result['median'] > baseline[scenario]['median'] * (1 + max_regression)
+    }
@@ -0,0 +1,29 @@
+from django.core.files.storage import default_storage
+from django.conf import settings
+
+from jobs.queue import task
+from .dashboard import store_dashboard_stats
+from .maintenance import _referenced
+
+
+@task('core.send_email')
+def send_email(payload):
+    from django.core.mail import send_mail
+
+    # Not fail_silently: an SMTP error fails the job so it is retried with backoff
+    send_mail(payload['subject'], payload['message'], settings.DEFAULT_FROM_EMAIL, payload['recipients'])
+
+
+@task('core.delete_media')
+def delete_media(payload):
+    """Delete media files rows stopped pointing at, unless a row has started using them again."""
+    names = payload['names']
+    referenced = _referenced(names)
+    for name in names:
+        if name not in referenced:
+            default_storage.delete(name)
+
+
+@task('core.refresh_dashboard_stats')
+def refresh_dashboard_stats(payload):
+    store_dashboard_stats()
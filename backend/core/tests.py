@@ -1,3 +1,481 @@
-from django.test import TestCase
+import json
+import os
+import subprocess
+import sys
+import shutil
+import tempfile
+from datetime import timedelta
+from io import BytesIO, StringIO
+from PIL import Image
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core import mail
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from rest_framework.test import APITestCase, APITransactionTestCase
+from cases.models import Case, CaseDocument
+from clients.models import Client
+from reminders.models import Reminder
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+from django.urls import resolve, reverse
+from django.utils import timezone
+from .authentication import user_cache
+from .avatars import store_variants
+from jobs.models import Job
+from jobs.queue import run_pending
+from .backup import list_backups, load_manifest
+from .models import DashboardSnapshot, User
+from .metrics import ARCHIVE_FILE, collector
+from .startup import regressions
 
-# Create your tests here.
+FIXTURE_SIZES = (1, 5, 20)
+
+
+class CoreQueryBudgetTests(APITestCase):
+    def test_dashboard_stats_query_count_is_constant(self):
+        # The first request ever has no snapshot and counts inline
+        self.assertEqual(self.client.get('/api/dashboard/stats').data['totalCases'], 0)
+        for size in FIXTURE_SIZES:
+            with self.subTest(size=size):
+                for i in range(size):
+                    client = Client.objects.create(name=f"Client {size}-{i}")
+                    case = Case.objects.create(title="Case", clientId=client)
+                    Reminder.objects.create(title="Hearing", dueDate=timezone.now(), caseId=case)
+                DashboardSnapshot.objects.update(
+                    computedAt=timezone.now() - timedelta(seconds=settings.DASHBOARD_STATS_MAX_AGE + 1),
+                )
+                # Stale snapshot: the refresh job is left to the worker
+                with self.assertNumQueries(3):
+                    response = self.client.get('/api/dashboard/stats')
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response.data['totalClients'], Client.objects.count())
+
+                run_pending()
+                with self.assertNumQueries(1):
+                    response = self.client.get('/api/dashboard/stats')
+                self.assertEqual(response.data['totalClients'], Client.objects.count())
+
+    def test_dashboard_stats_are_counted_inline_without_a_worker(self):
+        self.client.get('/api/dashboard/stats')
+        Case.objects.create(title="Case")
+        DashboardSnapshot.objects.update(
+            computedAt=timezone.now() - timedelta(seconds=settings.DASHBOARD_STATS_HARD_MAX_AGE + 1),
+        )
+        self.assertEqual(self.client.get('/api/dashboard/stats').data['totalCases'], 1)
+
+    def test_writes_drop_the_dashboard_snapshot(self):
+        self.client.get('/api/dashboard/stats')
+        with self.captureOnCommitCallbacks(execute=True):
+            Case.objects.create(title="Case")
+        self.assertFalse(DashboardSnapshot.objects.exists())
+        self.assertEqual(self.client.get('/api/dashboard/stats').data['totalCases'], 1)
+
+    def test_user_list_query_count_is_constant(self):
+        for size in FIXTURE_SIZES:
+            with self.subTest(size=size):
+                for i in range(size):
+                    User.objects.create(username=f"lawyer-{size}-{i}")
+                with self.assertNumQueries(1):
+                    response = self.client.get('/api/users')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.data), User.objects.count())
+
+    def test_me_query_count_when_authenticated(self):
+        user = User.objects.create_user(username="demo", password="demo123")
+        self.client.force_login(user)
+        # session lookup + user lookup
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/auth/me')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['user']['username'], "demo")
+
+
+class SignedTokenAuthenticationTests(APITestCase):
+    def setUp(self):
+        user_cache.clear()
+        User.objects.create_user(username="demo", password="demo123")
+
+    def login(self):
+        response = self.client.post('/api/auth/login', {'username': 'demo', 'password': 'demo123'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        # Drop the session cookie so only the bearer token authenticates
+        self.client.cookies.clear()
+        return response.data
+
+    def test_authenticated_requests_need_no_auth_queries(self):
+        tokens = self.login()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        with self.assertNumQueries(1):
+            self.client.get('/api/auth/me')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/auth/me')
+        self.assertEqual(response.data['user']['username'], "demo")
+
+    def test_invalid_token_is_rejected(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer not-a-token")
+        response = self.client.get('/api/auth/me')
+        self.assertEqual(response.status_code, 401)
+
+    def test_expired_access_token_can_be_refreshed(self):
+        tokens = self.login()
+        with override_settings(ACCESS_TOKEN_LIFETIME=-1):
+            self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+            self.assertEqual(self.client.get('/api/auth/me').status_code, 401)
+        self.client.credentials()
+        response = self.client.post('/api/auth/refresh', {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        self.assertEqual(self.client.get('/api/auth/me').status_code, 200)
+
+    def test_logout_revokes_tokens(self):
+        tokens = self.login()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        self.assertEqual(self.client.post('/api/auth/logout').status_code, 200)
+        self.assertEqual(self.client.get('/api/auth/me').status_code, 401)
+        self.client.credentials()
+        response = self.client.post('/api/auth/refresh', {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+    def test_password_change_revokes_tokens(self):
+        tokens = self.login()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        user = User.objects.get(username="demo")
+        response = self.client.put(f'/api/user/{user.pk}', {'password': 'n3w-secret'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get('/api/auth/me').status_code, 401)
+        self.client.credentials()
+        response = self.client.post('/api/auth/refresh', {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(self.client.post('/api/auth/login', {'username': 'demo', 'password': 'n3w-secret'},
+                                          format='json').status_code, 200)
+
+    def test_profile_changes_evict_cached_user(self):
+        tokens = self.login()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        self.client.get('/api/auth/me')
+        user = User.objects.get(username="demo")
+        user.fullName = "Senior Counsel"
+        user.save()
+        response = self.client.get('/api/auth/me')
+        self.assertEqual(response.data['user']['fullName'], "Senior Counsel")
+
+
+class ProfileEmailTests(APITestCase):
+    def test_profile_update_email_is_sent_by_a_job(self):
+        user = User.objects.create_user(username="demo", email="demo@example.com")
+        response = self.client.put(f'/api/user/{user.pk}', {'fullName': "Senior Counsel"}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(run_pending(), 1)
+        self.assertEqual([message.to for message in mail.outbox], [["demo@example.com"]])
+        self.assertIn("Senior Counsel", mail.outbox[0].body)
+
+
+class DashboardBundleTests(APITransactionTestCase):
+    # The bundle's parts run on pool threads with their own connections,
+    # so fixtures must be committed rather than wrapped in a test transaction.
+
+    def test_bundle_returns_stats_and_bounded_compact_lists(self):
+        now = timezone.now()
+        client = Client.objects.create(name="Hemas Holdings")
+        for i in range(6):
+            case = Case.objects.create(title=f"Case {i}", clientId=client)
+            Reminder.objects.create(title=f"Due in {i}", dueDate=now + timedelta(days=i), caseId=case, completed=i == 0)
+
+        response = self.client.get('/api/dashboard', {'limit': 2})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['stats'], {
+            'totalCases': 6, 'activeCases': 6, 'totalClients': 1, 'pendingReminders': 5,
+        })
+        self.assertEqual([r['title'] for r in response.data['upcomingReminders']], ["Due in 1", "Due in 2"])
+        self.assertEqual(response.data['upcomingReminders'][0]['case']['title'], "Case 1")
+        self.assertEqual([c['title'] for c in response.data['recentCases']], ["Case 5", "Case 4"])
+        self.assertEqual(response.data['recentCases'][0]['client']['name'], "Hemas Holdings")
+
+    def test_invalid_limit_is_rejected(self):
+        self.assertEqual(self.client.get('/api/dashboard', {'limit': 'many'}).status_code, 400)
+
+
+class AvatarPipelineTests(APITestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root, AVATAR_WORKERS=0)
+        self.settings_override.enable()
+        user_cache.clear()
+        self.user = User.objects.create_user(username="demo", password="demo123")
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def photo(self, color=(200, 30, 30)):
+        exif = Image.Exif()
+        exif[0x010F] = "PhoneMaker"  # Make
+        exif[0x0112] = 6  # Orientation: rotate 90 degrees
+        buffer = BytesIO()
+        Image.new('RGB', (1600, 1200), color).save(buffer, 'JPEG', exif=exif, quality=95)
+        return SimpleUploadedFile("IMG_0001.jpg", buffer.getvalue(), content_type="image/jpeg")
+
+    def upload(self, user=None, color=(200, 30, 30)):
+        user = user or self.user
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(f'/api/user/{user.pk}', {'avatar': self.photo(color)}, format='multipart')
+        self.assertEqual(response.status_code, 200)
+        user.refresh_from_db()
+
+    def run_deletions(self):
+        Job.objects.update(runAt=timezone.now())
+        run_pending()
+
+    def test_upload_is_replaced_by_stripped_fixed_sizes(self):
+        self.upload()
+        self.run_deletions()
+        self.assertEqual(set(self.user.avatarVariants), {'small', 'medium', 'large'})
+        self.assertEqual(self.user.avatar.name, self.user.avatarVariants['large'])
+        self.assertEqual(os.listdir(os.path.join(self.media_root, 'avatars')), ['sized'])
+
+        for size, name in self.user.avatarVariants.items():
+            with Image.open(os.path.join(self.media_root, name)) as image:
+                self.assertEqual(image.width, image.height)
+                self.assertFalse(image.getexif())
+                self.assertNotIn('exif', image.info)
+        self.assertLess(os.path.getsize(os.path.join(self.media_root, self.user.avatarVariants['small'])), 10 * 1024)
+
+        self.client.force_authenticate(self.user)
+        urls = self.client.get('/api/auth/me').data['user']['avatarUrls']
+        self.assertTrue(urls['small'].endswith(self.user.avatarVariants['small']))
+
+    def test_removing_avatar_deletes_generated_files(self):
+        self.upload()
+        variants = list(self.user.avatarVariants.values())
+        response = self.client.put(f'/api/user/{self.user.pk}', {'avatar': None}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.data['avatarUrls'])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.avatarVariants, {})
+        self.run_deletions()
+        for name in variants:
+            self.assertFalse(os.path.exists(os.path.join(self.media_root, name)))
+
+    def test_users_with_the_same_picture_keep_the_shared_files(self):
+        other = User.objects.create_user(username="colleague", password="demo123")
+        self.upload()
+        self.upload(other)
+        self.assertEqual(other.avatarVariants, self.user.avatarVariants)
+
+        self.upload(color=(30, 30, 200))
+        # A render of an upload the first user has since replaced finishes late
+        store_variants(self.user.pk, "avatars/IMG_0001.jpg", other.avatarVariants)
+        self.run_deletions()
+        self.assertNotEqual(self.user.avatarVariants, other.avatarVariants)
+        for name in [*other.avatarVariants.values(), *self.user.avatarVariants.values()]:
+            self.assertTrue(os.path.exists(os.path.join(self.media_root, name)))
+        self.assertEqual(os.listdir(os.path.join(self.media_root, 'avatars')), ['sized'])
+
+
+class MaintenanceCommandTests(APITestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def touch(self, name, age=timedelta(days=2)):
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(b"x" * 10)
+        mtime = (timezone.now() - age).timestamp()
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def run_command(self, *args):
+        out = StringIO()
+        call_command(*args, stdout=out)
+        return out.getvalue()
+
+    def test_sweep_reports_then_deletes_only_unreferenced_old_files(self):
+        case = Case.objects.create(title="Partition")
+        CaseDocument.objects.create(case=case, title="Plaint", file="case_documents/plaint.pdf")
+        User.objects.create_user(username="demo", password="demo123", avatar="avatars/sized/abc_320.webp")
+        kept = [self.touch("case_documents/plaint.pdf"), self.touch("avatars/sized/abc_80.webp"),
+                self.touch("avatars/sized/abc_320.webp"), self.touch("case_documents/fresh.pdf", age=timedelta(0)),
+                self.touch("unmanaged/notes.txt")]
+        orphans = [self.touch("case_documents/deleted.pdf"), self.touch("avatars/sized/old_80.webp"),
+                   self.touch("avatars/WhatsApp_Image.jpg")]
+
+        report = self.run_command('sweep_media')
+        self.assertIn("Found 3 orphaned files (30 bytes)", report)
+        self.assertTrue(all(os.path.exists(path) for path in orphans))
+
+        self.run_command('sweep_media', '--delete', '--batch-size', '2')
+        self.assertFalse(any(os.path.exists(path) for path in orphans))
+        self.assertTrue(all(os.path.exists(path) for path in kept))
+
+    def test_db_maintenance_runs_online_tasks(self):
+        Session.objects.create(session_key="expired", session_data="", expire_date=timezone.now() - timedelta(days=1))
+        Session.objects.create(session_key="current", session_data="", expire_date=timezone.now() + timedelta(days=1))
+        output = self.run_command('db_maintenance', '--batch-size', '1')
+        self.assertIn("Planner statistics refreshed (analyze)", output)
+        self.assertIn("Purged 1 expired sessions", output)
+        self.assertEqual(list(Session.objects.values_list('session_key', flat=True)), ["current"])
+        self.assertIn("(optimize)", self.run_command('db_maintenance', 'analyze'))
+
+
+class BackupRestoreTests(APITransactionTestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.backup_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root, BACKUP_ROOT=self.backup_root)
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+        shutil.rmtree(self.backup_root, ignore_errors=True)
+
+    def write_media(self, name, content):
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+    def test_backups_are_incremental_and_restore_round_trips(self):
+        Client.objects.create(name="Aruna Perera")
+        plaint = self.write_media("case_documents/plaint.pdf", b"plaint")
+        self.write_media("avatars/me.jpg", b"avatar")
+        call_command('backup', stdout=StringIO())
+
+        self.write_media("case_documents/copy.pdf", b"plaint")
+        out = StringIO()
+        call_command('backup', '--pages', '1', stdout=out)
+        self.assertIn("3 media files (0 new)", out.getvalue())
+        first, second = list_backups()
+        self.assertEqual(len(load_manifest(self.backup_root, second)['media']), 3)
+
+        Client.objects.create(name="Hemas Holdings")
+        self.write_media("case_documents/plaint.pdf", b"tampered")
+        call_command('restore', first, '--noinput', stdout=StringIO())
+        self.assertEqual(list(Client.objects.values_list('name', flat=True)), ["Aruna Perera"])
+        with open(plaint, 'rb') as f:
+            self.assertEqual(f.read(), b"plaint")
+
+    def test_corrupt_snapshot_is_not_restored(self):
+        Client.objects.create(name="Aruna Perera")
+        self.write_media("case_documents/plaint.pdf", b"plaint")
+        call_command('backup', stdout=StringIO())
+        name = list_backups()[0]
+        digest = load_manifest(self.backup_root, name)['media']['case_documents/plaint.pdf']['sha256']
+        with open(os.path.join(self.backup_root, 'objects', digest[:2], digest), 'wb') as f:
+            f.write(b"bitrot")
+
+        with self.assertRaises(CommandError):
+            call_command('restore', '--verify-only', stdout=StringIO(), stderr=StringIO())
+        Client.objects.create(name="Hemas Holdings")
+        with self.assertRaises(CommandError):
+            call_command('restore', '--noinput', stdout=StringIO())
+        self.assertEqual(Client.objects.count(), 2)
+
+
+@override_settings(DEBUG=True)
+class MetricsTests(APITestCase):
+    def setUp(self):
+        collector._reset()
+        self.user = User.objects.create_user(username='metrics', password='pw')
+        self.client.force_authenticate(self.user)
+
+    def metric(self, body, line):
+        for candidate in body.splitlines():
+            if candidate.startswith(line + ' '):
+                return float(candidate.rsplit(' ', 1)[1])
+        self.fail(f"{line} not in metrics output")
+
+    def test_requests_queries_and_table_sizes_are_exposed(self):
+        Case.objects.create(title="Counted", clientId=Client.objects.create(name="Counted Client"))
+        self.client.get('/api/cases')
+        self.client.get('/api/cases')
+        self.client.get('/api/cases/999999')
+
+        response = self.client.get('/metrics')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertEqual(self.metric(body, 'http_requests_total{method="GET",route="api/cases",status="200"}'), 2)
+        self.assertEqual(self.metric(body, 'http_requests_total{method="GET",route="api/cases/<pk>",status="404"}'), 1)
+        self.assertEqual(
+            self.metric(body, 'http_request_duration_seconds_count{method="GET",route="api/cases"}'), 2)
+        self.assertEqual(
+            self.metric(body, 'http_request_duration_seconds_bucket{method="GET",route="api/cases",le="+Inf"}'), 2)
+        self.assertGreater(self.metric(body, 'db_queries_total{method="GET",route="api/cases"}'), 0)
+        self.assertEqual(self.metric(body, 'app_rows{model="case"}'), 1)
+        self.assertEqual(self.metric(body, 'app_rows{model="client"}'), 1)
+        self.assertIn('media_storage_bytes{directory="case_documents"}', body)
+
+    def test_streamed_exports_are_measured_to_the_end(self):
+        Client.objects.create(name="Exported Client")
+        response = self.client.get('/api/clients/export')
+        line = 'db_queries_total{method="GET",route="api/clients/export"}'
+        self.assertNotIn(line, self.client.get('/metrics').content.decode())
+        b''.join(response.streaming_content)
+        self.assertGreater(self.metric(self.client.get('/metrics').content.decode(), line), 0)
+
+    def test_token_is_required_when_configured_or_outside_debug(self):
+        with override_settings(DEBUG=False):
+            self.assertEqual(self.client.get('/metrics').status_code, 403)
+        with override_settings(METRICS_TOKEN='scrape-me'):
+            self.assertEqual(self.client.get('/metrics').status_code, 403)
+            response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape-me')
+            self.assertEqual(response.status_code, 200)
+
+    def test_processes_are_summed_and_exited_ones_folded_into_the_archive(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        exited = subprocess.run([sys.executable, '-c', 'import os; print(os.getpid())'],
+                                capture_output=True, text=True, check=True)
+        labels = [['method', 'GET'], ['route', 'api/clients'], ['status', 200]]
+        with open(os.path.join(directory, f"{exited.stdout.strip()}-0000.json"), 'w') as f:
+            json.dump({'series': [['http_requests_total', labels, 3]]}, f)
+        line = 'http_requests_total{method="GET",route="api/clients",status="200"}'
+
+        with override_settings(METRICS_DIR=directory):
+            self.client.get('/api/clients')
+            first = self.client.get('/metrics').content.decode()
+            self.assertEqual(self.metric(first, line), 4)
+            self.assertEqual(sorted(os.listdir(directory)), sorted([
+                ARCHIVE_FILE, 'exited.lock', collector._filename,
+            ]))
+            second = self.client.get('/metrics').content.decode()
+            self.assertEqual(self.metric(second, line), 4)
+
+
+class LazyURLTests(SimpleTestCase):
+    def test_requests_resolve_to_every_app(self):
+        self.assertEqual(resolve('/api/').url_name, 'api-root')
+        self.assertEqual(resolve('/api/cases/1').url_name, 'case-detail')
+        self.assertEqual(resolve('/api/clients/duplicates').url_name, 'client-duplicates')
+        self.assertEqual(resolve('/api/reminders.json').url_name, 'reminder-list')
+        self.assertEqual(reverse('dashboard-stats'), '/api/dashboard-stats/')
+
+    def test_first_request_only_imports_the_app_it_needs(self):
+        script = (
+            "import json, sys, django; django.setup(); from django.urls import resolve; resolve('/api/auth/me'); "
+            "print(json.dumps([name for name in ('cases.views', 'clients.views', 'reminders.views') "
+            "if name in sys.modules]))"
+        )
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'backend_main.settings'}
+        result = subprocess.run([sys.executable, '-c', script], cwd=settings.BASE_DIR, env=env,
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(json.loads(result.stdout.strip().splitlines()[-1]), [])
+
+    def test_regressions_compare_medians_against_the_baseline(self):
+        baseline = {'setup': {'median': 0.30}, 'first-request': {'median': 0.40}}
+        results = {'setup': {'median': 0.33}, 'first-request': {'median': 0.50}, 'full-urlconf': {'median': 1.0}}
+        self.assertEqual(regressions(results, baseline, 0.2), {'first-request': (0.40, 0.50)})
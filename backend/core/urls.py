@@ -0,0 +1,37 @@
+from django.urls import path
+from rest_framework import routers
+from rest_framework.routers import APIRootView
+from .views import (
+    DashboardStatsView, DashboardView, LoginView, LogoutView, MeView, SendTestEmailView, SystemSettingsView,
+    TokenRefreshView, UpdateProfileView, UserViewSet,
+)
+
+router = routers.DefaultRouter(trailing_slash=False)
+router.include_root_view = False
+router.register(r'users', UserViewSet)
+
+# The routers are split across the apps' urls modules, so the browsable root lists them by name
+API_ROOT = {
+    'users': 'user-list',
+    'clients': 'client-list',
+    'cases': 'case-list',
+    'archived-cases': 'archivedcase-list',
+    'case-types': 'casetype-list',
+    'case-documents': 'casedocument-list',
+    'reminders': 'reminder-list',
+}
+
+urlpatterns = router.urls + [
+    path('', APIRootView.as_view(api_root_dict=API_ROOT), name='api-root'),
+    path('dashboard-stats/', DashboardStatsView.as_view(), name='dashboard-stats'),
+    # Extra compatibility routes
+    path('dashboard/stats', DashboardStatsView.as_view()),
+    path('dashboard', DashboardView.as_view(), name='dashboard'),
+    path('auth/login', LoginView.as_view()),
+    path('auth/logout', LogoutView.as_view()),
+    path('auth/refresh', TokenRefreshView.as_view()),
+    path('auth/me', MeView.as_view()),
+    path('user/<int:pk>', UpdateProfileView.as_view()),
+    path('test-email', SendTestEmailView.as_view(), name='test-email'),
+    path('system-settings', SystemSettingsView.as_view()),
+]
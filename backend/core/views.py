@@ -2,32 +2,32 @@ from rest_framework import viewsets, views, permissions
 from rest_framework.response import Response
 from .models import User, SystemSettings
 from .serializers import UserSerializer, SystemSettingsSerializer
-from clients.models import Client
 from cases.models import Case
 from reminders.models import Reminder
 from django.utils import timezone
+from django.db import close_old_connections
+from concurrent.futures import ThreadPoolExecutor
 from rest_framework.permissions import AllowAny
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth import authenticate, login, logout
-from django.core.mail import send_mail
 from django.conf import settings
-from rest_framework.authentication import SessionAuthentication
-
-class CsrfExemptSessionAuthentication(SessionAuthentication):
-    def enforce_csrf(self, request):
-        return  # Skip CSRF check for development
+from jobs.queue import enqueue
+from .authentication import (
+    CsrfExemptSessionAuthentication, SignedTokenAuthentication, issue_tokens, load_refresh_token, revoke_tokens,
+)
+from .dashboard import current_dashboard_stats
 
 class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
-    authentication_classes = (CsrfExemptSessionAuthentication,)
+    authentication_classes = (SignedTokenAuthentication, CsrfExemptSessionAuthentication)
     permission_classes = [permissions.AllowAny]
 
 @method_decorator(csrf_exempt, name='dispatch')
 class LoginView(views.APIView):
     permission_classes = [AllowAny]
-    authentication_classes = (CsrfExemptSessionAuthentication,)
+    authentication_classes = (SignedTokenAuthentication, CsrfExemptSessionAuthentication)
     def post(self, request):
         username = request.data.get('username')
         password = request.data.get('password')
@@ -36,21 +36,34 @@ class LoginView(views.APIView):
         if user is not None:
             login(request, user)
             serializer = UserSerializer(user)
-            return Response({'user': serializer.data})
+            return Response({'user': serializer.data, **issue_tokens(user)})
             
         return Response({'message': 'Invalid credentials'}, status=401)
 
+@method_decorator(csrf_exempt, name='dispatch')
+class TokenRefreshView(views.APIView):
+    permission_classes = [AllowAny]
+    authentication_classes = ()
+    def post(self, request):
+        user = load_refresh_token(request.data.get('refresh', ''))
+        if user is None:
+            return Response({'message': 'Invalid or expired refresh token'}, status=401)
+        return Response(issue_tokens(user))
+
 @method_decorator(csrf_exempt, name='dispatch')
 class LogoutView(views.APIView):
     permission_classes = [AllowAny]
-    authentication_classes = (CsrfExemptSessionAuthentication,)
+    authentication_classes = (SignedTokenAuthentication, CsrfExemptSessionAuthentication)
     def post(self, request):
+        user = request.user if request.user.is_authenticated else load_refresh_token(request.data.get('refresh', ''))
+        if user is not None:
+            revoke_tokens(user)
         logout(request)
         return Response({'message': 'Logged out successfully'})
 
 class MeView(views.APIView):
     permission_classes = [AllowAny]
-    authentication_classes = (CsrfExemptSessionAuthentication,)
+    authentication_classes = (SignedTokenAuthentication, CsrfExemptSessionAuthentication)
     def get(self, request):
         if request.user.is_authenticated:
             serializer = UserSerializer(request.user)
@@ -59,7 +72,7 @@ class MeView(views.APIView):
 
 @method_decorator(csrf_exempt, name='dispatch')
 class UpdateProfileView(views.APIView):
-    authentication_classes = (CsrfExemptSessionAuthentication,)
+    authentication_classes = (SignedTokenAuthentication, CsrfExemptSessionAuthentication)
     permission_classes = [AllowAny]
     def put(self, request, pk):
         try:
@@ -69,16 +82,12 @@ class UpdateProfileView(views.APIView):
                 user = serializer.save()
                 
                 if user.email:
-                    try:
-                        send_mail(
-                            'Profile Updated - Case Management System',
-                            f'Hello {user.fullName or user.username},\n\nYour profile has been successfully updated.',
-                            settings.DEFAULT_FROM_EMAIL,
-                            [user.email],
-                            fail_silently=True,
-                        )
-                    except Exception:
-                        pass
+                    # Sent by a worker; SMTP latency and outages never reach the response
+                    enqueue('core.send_email', {
+                        'subject': 'Profile Updated - Case Management System',
+                        'message': f'Hello {user.fullName or user.username},\n\nYour profile has been successfully updated.',
+                        'recipients': [user.email],
+                    })
 
                 return Response(serializer.data)
             return Response(serializer.errors, status=400)
@@ -89,9 +98,12 @@ class UpdateProfileView(views.APIView):
 
 @method_decorator(csrf_exempt, name='dispatch')
 class SendTestEmailView(views.APIView):
-    authentication_classes = (CsrfExemptSessionAuthentication,)
+    authentication_classes = (SignedTokenAuthentication, CsrfExemptSessionAuthentication)
     permission_classes = [AllowAny]
     def post(self, request):
+        # The mail machinery (smtplib, ssl, email.*) is only needed here and by the email job
+        from django.core.mail import send_mail
+
         email = request.data.get('email')
         if not email:
             return Response({'message': 'Email is required'}, status=400)
@@ -110,7 +122,7 @@ class SendTestEmailView(views.APIView):
 
 class SystemSettingsView(views.APIView):
     permission_classes = [AllowAny]
-    authentication_classes = (CsrfExemptSessionAuthentication,)
+    authentication_classes = (SignedTokenAuthentication, CsrfExemptSessionAuthentication)
     def get(self, request):
         settings_obj = SystemSettings.objects.first()
         if not settings_obj:
@@ -118,18 +130,86 @@ class SystemSettingsView(views.APIView):
         serializer = SystemSettingsSerializer(settings_obj)
         return Response(serializer.data)
 
+def upcoming_reminders(limit):
+    # Served by reminder_pending_due_idx (completed, dueDate)
+    rows = (
+        Reminder.objects.filter(completed=False).order_by('dueDate', 'id')
+        .values('id', 'title', 'type', 'priority', 'dueDate', 'location', 'caseId', 'caseId__title')[:limit]
+    )
+    return [
+        {
+            'id': row['id'],
+            'title': row['title'],
+            'type': row['type'],
+            'priority': row['priority'],
+            'dueDate': row['dueDate'],
+            'location': row['location'],
+            'case': {'id': row['caseId'], 'title': row['caseId__title']} if row['caseId'] else None,
+        }
+        for row in rows
+    ]
+
+def recent_cases(limit):
+    # Served by case_created_idx
+    rows = (
+        Case.objects.order_by('-createdAt', '-id')
+        .values('id', 'title', 'caseNumber', 'status', 'priority', 'updatedAt', 'caseType__name', 'clientId', 'clientId__name')[:limit]
+    )
+    return [
+        {
+            'id': row['id'],
+            'title': row['title'],
+            'caseNumber': row['caseNumber'],
+            'status': row['status'],
+            'priority': row['priority'],
+            'updatedAt': row['updatedAt'],
+            'caseType': row['caseType__name'],
+            'client': {'id': row['clientId'], 'name': row['clientId__name']} if row['clientId'] else None,
+        }
+        for row in rows
+    ]
+
+DASHBOARD_MAX_ITEMS = 50
+_dashboard_executor = ThreadPoolExecutor(max_workers=6, thread_name_prefix='dashboard')
+
+def _run_on_own_connection(func, *args):
+    try:
+        return func(*args)
+    finally:
+        # Pool threads outlive the request, so release their connection here
+        close_old_connections()
+
 class DashboardStatsView(views.APIView):
-    authentication_classes = (CsrfExemptSessionAuthentication,)
+    """
+    The dashboard counters from the stored snapshot. A write to a case, client
+    or reminder drops the snapshot, so a refetch after one sees it; otherwise
+    the numbers may be up to DASHBOARD_STATS_MAX_AGE seconds old.
+    """
+    authentication_classes = (SignedTokenAuthentication, CsrfExemptSessionAuthentication)
     permission_classes = [permissions.AllowAny]
     def get(self, request):
-        total_cases = Case.objects.count()
-        active_cases = Case.objects.filter(status__iexact='active').count()
-        total_clients = Client.objects.count()
-        pending_reminders = Reminder.objects.filter(completed=False).count()
-        
+        return Response(current_dashboard_stats())
+
+class DashboardView(views.APIView):
+    """
+    Everything the dashboard needs for first paint in one response.
+
+    The three parts are independent, bounded queries, so they run in
+    parallel on pool threads (each with its own DB connection).
+    """
+    authentication_classes = (SignedTokenAuthentication, CsrfExemptSessionAuthentication)
+    permission_classes = [permissions.AllowAny]
+    def get(self, request):
+        try:
+            limit = min(max(int(request.query_params.get('limit', 3)), 1), DASHBOARD_MAX_ITEMS)
+        except ValueError:
+            return Response({'message': 'limit must be an integer'}, status=400)
+
+        stats = _dashboard_executor.submit(_run_on_own_connection, current_dashboard_stats)
+        reminders = _dashboard_executor.submit(_run_on_own_connection, upcoming_reminders, limit)
+        cases = _dashboard_executor.submit(_run_on_own_connection, recent_cases, limit)
         return Response({
-            'totalCases': total_cases,
-            'activeCases': active_cases,
-            'totalClients': total_clients,
-            'pendingReminders': pending_reminders
+            'stats': stats.result(),
+            'upcomingReminders': reminders.result(),
+            'recentCases': cases.result(),
         })
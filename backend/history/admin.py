@@ -0,0 +1,18 @@
+from django.contrib import admin
+from .models import ChangeEntry
+
+@admin.register(ChangeEntry)
+class ChangeEntryAdmin(admin.ModelAdmin):
+    list_display = ('model', 'objectId', 'action', 'user', 'changedAt')
+    list_filter = ('model', 'action')
+    list_select_related = ('user',)
+
+    # The history is append-only
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
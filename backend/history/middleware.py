@@ -0,0 +1,15 @@
+from .recorder import set_current_request
+
+
+class HistoryRequestMiddleware:
+    """Makes the current request available so history entries can name the user who made a change."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        set_current_request(request)
+        try:
+            return self.get_response(request)
+        finally:
+            set_current_request(None)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('history', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='changeentry',
+            name='action',
+            field=models.CharField(choices=[('create', 'Create'), ('update', 'Update'), ('delete', 'Delete'), ('archive', 'Archive'), ('restore', 'Restore')], max_length=10),
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+class ChangeEntry(models.Model):
+    ACTION_CHOICES = (
+        ('create', 'Create'),
+        ('update', 'Update'),
+        ('delete', 'Delete'),
+        ('archive', 'Archive'),
+        ('restore', 'Restore'),
+    )
+
+    # Short model label ('case', 'client', 'reminder') rather than a ContentType FK to keep rows small
+    model = models.CharField(max_length=30)
+    objectId = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    # {field: [old, new]}
+    changes = models.JSONField(encoder=DjangoJSONEncoder, default=dict)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    changedAt = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['model', 'objectId', 'changedAt'], name='history_object_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model}:{self.objectId} {self.action} @ {self.changedAt}"
@@ -0,0 +1,116 @@
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject, empty
+
+logger = logging.getLogger(__name__)
+
+# Flush early if a long-running command produces this many entries
+FLUSH_THRESHOLD = 500
+# Auto-maintained timestamps would add noise to every update diff
+IGNORED_FIELDS = {'createdAt', 'updatedAt'}
+
+_local = threading.local()
+
+
+def _buffer():
+    if not hasattr(_local, 'entries'):
+        _local.entries = []
+    return _local.entries
+
+
+def set_current_request(request):
+    _local.request = request
+
+
+@contextmanager
+def batch():
+    """
+    Buffer the entries recorded inside the block and write them together when
+    it exits, the way a request's are written when it finishes. Used around
+    jobs and management commands; anywhere else entries are written as soon
+    as their transaction commits.
+    """
+    _local.batches = getattr(_local, 'batches', 0) + 1
+    try:
+        yield
+    finally:
+        _local.batches -= 1
+        if not _local.batches:
+            flush()
+
+
+def _buffering():
+    return getattr(_local, 'request', None) is not None or getattr(_local, 'batches', 0) > 0
+
+
+def _current_user_id():
+    request = getattr(_local, 'request', None)
+    if request is None:
+        return None
+    user = request.__dict__.get('user')
+    # Never force a lazy session lookup just to attribute a change
+    if user is None or (isinstance(user, SimpleLazyObject) and user._wrapped is empty):
+        return None
+    return user.pk if user.is_authenticated else None
+
+
+def tracked_fields(model):
+    return [field.attname for field in model._meta.concrete_fields
+            if not field.primary_key and field.attname not in IGNORED_FIELDS]
+
+
+def snapshot(instance):
+    values = instance.__dict__
+    return {field: values[field] for field in tracked_fields(type(instance)) if field in values}
+
+
+def diff(old, new):
+    return {field: [old.get(field), value] for field, value in new.items() if field in old and old[field] != value}
+
+
+def record(model_label, object_id, action, changes):
+    """
+    Queue a history entry. It is buffered only once the surrounding
+    transaction commits (rolled-back changes leave no trace) and written in a
+    single bulk INSERT when the request or batch() finishes, after the
+    response is sent. Outside both it is written straight away.
+    """
+    entry = {
+        'model': model_label,
+        'objectId': object_id,
+        'action': action,
+        'changes': changes,
+        'user_id': _current_user_id(),
+        'changedAt': timezone.now(),
+    }
+
+    def buffer_entry():
+        entries = _buffer()
+        entries.append(entry)
+        if not _buffering() or len(entries) >= FLUSH_THRESHOLD:
+            flush()
+
+    transaction.on_commit(buffer_entry)
+
+
+def flush():
+    from .models import ChangeEntry
+
+    entries = _buffer()
+    if not entries:
+        return 0
+    _local.entries = []
+    try:
+        ChangeEntry.objects.bulk_create([ChangeEntry(**entry) for entry in entries], batch_size=FLUSH_THRESHOLD)
+    except Exception:
+        logger.exception("Could not write %d history entries", len(entries))
+        return 0
+    return len(entries)
+
+
+atexit.register(flush)
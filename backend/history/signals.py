@@ -0,0 +1,88 @@
+from django.core.signals import request_finished
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from cases.models import Case
+from cases.signals import cases_archived, cases_bulk_created, cases_restored, cases_status_changed
+from clients.models import Client
+from clients.signals import clients_status_changed
+from reminders.models import Reminder
+from .recorder import diff, flush, record, snapshot
+
+TRACKED_MODELS = {Case: 'case', Client: 'client', Reminder: 'reminder'}
+
+
+@receiver(post_init, sender=Case)
+@receiver(post_init, sender=Client)
+@receiver(post_init, sender=Reminder)
+def remember_loaded_values(sender, instance, **kwargs):
+    instance._history_values = snapshot(instance) if instance.pk is not None else None
+
+
+@receiver(post_save, sender=Case)
+@receiver(post_save, sender=Client)
+@receiver(post_save, sender=Reminder)
+def record_save(sender, instance, created, **kwargs):
+    new_values = snapshot(instance)
+    if created:
+        record(TRACKED_MODELS[sender], instance.pk, 'create',
+               {field: [None, value] for field, value in new_values.items() if value not in (None, '')})
+    else:
+        old_values = getattr(instance, '_history_values', None)
+        if old_values is None:
+            # No snapshot (built by hand), so the old values are unknown; record the write itself
+            changes = {field: [None, value] for field, value in new_values.items()}
+        else:
+            changes = diff(old_values, new_values)
+        if changes:
+            record(TRACKED_MODELS[sender], instance.pk, 'update', changes)
+        new_values = {**(old_values or {}), **new_values}
+    instance._history_values = new_values
+
+
+@receiver(post_delete, sender=Case)
+@receiver(post_delete, sender=Client)
+@receiver(post_delete, sender=Reminder)
+def record_delete(sender, instance, **kwargs):
+    values = getattr(instance, '_history_values', None) or snapshot(instance)
+    record(TRACKED_MODELS[sender], instance.pk, 'delete',
+           {field: [value, None] for field, value in values.items() if value not in (None, '')})
+
+
+@receiver(cases_bulk_created)
+def record_bulk_create(sender, cases, **kwargs):
+    for case in cases:
+        record('case', case.pk, 'create',
+               {field: [None, value] for field, value in snapshot(case).items() if value not in (None, '')})
+
+
+@receiver(cases_archived)
+def record_archive(sender, case_ids, **kwargs):
+    for case_id in case_ids:
+        record('case', case_id, 'archive', {})
+
+
+@receiver(cases_restored)
+def record_restore(sender, case_ids, **kwargs):
+    for case_id in case_ids:
+        record('case', case_id, 'restore', {})
+
+
+def _record_status_changes(sender, rows, status):
+    for row in rows:
+        record(TRACKED_MODELS[sender], row['id'], 'update', {'status': [row['status'], status]})
+
+
+@receiver(cases_status_changed)
+def record_case_status_changes(sender, cases, status, **kwargs):
+    _record_status_changes(sender, cases, status)
+
+
+@receiver(clients_status_changed)
+def record_client_status_changes(sender, clients, status, **kwargs):
+    _record_status_changes(sender, clients, status)
+
+
+@receiver(request_finished)
+def flush_after_response(sender, **kwargs):
+    flush()
@@ -0,0 +1,131 @@
+import threading
+
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from cases.models import Case
+from clients.models import Client
+from core.authentication import user_cache
+from core.models import User
+from reminders.models import Reminder
+from jobs.models import Job
+from jobs.queue import enqueue, run_pending, task
+from .models import ChangeEntry
+from .recorder import _buffer, batch, flush
+
+
+@task('tests.rename_client')
+def rename_client(payload):
+    client = Client.objects.get(pk=payload['id'])
+    client.name = payload['name']
+    client.save()
+    # Held back until the job finishes
+    assert not ChangeEntry.objects.filter(model='client', action='update').exists()
+
+
+class ChangeRecordingTests(TestCase):
+    def setUp(self):
+        self.client_obj = Client.objects.create(name="Aruna Perera")
+        flush()
+
+    def tearDown(self):
+        _buffer().clear()
+
+    def test_create_update_delete_are_recorded_after_commit(self):
+        with batch():
+            with self.captureOnCommitCallbacks(execute=True):
+                case = Case.objects.create(title="Partition", clientId=self.client_obj)
+                case.status = "closed"
+                case.save()
+                case_id = case.pk
+                case.delete()
+            self.assertFalse(ChangeEntry.objects.filter(model='case').exists())
+        self.assertEqual(ChangeEntry.objects.filter(model='case').count(), 3)
+
+        entries = list(ChangeEntry.objects.filter(model='case', objectId=case_id).order_by('pk'))
+        self.assertEqual([entry.action for entry in entries], ['create', 'update', 'delete'])
+        self.assertEqual(entries[1].changes, {'status': ['active', 'closed']})
+        self.assertEqual(entries[2].changes['title'], ['Partition', None])
+
+    def test_rolled_back_changes_leave_no_entries(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    Reminder.objects.create(title="Hearing", dueDate=timezone.now())
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertEqual(flush(), 0)
+
+    def test_deferred_save_diffs_only_loaded_fields(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Client.objects.only('id', 'name').get(pk=self.client_obj.pk).save()
+            client = Client.objects.only('id', 'name').get(pk=self.client_obj.pk)
+            client.name = "Aruna P."
+            client.save()
+        flush()
+        entry = ChangeEntry.objects.get(model='client', objectId=self.client_obj.pk, action='update')
+        self.assertEqual(entry.changes, {'name': ['Aruna Perera', 'Aruna P.']})
+
+
+class BackgroundRecordingTests(TransactionTestCase):
+    def test_jobs_write_their_entries_when_they_finish(self):
+        client = Client.objects.create(name="Aruna Perera")
+        enqueue('tests.rename_client', {'id': client.pk, 'name': "Aruna P."})
+        self.assertEqual(run_pending(), 1)
+        self.assertTrue(Job.objects.filter(status=Job.DONE).exists())
+        entry = ChangeEntry.objects.get(model='client', objectId=client.pk, action='update')
+        self.assertEqual(entry.changes, {'name': ['Aruna Perera', 'Aruna P.']})
+
+    def test_changes_outside_a_request_or_batch_are_written_on_commit(self):
+        def save_client():
+            try:
+                Client.objects.create(name="Nimal Silva")
+            finally:
+                connection.close()
+
+        worker = threading.Thread(target=save_client)
+        worker.start()
+        worker.join()
+        self.assertTrue(ChangeEntry.objects.filter(model='client', action='create').exists())
+
+
+class HistoryEndpointTests(APITestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.user = User.objects.create_user(username="clerk", password="secret-pass")
+        response = self.client.post('/api/auth/login', {'username': 'clerk', 'password': 'secret-pass'}, format='json')
+        self.client.cookies.clear()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        self.client_obj = Client.objects.create(name="Aruna Perera")
+        flush()
+
+    def tearDown(self):
+        _buffer().clear()
+
+    def test_api_changes_are_attributed_and_paged(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/cases', {'title': "Lease", 'clientId': self.client_obj.pk}, format='json')
+            case_id = response.data['id']
+            for status in ('Pending', 'closed', 'active'):
+                self.client.patch(f'/api/cases/{case_id}', {'status': status}, format='json')
+
+        # The buffered entries are written once the next request finishes
+        self.client.get('/api/history/case/0')
+        self.assertEqual(ChangeEntry.objects.filter(model='case', objectId=case_id).count(), 4)
+
+        with self.assertNumQueries(1):
+            first = self.client.get(f'/api/history/case/{case_id}', {'limit': 3})
+        self.assertEqual([entry['action'] for entry in first.data['results']], ['update'] * 3)
+        self.assertEqual(first.data['results'][0]['changes'], {'status': ['closed', 'active']})
+        self.assertEqual(first.data['results'][0]['user']['username'], 'clerk')
+
+        second = self.client.get(f'/api/history/case/{case_id}', {'limit': 3, 'cursor': first.data['next']})
+        self.assertEqual([entry['action'] for entry in second.data['results']], ['create'])
+        self.assertIsNone(second.data['next'])
+
+    def test_unknown_model_and_bad_cursor_are_rejected(self):
+        self.assertEqual(self.client.get('/api/history/user/1').status_code, 404)
+        self.assertEqual(self.client.get('/api/history/case/1', {'cursor': 'junk'}).status_code, 400)
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import HistoryView
+
+urlpatterns = [
+    path('history/<str:model>/<int:pk>', HistoryView.as_view()),
+]
@@ -0,0 +1,69 @@
+import base64
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework import views, permissions
+from rest_framework.response import Response
+
+from core.authentication import CsrfExemptSessionAuthentication, SignedTokenAuthentication
+from .models import ChangeEntry
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+MODELS = ('case', 'client', 'reminder')
+
+
+def _encode_cursor(entry):
+    raw = json.dumps([entry.changedAt.isoformat(), entry.pk])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor):
+    try:
+        timestamp, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        moment = parse_datetime(timestamp)
+    except (ValueError, TypeError):
+        return None
+    if moment is None or not isinstance(pk, int):
+        return None
+    return moment, pk
+
+
+class HistoryView(views.APIView):
+    """Newest-first change history of one object, paged by (changedAt, id) over history_object_time_idx."""
+    authentication_classes = (SignedTokenAuthentication, CsrfExemptSessionAuthentication)
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, model, pk):
+        if model not in MODELS:
+            return Response({'message': f'Unknown model: {model}'}, status=404)
+        try:
+            limit = min(max(int(request.query_params.get('limit', DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        except ValueError:
+            return Response({'message': 'limit must be an integer'}, status=400)
+
+        entries = ChangeEntry.objects.filter(model=model, objectId=pk)
+        cursor = request.query_params.get('cursor')
+        if cursor:
+            decoded = _decode_cursor(cursor)
+            if decoded is None:
+                return Response({'message': 'Invalid cursor'}, status=400)
+            moment, last_pk = decoded
+            entries = entries.filter(Q(changedAt__lt=moment) | Q(changedAt=moment, pk__lt=last_pk))
+        page = list(
+            entries.select_related('user').order_by('-changedAt', '-pk')[:limit + 1]
+        )
+
+        results = [
+            {
+                'id': entry.pk,
+                'action': entry.action,
+                'changes': entry.changes,
+                'user': {'id': entry.user.pk, 'username': entry.user.username} if entry.user else None,
+                'changedAt': entry.changedAt,
+            }
+            for entry in page[:limit]
+        ]
+        next_cursor = _encode_cursor(page[limit - 1]) if len(page) > limit else None
+        return Response({'results': results, 'next': next_cursor})
@@ -0,0 +1,17 @@
+from django.contrib import admin
+from django.utils import timezone
+from .models import Job
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'priority', 'attempts', 'runAt', 'finishedAt')
+    list_filter = ('status', 'name')
+    readonly_fields = ('lockedBy', 'lockedAt', 'lastError', 'createdAt', 'finishedAt')
+    actions = ['retry_now']
+
+    @admin.action(description="Retry selected jobs now")
+    def retry_now(self, request, queryset):
+        retried = queryset.exclude(status=Job.RUNNING).update(
+            status=Job.QUEUED, runAt=timezone.now(), attempts=0, finishedAt=None,
+        )
+        self.message_user(request, f"Queued {retried} jobs.")
@@ -0,0 +1,91 @@
+import logging
+import signal
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from jobs.queue import claim, enqueue, execute, release_stale, run_pending, worker_id
+
+logger = logging.getLogger(__name__)
+
+# Stale locks are looked for at most this often
+HOUSEKEEPING_INTERVAL = 60
+
+
+def _run(job_id):
+    try:
+        return execute(job_id)
+    finally:
+        # Pool threads and processes outlive the job, so release their connection here
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs until interrupted"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=settings.JOB_WORKER_CONCURRENCY,
+                            help="Jobs run at once (default: JOB_WORKER_CONCURRENCY)")
+        parser.add_argument('--processes', action='store_true',
+                            help="Run jobs in a process pool instead of threads, for CPU-bound handlers")
+        parser.add_argument('--poll-interval', type=float, default=settings.JOB_POLL_INTERVAL,
+                            help="Seconds to wait before looking for new jobs when the queue is empty")
+        parser.add_argument('--once', action='store_true', help="Run every job that is due now, then exit")
+
+    def handle(self, *args, **options):
+        worker = worker_id()
+        if options['once']:
+            release_stale()
+            self.stdout.write(self.style.SUCCESS(f"Ran {run_pending(worker)} jobs"))
+            return
+
+        stopping = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stopping.set())
+
+        concurrency = max(options['concurrency'], 1)
+        poll = options['poll_interval']
+        if options['processes']:
+            # Children must open their own connections rather than share the parent's
+            connections.close_all()
+            pool = ProcessPoolExecutor(max_workers=concurrency, initializer=django.setup)
+        else:
+            pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='job')
+        self.stdout.write(f"Worker {worker} running up to {concurrency} jobs "
+                          f"in {'processes' if options['processes'] else 'threads'}")
+
+        next_housekeeping = 0.0
+        next_scheduled = dict.fromkeys(settings.JOB_SCHEDULE, 0.0)
+        running = set()
+        with pool:
+            while not stopping.is_set():
+                now = time.monotonic()
+                if now >= next_housekeeping:
+                    release_stale()
+                    next_housekeeping = now + HOUSEKEEPING_INTERVAL
+                for name, due in next_scheduled.items():
+                    if now >= due:
+                        enqueue(name, unique=True)
+                        next_scheduled[name] = now + settings.JOB_SCHEDULE[name]
+
+                free = concurrency - len(running)
+                job_ids = claim(worker, free) if free else []
+                running.update(pool.submit(_run, job_id) for job_id in job_ids)
+                if job_ids and len(running) < concurrency:
+                    # More may be waiting; claim again straight away
+                    continue
+                if running:
+                    done, _ = wait(running, timeout=poll, return_when=FIRST_COMPLETED)
+                    running -= done
+                    for future in done:
+                        if future.exception():
+                            # The job stays locked and is requeued once JOB_LOCK_TIMEOUT passes
+                            logger.error("Could not record a job result", exc_info=future.exception())
+                else:
+                    stopping.wait(poll)
+            self.stdout.write("Stopping; waiting for running jobs to finish")
+        self.stdout.write(self.style.SUCCESS("Worker stopped"))
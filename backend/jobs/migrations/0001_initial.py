@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:12
+
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('payload', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=10)),
+                ('priority', models.SmallIntegerField(default=0)),
+                ('runAt', models.DateTimeField(default=django.utils.timezone.now)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('maxAttempts', models.PositiveSmallIntegerField(default=5)),
+                ('lockedBy', models.CharField(blank=True, max_length=100, null=True)),
+                ('lockedAt', models.DateTimeField(blank=True, null=True)),
+                ('lastError', models.TextField(blank=True, default='')),
+                ('createdAt', models.DateTimeField(auto_now_add=True)),
+                ('finishedAt', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', '-priority', 'runAt'], name='job_claim_idx'), models.Index(fields=['name', 'status'], name='job_name_status_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+class Job(models.Model):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    )
+
+    # Registered handler name, e.g. 'core.send_email'
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(encoder=DjangoJSONEncoder, default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    # Higher runs first
+    priority = models.SmallIntegerField(default=0)
+    # Not claimed before this; also how retries are backed off
+    runAt = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    maxAttempts = models.PositiveSmallIntegerField(default=5)
+    # Claim token of the worker running the job
+    lockedBy = models.CharField(max_length=100, null=True, blank=True)
+    lockedAt = models.DateTimeField(null=True, blank=True)
+    lastError = models.TextField(blank=True, default='')
+    createdAt = models.DateTimeField(auto_now_add=True)
+    finishedAt = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Claiming reads the queued jobs in exactly this order
+            models.Index(fields=['status', '-priority', 'runAt'], name='job_claim_idx'),
+            models.Index(fields=['name', 'status'], name='job_name_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
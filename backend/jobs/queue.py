@@ -0,0 +1,142 @@
+import logging
+import os
+import random
+import socket
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from history.recorder import batch
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+BACKOFF_BASE = 30
+BACKOFF_MAX = 6 * 60 * 60
+
+_handlers = {}
+
+
+class UnknownJob(LookupError):
+    pass
+
+
+def task(name):
+    """Register the decorated function as the handler for jobs called `name`; it receives the payload."""
+    def decorator(func):
+        _handlers[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name, payload=None, priority=0, run_at=None, delay=None, max_attempts=None, unique=False):
+    """
+    Store a job for the workers and return it.
+
+    Called inside a transaction, the job commits or rolls back together with
+    the change that caused it. `unique` skips the insert when a job of the
+    same name is already waiting, for refreshes that only need to run once.
+    """
+    if name not in _handlers:
+        raise UnknownJob(f"No handler registered for job {name!r}")
+    if unique:
+        waiting = Job.objects.filter(name=name, status=Job.QUEUED).first()
+        if waiting is not None:
+            return waiting
+    if run_at is None:
+        run_at = timezone.now() + (delay or timedelta())
+    return Job.objects.create(
+        name=name, payload=payload or {}, priority=priority, runAt=run_at,
+        maxAttempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+    )
+
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim(worker, limit):
+    """
+    Lock up to `limit` due jobs for `worker` and return their ids.
+
+    The claim is a single UPDATE ... WHERE id IN (SELECT ... LIMIT) guarded
+    by status = 'queued', so two workers can never take the same job; the
+    fresh token tells this worker which rows it won.
+    """
+    now = timezone.now()
+    token = f"{worker}:{uuid.uuid4().hex[:8]}"
+    due = (
+        Job.objects.filter(status=Job.QUEUED, runAt__lte=now)
+        .order_by('-priority', 'runAt', 'pk').values('pk')[:limit]
+    )
+    claimed = Job.objects.filter(pk__in=due, status=Job.QUEUED).update(
+        status=Job.RUNNING, lockedBy=token, lockedAt=now, attempts=F('attempts') + 1,
+    )
+    if not claimed:
+        return []
+    return list(Job.objects.filter(lockedBy=token, status=Job.RUNNING).order_by('-priority', 'runAt', 'pk')
+                .values_list('pk', flat=True))
+
+
+def backoff(attempts):
+    # Exponential with jitter, so jobs failing together do not retry together
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempts - 1))
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def execute(job_id):
+    """Run one claimed job and record the outcome: done, queued again for a retry, or failed."""
+    job = Job.objects.filter(pk=job_id, status=Job.RUNNING).first()
+    if job is None:
+        return None
+    handler = _handlers.get(job.name)
+    try:
+        if handler is None:
+            raise UnknownJob(f"No handler registered for job {job.name!r}")
+        with batch():
+            handler(job.payload)
+    except Exception as exc:
+        now = timezone.now()
+        retry = not isinstance(exc, UnknownJob) and job.attempts < job.maxAttempts
+        logger.warning("Job %s #%s failed (attempt %d/%d)", job.name, job.pk, job.attempts, job.maxAttempts,
+                       exc_info=True)
+        # Guarded by the claim token: a job requeued as stale meanwhile belongs to someone else
+        Job.objects.filter(pk=job.pk, lockedBy=job.lockedBy).update(
+            status=Job.QUEUED if retry else Job.FAILED,
+            runAt=now + backoff(job.attempts) if retry else job.runAt,
+            lockedBy=None, lockedAt=None, lastError=traceback.format_exc(),
+            finishedAt=None if retry else now,
+        )
+        return Job.QUEUED if retry else Job.FAILED
+    Job.objects.filter(pk=job.pk, lockedBy=job.lockedBy).update(
+        status=Job.DONE, lockedBy=None, lockedAt=None, finishedAt=timezone.now(),
+    )
+    return Job.DONE
+
+
+def release_stale(timeout=None):
+    """Requeue jobs whose worker died mid-run; their attempt still counts against maxAttempts."""
+    cutoff = timezone.now() - timedelta(seconds=timeout or settings.JOB_LOCK_TIMEOUT)
+    stale = Job.objects.filter(status=Job.RUNNING, lockedAt__lt=cutoff)
+    failed = stale.filter(attempts__gte=F('maxAttempts')).update(
+        status=Job.FAILED, lockedBy=None, lockedAt=None, finishedAt=timezone.now(),
+        lastError="Worker stopped responding",
+    )
+    return failed + stale.update(status=Job.QUEUED, lockedBy=None, lockedAt=None)
+
+
+def run_pending(worker=None, limit=None):
+    """Run every due job in this process and return how many ran; for tests and `run_worker --once`."""
+    worker = worker or worker_id()
+    ran = 0
+    while limit is None or ran < limit:
+        job_ids = claim(worker, 1)
+        if not job_ids:
+            return ran
+        execute(job_ids[0])
+        ran += 1
+    return ran
@@ -0,0 +1,18 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Job
+from .queue import task
+
+PURGE_BATCH_SIZE = 1000
+
+
+@task('jobs.purge_finished')
+def purge_finished(payload):
+    """Delete finished jobs past JOB_RETENTION_DAYS, in small batches."""
+    cutoff = timezone.now() - timedelta(days=settings.JOB_RETENTION_DAYS)
+    finished = Job.objects.filter(status__in=(Job.DONE, Job.FAILED), finishedAt__lt=cutoff)
+    while ids := list(finished.values_list('pk', flat=True)[:PURGE_BATCH_SIZE]):
+        Job.objects.filter(pk__in=ids).delete()
@@ -0,0 +1,76 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from .models import Job
+from .queue import claim, enqueue, release_stale, run_pending, task
+
+calls = []
+
+
+@task('tests.record')
+def record(payload):
+    calls.append(payload['value'])
+
+
+@task('tests.fail')
+def fail(payload):
+    raise RuntimeError("SMTP unreachable")
+
+
+class JobQueueTests(APITestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_jobs_run_by_priority_then_due_time(self):
+        enqueue('tests.record', {'value': 'low'})
+        enqueue('tests.record', {'value': 'high'}, priority=5)
+        enqueue('tests.record', {'value': 'later'}, delay=timedelta(hours=1))
+        self.assertEqual(run_pending(), 2)
+        self.assertEqual(calls, ['high', 'low'])
+        self.assertEqual(Job.objects.filter(status=Job.DONE).count(), 2)
+        self.assertEqual(Job.objects.get(status=Job.QUEUED).payload, {'value': 'later'})
+
+    def test_claims_never_overlap(self):
+        for i in range(5):
+            enqueue('tests.record', {'value': i})
+        first = claim('worker-a', 3)
+        second = claim('worker-b', 3)
+        self.assertEqual(len(first), 3)
+        self.assertEqual(len(second), 2)
+        self.assertFalse(set(first) & set(second))
+        self.assertEqual(claim('worker-c', 3), [])
+
+    def test_failures_back_off_then_fail(self):
+        job = enqueue('tests.fail', max_attempts=2)
+        with self.assertLogs('jobs.queue', 'WARNING'):
+            self.assertEqual(run_pending(), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.QUEUED, 1))
+        self.assertGreater(job.runAt, timezone.now())
+        self.assertIn("SMTP unreachable", job.lastError)
+
+        Job.objects.filter(pk=job.pk).update(runAt=timezone.now())
+        with self.assertLogs('jobs.queue', 'WARNING'):
+            run_pending()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
+        self.assertIsNotNone(job.finishedAt)
+
+    def test_unique_jobs_are_not_queued_twice(self):
+        first = enqueue('tests.record', {'value': 1}, unique=True)
+        self.assertEqual(enqueue('tests.record', {'value': 2}, unique=True).pk, first.pk)
+        self.assertEqual(Job.objects.count(), 1)
+
+    def test_stale_locks_are_released(self):
+        job = enqueue('tests.record', {'value': 'orphaned'})
+        claim('dead-worker', 1)
+        Job.objects.filter(pk=job.pk).update(lockedAt=timezone.now() - timedelta(hours=1))
+        self.assertEqual(release_stale(), 1)
+        out = StringIO()
+        call_command('run_worker', '--once', stdout=out)
+        self.assertIn("Ran 1 jobs", out.getvalue())
+        self.assertEqual(calls, ['orphaned'])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.DONE, 2))
@@ -0,0 +1,76 @@
+import heapq
+from datetime import timedelta
+
+from .models import MAX_DURATION_MINUTES, Reminder
+from .recurrence import expand
+
+MAX_DURATION = timedelta(minutes=MAX_DURATION_MINUTES)
+# How far ahead a recurring series is checked when it is saved
+RECURRING_CHECK_HORIZON = timedelta(days=90)
+
+
+def _intervals(start, end, queryset=None):
+    """
+    Timed, open occurrences that can overlap [start, end], as (start, end, occurrence).
+
+    Looking back by MAX_DURATION is enough to catch anything still running at
+    `start`, so the fetch is an index range scan on dueDate, not a table scan.
+    """
+    intervals = []
+    for occurrence in expand(start - MAX_DURATION, end, queryset):
+        if not occurrence['durationMinutes'] or occurrence['completed']:
+            continue
+        occurrence_end = occurrence['dueDate'] + timedelta(minutes=occurrence['durationMinutes'])
+        if occurrence_end > start:
+            intervals.append((occurrence['dueDate'], occurrence_end, occurrence))
+    return intervals
+
+
+def _conflict(first, second):
+    overlap = min(first[1], second[1]) - max(first[0], second[0])
+    return {
+        'first': first[2],
+        'second': second[2],
+        'overlapMinutes': int(overlap.total_seconds() // 60),
+        'sameLocation': bool(first[2]['location']) and first[2]['location'] == second[2]['location'],
+    }
+
+
+def sweep(intervals):
+    """
+    Yield every overlapping pair with a sorted sweep: O(n log n + k).
+
+    Intervals are visited by start time while a min-heap keeps the ones still
+    running, keyed by end time; whatever remains on the heap when a new
+    interval starts overlaps it.
+    """
+    active = []
+    for index, interval in enumerate(sorted(intervals, key=lambda i: (i[0], i[1]))):
+        while active and active[0][0] <= interval[0]:
+            heapq.heappop(active)
+        for _, _, other in active:
+            yield other, interval
+        heapq.heappush(active, (interval[1], index, interval))
+
+
+def find_conflicts(start, end, queryset=None):
+    return [_conflict(first, second) for first, second in sweep(_intervals(start, end, queryset))]
+
+
+def conflicts_for(reminder):
+    """Conflicts between `reminder`'s own occurrences and everything else on the calendar."""
+    # A series' completed flag says nothing about its occurrences (see recurrence._occurrence)
+    if not reminder.durationMinutes or (reminder.completed and not reminder.isRecurring):
+        return []
+    horizon_end = reminder.dueDate + (RECURRING_CHECK_HORIZON if reminder.isRecurring else MAX_DURATION)
+    own = _intervals(reminder.dueDate, horizon_end, Reminder.objects.filter(pk=reminder.pk))
+    if not own:
+        return []
+    others = _intervals(own[0][0], max(interval[1] for interval in own), Reminder.objects.exclude(pk=reminder.pk))
+
+    conflicts = []
+    for first, second in sweep(own + others):
+        mine = [first[2]['reminderId'] == reminder.pk, second[2]['reminderId'] == reminder.pk]
+        if mine[0] != mine[1]:
+            conflicts.append(_conflict(first, second))
+    return conflicts
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0007_case_case_created_idx'),
+        ('reminders', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reminder',
+            index=models.Index(fields=['completed', 'dueDate'], name='reminder_pending_due_idx'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0007_case_case_created_idx'),
+        ('reminders', '0002_reminder_reminder_pending_due_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReminderOccurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('originalDate', models.DateTimeField()),
+                ('dueDate', models.DateTimeField(blank=True, null=True)),
+                ('title', models.CharField(blank=True, max_length=255, null=True)),
+                ('location', models.CharField(blank=True, max_length=255, null=True)),
+                ('completed', models.BooleanField(default=False)),
+                ('cancelled', models.BooleanField(default=False)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='reminder',
+            name='recurrence',
+            field=models.CharField(blank=True, choices=[('', 'Does not repeat'), ('daily', 'Daily'), ('weekly', 'Weekly'), ('monthly', 'Monthly'), ('yearly', 'Yearly')], default='', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='reminder',
+            name='recurrenceCount',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='reminder',
+            name='recurrenceInterval',
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='reminder',
+            name='recurrenceUntil',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='reminder',
+            index=models.Index(fields=['recurrence', 'dueDate'], name='reminder_recurrence_due_idx'),
+        ),
+        migrations.AddField(
+            model_name='reminderoccurrence',
+            name='reminder',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occurrences', to='reminders.reminder'),
+        ),
+        migrations.AddIndex(
+            model_name='reminderoccurrence',
+            index=models.Index(fields=['dueDate'], name='occurrence_due_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='reminderoccurrence',
+            unique_together={('reminder', 'originalDate')},
+        ),
+    ]
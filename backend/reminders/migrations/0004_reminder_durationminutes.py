@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:45
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reminders', '0003_reminder_recurrence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reminder',
+            name='durationMinutes',
+            field=models.PositiveIntegerField(blank=True, null=True, validators=[django.core.validators.MaxValueValidator(1440)]),
+        ),
+    ]
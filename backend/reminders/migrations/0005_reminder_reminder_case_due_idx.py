@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0008_casestatuschange'),
+        ('reminders', '0004_reminder_durationminutes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reminder',
+            index=models.Index(fields=['caseId', 'dueDate'], name='reminder_case_due_idx'),
+        ),
+    ]
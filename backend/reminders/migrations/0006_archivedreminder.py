@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:51
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0009_archivedcase'),
+        ('reminders', '0005_reminder_reminder_case_due_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedReminder',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('dueDate', models.DateTimeField()),
+                ('location', models.CharField(blank=True, max_length=255, null=True)),
+                ('durationMinutes', models.PositiveIntegerField(blank=True, null=True)),
+                ('type', models.CharField(max_length=50)),
+                ('priority', models.CharField(max_length=50)),
+                ('completed', models.BooleanField(default=False)),
+                ('createdAt', models.DateTimeField()),
+                ('recurrence', models.CharField(blank=True, choices=[('', 'Does not repeat'), ('daily', 'Daily'), ('weekly', 'Weekly'), ('monthly', 'Monthly'), ('yearly', 'Yearly')], default='', max_length=10)),
+                ('recurrenceInterval', models.PositiveSmallIntegerField(default=1)),
+                ('recurrenceUntil', models.DateTimeField(blank=True, null=True)),
+                ('recurrenceCount', models.PositiveIntegerField(blank=True, null=True)),
+                ('overrides', models.JSONField(default=list, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('caseId', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='cases.archivedcase')),
+            ],
+        ),
+    ]
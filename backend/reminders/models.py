@@ -1,16 +1,87 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.validators import MaxValueValidator
 from django.db import models
-from cases.models import Case
+from cases.models import ArchivedCase, Case
+
+MAX_DURATION_MINUTES = 24 * 60
 
 class Reminder(models.Model):
+    RECURRENCE_CHOICES = (
+        ('', 'Does not repeat'),
+        ('daily', 'Daily'),
+        ('weekly', 'Weekly'),
+        ('monthly', 'Monthly'),
+        ('yearly', 'Yearly'),
+    )
+
     title = models.CharField(max_length=255)
     description = models.TextField(null=True, blank=True)
     dueDate = models.DateTimeField()
     location = models.CharField(max_length=255, null=True, blank=True)
+    # Length of a hearing/appointment; deadlines without a duration never conflict
+    durationMinutes = models.PositiveIntegerField(null=True, blank=True, validators=[MaxValueValidator(MAX_DURATION_MINUTES)])
     type = models.CharField(max_length=50, default="general")
     priority = models.CharField(max_length=50, default="medium")
     completed = models.BooleanField(default=False)
     caseId = models.ForeignKey(Case, on_delete=models.CASCADE, related_name="reminders", null=True, blank=True)
     createdAt = models.DateTimeField(auto_now_add=True)
+    # Recurrence rule; dueDate is the first occurrence of the series
+    recurrence = models.CharField(max_length=10, choices=RECURRENCE_CHOICES, default="", blank=True)
+    recurrenceInterval = models.PositiveSmallIntegerField(default=1)
+    recurrenceUntil = models.DateTimeField(null=True, blank=True)
+    recurrenceCount = models.PositiveIntegerField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['completed', 'dueDate'], name='reminder_pending_due_idx'),
+            models.Index(fields=['recurrence', 'dueDate'], name='reminder_recurrence_due_idx'),
+            models.Index(fields=['caseId', 'dueDate'], name='reminder_case_due_idx'),
+        ]
+
+    @property
+    def isRecurring(self):
+        return bool(self.recurrence)
 
     def __str__(self):
         return f"{self.title} ({self.dueDate})"
+
+class ReminderOccurrence(models.Model):
+    """Sparse per-occurrence state for a recurring reminder; only edited occurrences get a row."""
+    reminder = models.ForeignKey(Reminder, on_delete=models.CASCADE, related_name="occurrences")
+    originalDate = models.DateTimeField()
+    dueDate = models.DateTimeField(null=True, blank=True)
+    title = models.CharField(max_length=255, null=True, blank=True)
+    location = models.CharField(max_length=255, null=True, blank=True)
+    completed = models.BooleanField(default=False)
+    cancelled = models.BooleanField(default=False)
+
+    class Meta:
+        unique_together = ('reminder', 'originalDate')
+        indexes = [
+            models.Index(fields=['dueDate'], name='occurrence_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.reminder_id} @ {self.originalDate}"
+
+class ArchivedReminder(models.Model):
+    """A reminder of an archived case; occurrence overrides are folded into `overrides`."""
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=255)
+    description = models.TextField(null=True, blank=True)
+    dueDate = models.DateTimeField()
+    location = models.CharField(max_length=255, null=True, blank=True)
+    durationMinutes = models.PositiveIntegerField(null=True, blank=True)
+    type = models.CharField(max_length=50)
+    priority = models.CharField(max_length=50)
+    completed = models.BooleanField(default=False)
+    caseId = models.ForeignKey(ArchivedCase, on_delete=models.CASCADE, related_name="reminders")
+    createdAt = models.DateTimeField()
+    recurrence = models.CharField(max_length=10, choices=Reminder.RECURRENCE_CHOICES, default="", blank=True)
+    recurrenceInterval = models.PositiveSmallIntegerField(default=1)
+    recurrenceUntil = models.DateTimeField(null=True, blank=True)
+    recurrenceCount = models.PositiveIntegerField(null=True, blank=True)
+    overrides = models.JSONField(default=list, encoder=DjangoJSONEncoder)
+
+    def __str__(self):
+        return f"{self.title} ({self.dueDate}, archived)"
@@ -0,0 +1,128 @@
+import calendar
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Reminder, ReminderOccurrence
+
+MAX_WINDOW = timedelta(days=366)
+FIXED_PERIODS = {'daily': timedelta(days=1), 'weekly': timedelta(weeks=1)}
+MONTH_STEPS = {'monthly': 1, 'yearly': 12}
+
+
+def _add_months(value, months):
+    # Clamp to the last day of shorter months (31 Jan -> 28/29 Feb) instead of skipping them
+    month_index = value.month - 1 + months
+    year, month = value.year + month_index // 12, month_index % 12 + 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+    return value.replace(year=year, month=month, day=day)
+
+
+def nth_occurrence(reminder, n):
+    # Wall-clock arithmetic in the configured zone keeps hearings at the same local time
+    start = timezone.localtime(reminder.dueDate)
+    step = n * reminder.recurrenceInterval
+    if reminder.recurrence in FIXED_PERIODS:
+        return start + FIXED_PERIODS[reminder.recurrence] * step
+    return _add_months(start, MONTH_STEPS[reminder.recurrence] * step)
+
+
+def first_index_at_or_after(reminder, moment):
+    """Index of the first occurrence >= moment, computed directly rather than by walking the series."""
+    start = timezone.localtime(reminder.dueDate)
+    if moment <= start:
+        return 0
+    if reminder.recurrence in FIXED_PERIODS:
+        period = FIXED_PERIODS[reminder.recurrence] * reminder.recurrenceInterval
+        n = (moment - start) // period
+    else:
+        moment = timezone.localtime(moment)
+        months = (moment.year - start.year) * 12 + moment.month - start.month
+        n = months // (MONTH_STEPS[reminder.recurrence] * reminder.recurrenceInterval)
+    # The estimate can be off by one around month ends and DST changes
+    n = max(n - 1, 0)
+    while nth_occurrence(reminder, n) < moment:
+        n += 1
+    return n
+
+
+def iter_occurrences(reminder, start, end):
+    """Yield the original dates of `reminder`'s occurrences within [start, end]."""
+    if not reminder.recurrence:
+        if start <= reminder.dueDate <= end:
+            yield reminder.dueDate
+        return
+    n = first_index_at_or_after(reminder, start)
+    while reminder.recurrenceCount is None or n < reminder.recurrenceCount:
+        occurrence = nth_occurrence(reminder, n)
+        if occurrence > end or (reminder.recurrenceUntil and occurrence > reminder.recurrenceUntil):
+            return
+        yield occurrence
+        n += 1
+
+
+def _occurrence(reminder, original, override=None):
+    return {
+        'reminderId': reminder.id,
+        'originalDate': original,
+        'dueDate': override.dueDate if override and override.dueDate else original,
+        'title': override.title if override and override.title else reminder.title,
+        'location': override.location if override and override.location else reminder.location,
+        'durationMinutes': reminder.durationMinutes,
+        # A series' occurrences are completed one by one, through their override rows
+        'completed': override.completed if override else (reminder.completed and not reminder.isRecurring),
+        'type': reminder.type,
+        'priority': reminder.priority,
+        'caseId': reminder.caseId_id,
+        'isRecurring': reminder.isRecurring,
+    }
+
+
+def expand(start, end, queryset=None):
+    """
+    Occurrences of all reminders due within [start, end], ordered by dueDate.
+
+    Only series that can overlap the window are loaded, each is expanded
+    from its first in-window occurrence, and overrides are fetched for the
+    window alone, so cost follows the window size rather than series length.
+    """
+    if queryset is None:
+        queryset = Reminder.objects.all()
+
+    one_off = queryset.filter(recurrence='', dueDate__range=(start, end))
+    series = list(
+        queryset.exclude(recurrence='').filter(dueDate__lte=end)
+        .filter(Q(recurrenceUntil__isnull=True) | Q(recurrenceUntil__gte=start))
+    )
+
+    overrides = {}
+    moved_in = []
+    if series:
+        for override in ReminderOccurrence.objects.filter(reminder__in=series).filter(
+            Q(originalDate__range=(start, end)) | Q(dueDate__range=(start, end))
+        ):
+            overrides[(override.reminder_id, override.originalDate)] = override
+
+    results = [_occurrence(reminder, reminder.dueDate) for reminder in one_off]
+    for reminder in series:
+        for original in iter_occurrences(reminder, start, end):
+            override = overrides.pop((reminder.id, original), None)
+            if override and (override.cancelled or (override.dueDate and not start <= override.dueDate <= end)):
+                continue
+            results.append(_occurrence(reminder, original, override))
+
+    # Whatever is left was rescheduled into the window from outside it
+    by_id = {reminder.id: reminder for reminder in series}
+    for (reminder_id, original), override in overrides.items():
+        if not override.cancelled and override.dueDate and start <= override.dueDate <= end:
+            moved_in.append(_occurrence(by_id[reminder_id], original, override))
+
+    results.extend(moved_in)
+    results.sort(key=lambda occurrence: occurrence['dueDate'])
+    return results
+
+
+def is_occurrence(reminder, original):
+    """True if `original` is one of the series' generated dates."""
+    return any(occurrence == original for occurrence in iter_occurrences(reminder, original, original))
@@ -1,10 +1,25 @@
 from rest_framework import serializers
-from .models import Reminder
+from .models import Reminder, ReminderOccurrence
 from cases.serializers import CaseSerializer
 
 class ReminderSerializer(serializers.ModelSerializer):
     case = CaseSerializer(source='caseId', read_only=True)
+    isRecurring = serializers.BooleanField(read_only=True)
     
     class Meta:
         model = Reminder
         fields = '__all__'
+        extra_kwargs = {
+            'recurrenceInterval': {'min_value': 1},
+        }
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        queryset = queryset.select_related('caseId')
+        return CaseSerializer.setup_eager_loading(queryset, prefix='caseId__')
+
+class ReminderOccurrenceSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ReminderOccurrence
+        fields = '__all__'
+        read_only_fields = ('reminder',)
@@ -1,3 +1,175 @@
-from django.test import TestCase
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from cases.models import Case, CaseDocument
+from clients.models import Client
+from .models import Reminder, ReminderOccurrence
+from .conflicts import find_conflicts, sweep
+from .recurrence import expand, iter_occurrences
 
-# Create your tests here.
+FIXTURE_SIZES = (1, 5, 20)
+
+
+def build_reminders(count):
+    """Create `count` reminders spread across their own cases and clients."""
+    reminders = []
+    for i in range(count):
+        client = Client.objects.create(name=f"Client {i}")
+        case = Case.objects.create(title=f"Case {i}", clientId=client)
+        CaseDocument.objects.create(case=case, title="Plaint", file=f"case_documents/plaint_{i}.pdf")
+        reminders.append(Reminder.objects.create(
+            title=f"Hearing {i}",
+            dueDate=timezone.now() + timedelta(days=i),
+            caseId=case,
+        ))
+    return reminders
+
+
+class ReminderQueryBudgetTests(APITestCase):
+    # main select (case joined), case documents, case reminders, case client's cases
+    REMINDER_QUERIES = 4
+
+    def tearDown(self):
+        Client.objects.all().delete()
+
+    def test_reminder_list_query_count_is_constant(self):
+        for size in FIXTURE_SIZES:
+            with self.subTest(size=size):
+                build_reminders(size)
+                with self.assertNumQueries(self.REMINDER_QUERIES):
+                    response = self.client.get('/api/reminders')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.data), Reminder.objects.count())
+
+    def test_reminder_detail_query_count_is_constant(self):
+        for size in FIXTURE_SIZES:
+            with self.subTest(size=size):
+                reminder = build_reminders(size)[0]
+                with self.assertNumQueries(self.REMINDER_QUERIES):
+                    response = self.client.get(f'/api/reminders/{reminder.id}')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.data['case']['id'], reminder.caseId_id)
+
+
+class ReminderExportTests(APITestCase):
+    def test_csv_export_includes_case_and_client(self):
+        reminder = build_reminders(3)[0]
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/reminders/export')
+            lines = b''.join(response.streaming_content).decode().strip().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertIn(reminder.caseId.title, lines[1])
+        self.assertIn(reminder.caseId.clientId.name, lines[1])
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+class RecurrenceExpansionTests(APITestCase):
+    def test_weekly_series_expands_only_within_window(self):
+        Reminder.objects.create(title="Court mention", dueDate=utc(2020, 1, 6, 9), recurrence="weekly")
+        occurrences = expand(utc(2026, 3, 1), utc(2026, 3, 31, 23, 59))
+        self.assertEqual([o['dueDate'].day for o in occurrences], [2, 9, 16, 23, 30])
+        self.assertTrue(all(o['dueDate'].weekday() == 0 for o in occurrences))
+
+    def test_monthly_series_clamps_to_month_end_and_respects_count(self):
+        reminder = Reminder(title="Lease review", dueDate=utc(2026, 1, 31, 10), recurrence="monthly", recurrenceCount=3)
+        dates = list(iter_occurrences(reminder, utc(2026, 1, 1), utc(2026, 12, 31)))
+        self.assertEqual([(d.month, d.day) for d in dates], [(1, 31), (2, 28), (3, 31)])
+
+    def test_until_and_interval(self):
+        reminder = Reminder(title="Filing", dueDate=utc(2026, 1, 1), recurrence="daily",
+                            recurrenceInterval=10, recurrenceUntil=utc(2026, 1, 25))
+        dates = list(iter_occurrences(reminder, utc(2025, 12, 1), utc(2026, 12, 31)))
+        self.assertEqual([d.day for d in dates], [1, 11, 21])
+
+    def test_overrides_are_applied_sparsely(self):
+        series = Reminder.objects.create(title="Mention", dueDate=utc(2026, 3, 2, 9), recurrence="weekly")
+        ReminderOccurrence.objects.create(reminder=series, originalDate=utc(2026, 3, 9, 9), completed=True)
+        ReminderOccurrence.objects.create(reminder=series, originalDate=utc(2026, 3, 16, 9), cancelled=True)
+        ReminderOccurrence.objects.create(reminder=series, originalDate=utc(2026, 4, 6, 9), dueDate=utc(2026, 3, 31, 9))
+        Reminder.objects.create(title="One-off", dueDate=utc(2026, 3, 20))
+
+        occurrences = expand(utc(2026, 3, 1), utc(2026, 3, 31, 23, 59))
+
+        self.assertEqual(
+            [(o['title'], o['dueDate'].day, o['completed']) for o in occurrences],
+            [("Mention", 2, False), ("Mention", 9, True), ("One-off", 20, False),
+             ("Mention", 23, False), ("Mention", 30, False), ("Mention", 31, False)],
+        )
+
+    def test_completing_a_series_does_not_complete_its_occurrences(self):
+        series = Reminder.objects.create(title="Mention", dueDate=utc(2026, 3, 2, 9), recurrence="weekly",
+                                         completed=True)
+        ReminderOccurrence.objects.create(reminder=series, originalDate=utc(2026, 3, 9, 9), completed=True)
+        Reminder.objects.create(title="One-off", dueDate=utc(2026, 3, 20), completed=True)
+
+        occurrences = expand(utc(2026, 3, 1), utc(2026, 3, 21))
+
+        self.assertEqual([(o['title'], o['dueDate'].day, o['completed']) for o in occurrences],
+                         [("Mention", 2, False), ("Mention", 9, True), ("Mention", 16, False), ("One-off", 20, True)])
+
+    def test_occurrence_endpoints(self):
+        series = Reminder.objects.create(title="Mention", dueDate=utc(2026, 3, 2, 9), recurrence="weekly")
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/reminders/occurrences', {'start': '2026-03-01', 'end': '2026-03-31'})
+        self.assertEqual(len(response.data), 5)
+
+        response = self.client.post(f'/api/reminders/{series.id}/occurrences',
+                                    {'originalDate': '2026-03-09T09:00:00Z', 'completed': True}, format='json')
+        self.assertEqual(response.status_code, 201)
+        response = self.client.post(f'/api/reminders/{series.id}/occurrences',
+                                    {'originalDate': '2026-03-09T09:00:00Z', 'title': 'Mention (adjourned)'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        override = ReminderOccurrence.objects.get()
+        self.assertEqual((override.completed, override.title), (True, 'Mention (adjourned)'))
+
+        response = self.client.post(f'/api/reminders/{series.id}/occurrences',
+                                    {'originalDate': '2026-03-10T09:00:00Z'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_window_is_bounded(self):
+        response = self.client.get('/api/reminders/occurrences', {'start': '2020-01-01', 'end': '2026-01-01'})
+        self.assertEqual(response.status_code, 400)
+
+
+class ConflictDetectionTests(APITestCase):
+    def test_sweep_finds_exactly_the_overlapping_pairs(self):
+        intervals = [(utc(2026, 3, 2, h), utc(2026, 3, 2, h + d), {'id': name}) for name, h, d in [
+            ('a', 9, 2), ('b', 10, 1), ('c', 11, 1), ('d', 12, 1), ('e', 8, 6),
+        ]]
+        pairs = {tuple(sorted((x[2]['id'], y[2]['id']))) for x, y in sweep(intervals)}
+        self.assertEqual(pairs, {('a', 'b'), ('a', 'e'), ('b', 'e'), ('c', 'e'), ('d', 'e')})
+
+    def test_conflicts_include_recurring_occurrences_and_skip_deadlines(self):
+        Reminder.objects.create(title="Weekly mention", dueDate=utc(2026, 1, 5, 9), durationMinutes=60, recurrence="weekly")
+        Reminder.objects.create(title="Trial", dueDate=utc(2026, 3, 16, 9, 30), durationMinutes=120, location="DC Colombo")
+        Reminder.objects.create(title="Filing deadline", dueDate=utc(2026, 3, 16, 9, 30))
+        Reminder.objects.create(title="Done", dueDate=utc(2026, 3, 16, 9), durationMinutes=60, completed=True)
+
+        conflicts = find_conflicts(utc(2026, 3, 1), utc(2026, 3, 31))
+
+        self.assertEqual(len(conflicts), 1)
+        self.assertEqual({conflicts[0]['first']['title'], conflicts[0]['second']['title']}, {"Weekly mention", "Trial"})
+        self.assertEqual(conflicts[0]['overlapMinutes'], 30)
+
+    def test_create_and_update_report_conflicts(self):
+        Reminder.objects.create(title="Support hearing", dueDate=utc(2026, 3, 16, 10), durationMinutes=90)
+        response = self.client.post('/api/reminders', {
+            'title': "Client meeting", 'dueDate': '2026-03-16T11:00:00Z', 'durationMinutes': 60,
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data['conflicts']), 1)
+        self.assertEqual(response.data['conflicts'][0]['overlapMinutes'], 30)
+
+        response = self.client.patch(f"/api/reminders/{response.data['id']}", {'dueDate': '2026-03-16T12:00:00Z'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['conflicts'], [])
+
+    def test_conflicts_endpoint(self):
+        Reminder.objects.create(title="A", dueDate=utc(2026, 3, 16, 10), durationMinutes=60)
+        Reminder.objects.create(title="B", dueDate=utc(2026, 3, 16, 10, 30), durationMinutes=60)
+        response = self.client.get('/api/reminders/conflicts', {'start': '2026-03-16', 'end': '2026-03-16'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
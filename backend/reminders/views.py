@@ -1,10 +1,101 @@
 from rest_framework import viewsets, permissions
-from .models import Reminder
-from .serializers import ReminderSerializer
-from cases.views import CsrfExemptSessionAuthentication
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from .models import Reminder, ReminderOccurrence
+from .serializers import ReminderSerializer, ReminderOccurrenceSerializer
+from .recurrence import MAX_WINDOW, expand, is_occurrence
+from .conflicts import conflicts_for, find_conflicts
+from core.authentication import CsrfExemptSessionAuthentication, SignedTokenAuthentication
+from core.exports import export_response
+from core.filters import parse_moment
+
+REMINDER_EXPORT_COLUMNS = (
+    ('id', 'id'),
+    ('title', 'title'),
+    ('dueDate', 'dueDate'),
+    ('type', 'type'),
+    ('priority', 'priority'),
+    ('completed', 'completed'),
+    ('location', 'location'),
+    ('caseNumber', 'caseId__caseNumber'),
+    ('caseTitle', 'caseId__title'),
+    ('client', 'caseId__clientId__name'),
+    ('description', 'description'),
+)
 
 class ReminderViewSet(viewsets.ModelViewSet):
     queryset = Reminder.objects.all().order_by('dueDate')
     serializer_class = ReminderSerializer
-    authentication_classes = (CsrfExemptSessionAuthentication,)
+    authentication_classes = (SignedTokenAuthentication, CsrfExemptSessionAuthentication)
     permission_classes = [permissions.AllowAny]
+
+    def get_queryset(self):
+        return ReminderSerializer.setup_eager_loading(super().get_queryset())
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        return export_response(request, self.get_queryset(), REMINDER_EXPORT_COLUMNS, 'reminders')
+
+    def perform_create(self, serializer):
+        self._saved_conflicts = conflicts_for(serializer.save())
+
+    def perform_update(self, serializer):
+        self._saved_conflicts = conflicts_for(serializer.save())
+
+    def create(self, request, *args, **kwargs):
+        # Overlaps are reported, not rejected: double-booking is sometimes intended
+        response = super().create(request, *args, **kwargs)
+        response.data['conflicts'] = self._saved_conflicts
+        return response
+
+    def update(self, request, *args, **kwargs):
+        response = super().update(request, *args, **kwargs)
+        response.data['conflicts'] = self._saved_conflicts
+        return response
+
+    def _window(self, request):
+        try:
+            start = parse_moment(request.query_params.get('start'))
+            end = parse_moment(request.query_params.get('end'), end_of_day=True)
+        except ValueError:
+            start = end = None
+        if start is None or end is None or end < start:
+            return None, Response({'message': 'Valid start and end dates are required'}, status=400)
+        if end - start > MAX_WINDOW:
+            return None, Response({'message': f'Range may not exceed {MAX_WINDOW.days} days'}, status=400)
+        return (start, end), None
+
+    @action(detail=False, methods=['get'], url_path='occurrences')
+    def occurrences(self, request):
+        window, error = self._window(request)
+        if error:
+            return error
+
+        queryset = Reminder.objects.all()
+        case_id = request.query_params.get('caseId', None)
+        if case_id is not None:
+            queryset = queryset.filter(caseId=case_id)
+        return Response(expand(*window, queryset))
+
+    @action(detail=False, methods=['get'])
+    def conflicts(self, request):
+        window, error = self._window(request)
+        if error:
+            return error
+        return Response(find_conflicts(*window))
+
+    @action(detail=True, methods=['post'], url_path='occurrences')
+    def override_occurrence(self, request, pk=None):
+        reminder = self.get_object()
+        try:
+            original = parse_moment(request.data.get('originalDate'))
+        except ValueError:
+            original = None
+        if original is None or not reminder.isRecurring or not is_occurrence(reminder, original):
+            return Response({'message': 'originalDate must be an occurrence of this recurring reminder'}, status=400)
+
+        override = ReminderOccurrence.objects.filter(reminder=reminder, originalDate=original).first()
+        serializer = ReminderOccurrenceSerializer(override, data=request.data, partial=override is not None)
+        serializer.is_valid(raise_exception=True)
+        serializer.save(reminder=reminder, originalDate=original)
+        return Response(serializer.data, status=200 if override else 201)
@@ -20,9 +20,12 @@ import {
 } from "lucide-react";
 import type { Client } from "@shared/schema";
 import { format } from "date-fns";
-import { useCases } from "@/hooks/use-cases";
+import { useClient } from "@/hooks/use-clients";
 import { useLocation } from "wouter";
 
+// The panel previews this many of the client's latest cases; "View Cases" lists them all
+const CASE_PREVIEW_COUNT = 2;
+
 interface ClientDetailsProps {
     client: Client | null;
     open: boolean;
@@ -32,11 +35,12 @@ interface ClientDetailsProps {
 
 export function ClientDetails({ client, open, onOpenChange, onEdit }: ClientDetailsProps) {
     const [, setLocation] = useLocation();
-    const { data: allCases = [] } = useCases();
+    const { data: detail } = useClient(client?.id, CASE_PREVIEW_COUNT);
 
     if (!client) return null;
 
-    const clientCases = allCases.filter(c => c.clientId === client.id);
+    const clientCases = detail?.cases ?? [];
+    const caseCount = detail?.caseCount ?? clientCases.length;
 
     const getInitials = (name: string) => {
         return name
@@ -154,12 +158,12 @@ export function ClientDetails({ client, open, onOpenChange, onEdit }: ClientDeta
 
                         <div className="pt-4 border-t border-border/50">
                             <h4 className="text-[10px] font-bold text-muted-foreground uppercase tracking-wider mb-2 flex items-center gap-2">
-                                <Briefcase className="w-3 h-3" /> Cases ({clientCases.length})
+                                <Briefcase className="w-3 h-3" /> Cases ({caseCount})
                             </h4>
 
                             {clientCases.length > 0 ? (
                                 <div className="grid grid-cols-1 gap-1.5">
-                                    {clientCases.slice(0, 2).map(caseItem => (
+                                    {clientCases.map(caseItem => (
                                         <div
                                             key={caseItem.id}
                                             className="p-2 rounded-lg bg-muted/30 border border-border/50 flex items-center justify-between hover:bg-muted/50 transition-colors cursor-pointer"
@@ -2,9 +2,40 @@ import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
 import { apiRequest } from "@/lib/queryClient";
 import type { CaseWithClient, InsertCase } from "@shared/schema";
 
-export function useCases() {
+export interface CaseFilters {
+  status?: string[];
+  priority?: string[];
+  caseType?: number[];
+  clientId?: number[];
+  createdAtFrom?: string;
+  createdAtTo?: string;
+  updatedAtFrom?: string;
+  updatedAtTo?: string;
+  ordering?: string;
+}
+
+export function caseListUrl(filters: CaseFilters = {}) {
+  const params = new URLSearchParams();
+  Object.entries(filters).forEach(([key, value]) => {
+    if (Array.isArray(value)) {
+      if (value.length > 0) params.set(key, value.join(","));
+    } else if (value) {
+      params.set(key, value);
+    }
+  });
+  const query = params.toString();
+  return query ? `/api/cases?${query}` : "/api/cases";
+}
+
+export function useCases(filters: CaseFilters = {}) {
+  const url = caseListUrl(filters);
+  // Filtered lists share the "/api/cases" prefix so mutations invalidate them too
   return useQuery<CaseWithClient[]>({
-    queryKey: ["/api/cases"],
+    queryKey: url === "/api/cases" ? ["/api/cases"] : ["/api/cases", filters],
+    queryFn: async () => {
+      const response = await apiRequest("GET", url);
+      return response.json();
+    },
   });
 }
 
@@ -24,7 +55,9 @@ export function useCreateCase() {
     },
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ["/api/cases"] });
+      queryClient.invalidateQueries({ queryKey: ["/api/clients"] });
       queryClient.invalidateQueries({ queryKey: ["/api/dashboard/stats"] });
+      queryClient.invalidateQueries({ queryKey: ["/api/dashboard"] });
     },
   });
 }
@@ -39,8 +72,10 @@ export function useUpdateCase() {
     },
     onSuccess: (_, variables) => {
       queryClient.invalidateQueries({ queryKey: ["/api/cases"] });
+      queryClient.invalidateQueries({ queryKey: ["/api/clients"] });
       queryClient.invalidateQueries({ queryKey: ["/api/cases", variables.id] });
       queryClient.invalidateQueries({ queryKey: ["/api/dashboard/stats"] });
+      queryClient.invalidateQueries({ queryKey: ["/api/dashboard"] });
     },
   });
 }
@@ -56,7 +91,9 @@ export function useDeleteCase() {
     },
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ["/api/cases"] });
+      queryClient.invalidateQueries({ queryKey: ["/api/clients"] });
       queryClient.invalidateQueries({ queryKey: ["/api/dashboard/stats"] });
+      queryClient.invalidateQueries({ queryKey: ["/api/dashboard"] });
     },
   });
 }
@@ -87,6 +124,7 @@ export function useUploadDocument() {
     onSuccess: (_, variables) => {
       queryClient.invalidateQueries({ queryKey: ["/api/cases", variables.caseId] });
       queryClient.invalidateQueries({ queryKey: ["/api/cases"] });
+      queryClient.invalidateQueries({ queryKey: ["/api/clients"] });
     },
   });
 }
@@ -1,6 +1,6 @@
 import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
 import { apiRequest } from "@/lib/queryClient";
-import type { Client, InsertClient } from "@shared/schema";
+import type { Client, ClientDetail, InsertClient } from "@shared/schema";
 
 export function useClients() {
   return useQuery<Client[]>({
@@ -8,9 +8,16 @@ export function useClients() {
   });
 }
 
-export function useClient(id: number) {
-  return useQuery<Client>({
-    queryKey: ["/api/clients", id],
+export function useClient(id: number | undefined, caseLimit?: number) {
+  // The client with its latest cases (counts and next reminder included) in one request
+  return useQuery<ClientDetail>({
+    queryKey: ["/api/clients", id, caseLimit],
+    queryFn: async () => {
+      const query = caseLimit === undefined ? "" : `?caseLimit=${caseLimit}`;
+      const response = await apiRequest("GET", `/api/clients/${id}${query}`);
+      return response.json();
+    },
+    enabled: id !== undefined,
   });
 }
 
@@ -25,6 +32,7 @@ export function useCreateClient() {
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ["/api/clients"] });
       queryClient.invalidateQueries({ queryKey: ["/api/dashboard/stats"] });
+      queryClient.invalidateQueries({ queryKey: ["/api/dashboard"] });
     },
   });
 }
@@ -58,6 +66,7 @@ export function useDeleteClient() {
       queryClient.invalidateQueries({ queryKey: ["/api/cases"] });
       queryClient.invalidateQueries({ queryKey: ["/api/reminders"] });
       queryClient.invalidateQueries({ queryKey: ["/api/dashboard/stats"] });
+      queryClient.invalidateQueries({ queryKey: ["/api/dashboard"] });
     },
   });
 }
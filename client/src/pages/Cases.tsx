@@ -50,7 +50,10 @@ export default function Cases() {
     }
   }, []);
 
-  const { data: cases = [], isLoading } = useCases();
+  const { data: cases = [], isLoading } = useCases({
+    status: statusFilter === "all" ? [] : [statusFilter],
+    caseType: typeFilter === "all" ? [] : [Number(typeFilter)],
+  });
   const { data: caseTypes = [] } = useCaseTypes();
   const createCaseMutation = useCreateCase();
   const updateCaseMutation = useUpdateCase();
@@ -90,10 +93,8 @@ export default function Cases() {
       caseItem.client?.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
       caseItem.client?.nic?.toLowerCase().includes(searchTerm.toLowerCase());
 
-    const matchesStatus = statusFilter === "all" || caseItem.status === statusFilter;
-    const matchesType = typeFilter === "all" || caseItem.type_details?.name === typeFilter;
-
-    return matchesSearch && matchesStatus && matchesType;
+    // Status and type are filtered by the server
+    return matchesSearch;
   });
 
   const handleSubmitCase = async (data: InsertCase, files?: File[]) => {
@@ -225,7 +226,7 @@ export default function Cases() {
           <SelectContent className="bg-card border-border">
             <SelectItem value="all" className="text-foreground hover:bg-muted">All Types</SelectItem>
             {caseTypes.map((type) => (
-              <SelectItem key={type.id} value={type.name} className="text-foreground hover:bg-muted">
+              <SelectItem key={type.id} value={String(type.id)} className="text-foreground hover:bg-muted">
                 {type.name}
               </SelectItem>
             ))}
@@ -17,7 +17,7 @@ import {
   Clock,
   MapPin
 } from "lucide-react";
-import type { DashboardStats, CaseWithClient, ReminderWithCase, InsertCase } from "@shared/schema";
+import type { DashboardBundle, InsertCase } from "@shared/schema";
 import { format, isToday, isTomorrow, isThisWeek } from "date-fns";
 import { CaseForm } from "@/components/CaseForm";
 import { ReminderForm } from "@/components/ReminderForm";
@@ -35,22 +35,16 @@ export default function Dashboard() {
   const createCaseMutation = useCreateCase();
   const createReminderMutation = useCreateReminder();
 
-  const { data: stats, isLoading: statsLoading } = useQuery<DashboardStats>({
-    queryKey: ["/api/dashboard/stats"],
-  });
-
-  const { data: recentCases, isLoading: casesLoading } = useQuery<CaseWithClient[]>({
-    queryKey: ["/api/cases"],
-    select: (data) => data.slice(0, 3), // Get first 3 cases
-  });
-
-  const { data: upcomingReminders, isLoading: remindersLoading } = useQuery<ReminderWithCase[]>({
-    queryKey: ["/api/reminders"],
-    select: (data) => data
-      .filter((reminder) => !reminder.completed)
-      .sort((a, b) => new Date(a.dueDate).getTime() - new Date(b.dueDate).getTime())
-      .slice(0, 3), // Get first 3 upcoming reminders
+  // Stats, next pending reminders and latest cases in one compact response
+  const { data: dashboard, isLoading } = useQuery<DashboardBundle>({
+    queryKey: ["/api/dashboard"],
   });
+  const stats = dashboard?.stats;
+  const recentCases = dashboard?.recentCases;
+  const upcomingReminders = dashboard?.upcomingReminders;
+  const statsLoading = isLoading;
+  const casesLoading = isLoading;
+  const remindersLoading = isLoading;
 
   const getCaseIcon = (type: string) => {
     switch (type) {
@@ -275,11 +269,11 @@ export default function Dashboard() {
                   <div key={caseItem.id} className="flex items-center justify-between p-4 bg-muted/30 hover:bg-muted/50 rounded-lg border border-border/50 hover:border-indigo-500/50 transition-colors">
                     <div className="flex items-center">
                       <div className="w-10 h-10 bg-gradient-to-br from-indigo-500 to-indigo-600 rounded-lg flex items-center justify-center mr-3">
-                        {getCaseIcon(caseItem.type_details?.name || "")}
+                        {getCaseIcon(caseItem.caseType || "")}
                       </div>
                       <div>
                         <h4 className="font-medium text-foreground">{caseItem.title}</h4>
-                        <p className="text-sm text-muted-foreground">{caseItem.type_details?.name || "N/A"}</p>
+                        <p className="text-sm text-muted-foreground">{caseItem.caseType || "N/A"}</p>
                       </div>
                     </div>
                     <div className="text-right">
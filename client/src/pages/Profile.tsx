@@ -224,7 +224,7 @@ export default function Profile() {
               {/* Avatar Section */}
               <div className="flex items-center space-x-6">
                 <Avatar className="w-20 h-20 bg-gradient-to-br from-indigo-500 to-indigo-600 shadow-lg shadow-indigo-500/20">
-                  {user.avatar && <AvatarImage src={user.avatar} className="object-cover" />}
+                  {user.avatarUrls && <AvatarImage src={user.avatarUrls.medium} className="object-cover" />}
                   <AvatarFallback className="text-2xl font-bold text-white bg-transparent">
                     {getInitials(user.fullName || user.username)}
                   </AvatarFallback>
@@ -9,9 +9,16 @@ export interface User {
     barNumber: string | null;
     practiceAreas: string | null;
     avatar: string | null;
+    avatarUrls: AvatarUrls | null;
     createdAt: string;
 }
 
+export interface AvatarUrls {
+    small: string;
+    medium: string;
+    large: string;
+}
+
 export const insertUserSchema = z.object({
     username: z.string().min(3, "Username must be at least 3 characters"),
     password: z.string().min(6, "Password must be at least 6 characters"),
@@ -134,3 +141,48 @@ export interface DashboardStats {
     totalClients: number;
     pendingReminders: number;
 }
+
+export interface ClientCase {
+    id: number;
+    title: string;
+    caseNumber: string | null;
+    status: string;
+    priority: string;
+    updatedAt: string;
+    caseType: string | null;
+    documentCount: number;
+    reminderCount: number;
+    nextReminder: { id: number; title: string; dueDate: string } | null;
+}
+
+export interface ClientDetail extends Omit<Client, "cases"> {
+    caseCount: number;
+    cases: ClientCase[];
+}
+
+export interface DashboardCase {
+    id: number;
+    title: string;
+    caseNumber: string | null;
+    status: string;
+    priority: string;
+    updatedAt: string;
+    caseType: string | null;
+    client: { id: number; name: string } | null;
+}
+
+export interface DashboardReminder {
+    id: number;
+    title: string;
+    type: string;
+    priority: string;
+    dueDate: string;
+    location: string | null;
+    case: { id: number; title: string } | null;
+}
+
+export interface DashboardBundle {
+    stats: DashboardStats;
+    upcomingReminders: DashboardReminder[];
+    recentCases: DashboardCase[];
+}